@@ -0,0 +1,87 @@
+"""
+asyncio interface for stepping envs without blocking the event loop.
+
+The blocking env calls run in a shared thread pool, so a single event loop
+can wait on many envs with a bounded number of threads. This keeps the event
+loop responsive, but it does not make the envs step in parallel: the env
+code, including mujoco_py's `MjSim.step`, holds the GIL. To step Sawyer
+physics in parallel, use the MjSimPool-based envs in
+multiworld.envs.mujoco.sawyer_xyz.sawyer_batch.
+
+```
+obs = await env.async_reset()
+results = await step_many(envs, actions)
+async for i, (obs, reward, done, info) in step_many_as_completed(envs, actions):
+    ...
+```
+Do not step the same env from two tasks at once.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(thread_name_prefix='multiworld')
+    return _executor
+
+
+def set_executor(executor):
+    """
+    Replace the executor used when none is given, e.g. with a larger
+    ThreadPoolExecutor.
+    """
+    global _executor
+    _executor = executor
+
+
+def _run(executor, fn, *args):
+    if executor is None:
+        executor = get_executor()
+    return asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def async_step(env, action, executor=None):
+    return await _run(executor, env.step, action)
+
+
+async def async_reset(env, executor=None):
+    return await _run(executor, env.reset)
+
+
+async def async_sample_goals(env, batch_size, executor=None):
+    return await _run(executor, env.sample_goals, batch_size)
+
+
+async def step_many(envs, actions, executor=None):
+    """
+    Step every env concurrently.
+
+    :return: List of (obs, reward, done, info), in the order of `envs`.
+    """
+    return await asyncio.gather(*[
+        _run(executor, env.step, action)
+        for env, action in zip(envs, actions)
+    ])
+
+
+async def step_many_as_completed(envs, actions, executor=None):
+    """
+    Step every env concurrently and yield the results as they complete.
+
+    :return: Async iterator of (env index, (obs, reward, done, info)).
+    """
+    futures = {
+        _run(executor, env.step, action): i
+        for i, (env, action) in enumerate(zip(envs, actions))
+    }
+    pending = set(futures)
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for future in done:
+            yield futures[future], future.result()
@@ -0,0 +1,80 @@
+"""
+On-screen display that runs on its own thread.
+
+The env only `publish`es frames into a single slot that holds the latest
+frame. A display thread shows whatever frame is in the slot at its own rate,
+so showing frames never slows down `step`. Frames published faster than the
+display rate are skipped.
+"""
+import threading
+import time
+
+
+class LatestFrameDisplay(object):
+    def __init__(
+            self,
+            show_frame,
+            fps=30,
+            open_window=None,
+            poll=None,
+            close_window=None,
+    ):
+        """
+        All callbacks run on the display thread.
+
+        :param show_frame: Function that takes a frame and shows it.
+        :param fps: Maximum number of frames shown per second.
+        :param open_window: Optional function called once before the first
+        frame. Window systems often require windows to be used from the
+        thread that created them.
+        :param poll: Optional function called at every display tick, e.g. to
+        handle window events. If it returns False, the display stops.
+        :param close_window: Optional function called once when the display
+        stops.
+        """
+        self.show_frame = show_frame
+        self.fps = fps
+        self.open_window = open_window
+        self.poll = poll
+        self.close_window = close_window
+        self._lock = threading.Lock()
+        self._frame = None
+        self._running = True
+        self._thread = threading.Thread(target=self._display_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        return self._running
+
+    def publish(self, frame):
+        """
+        Replace the latest frame. `frame` must not be modified afterwards.
+        """
+        with self._lock:
+            self._frame = frame
+
+    def stop(self):
+        self._running = False
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _display_loop(self):
+        period = 1. / self.fps
+        if self.open_window is not None:
+            self.open_window()
+        try:
+            while self._running:
+                start = time.time()
+                with self._lock:
+                    frame = self._frame
+                    self._frame = None
+                if frame is not None:
+                    self.show_frame(frame)
+                if self.poll is not None and self.poll() is False:
+                    self._running = False
+                    break
+                time.sleep(max(0., period - (time.time() - start)))
+        finally:
+            if self.close_window is not None:
+                self.close_window()
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EnvInfoBuffer(object):
+    """
+    Preallocated columnar storage for the env_infos of one path.
+
+    Rather than keeping a list of info dictionaries, each info key gets its
+    own numpy column, so that a finished path's env_infos look like
+    ```
+    {
+        'hand_distance': np array of size PATH_LENGTH,
+        'hand_success': np array of size PATH_LENGTH,
+        ...
+    }
+    ```
+    which `get_diagnostics` and `get_stat_in_paths` accept directly.
+    """
+    def __init__(self, info_schema, max_path_length):
+        """
+        :param info_schema: Ordered mapping from info key to the shape of a
+        single value, e.g. `()` for scalars.
+        :param max_path_length: Number of rows to preallocate. The buffer
+        grows if a path turns out to be longer.
+        """
+        self.info_schema = OrderedDict(info_schema)
+        self._capacity = max(max_path_length, 1)
+        self._columns = [
+            np.zeros((self._capacity,) + tuple(shape))
+            for shape in self.info_schema.values()
+        ]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append_values(self, values):
+        """
+        :param values: Info values in the same order as `info_schema`.
+        """
+        if self._size == self._capacity:
+            self._grow()
+        for column, value in zip(self._columns, values):
+            column[self._size] = value
+        self._size += 1
+
+    def append(self, info):
+        self.append_values([info[k] for k in self.info_schema])
+
+    def get_columns(self):
+        """
+        :return: Views of the rows recorded so far. They are overwritten once
+        the buffer is cleared.
+        """
+        return {
+            k: column[:self._size]
+            for k, column in zip(self.info_schema, self._columns)
+        }
+
+    def pop_path(self):
+        """
+        :return: A copy of the columns recorded so far. Clears the buffer.
+        """
+        columns = {
+            k: column.copy() for k, column in self.get_columns().items()
+        }
+        self.clear()
+        return columns
+
+    def clear(self):
+        self._size = 0
+
+    def _grow(self):
+        self._capacity *= 2
+        self._columns = [
+            np.concatenate((column, np.zeros_like(column)))
+            for column in self._columns
+        ]
@@ -0,0 +1,420 @@
+"""
+Serve a batch of multiworld envs over a local socket.
+
+```
+# Server process
+server = EnvServer([SawyerPushAndReachXYEnv() for _ in range(8)], address)
+server.serve_forever()
+
+# Client process
+client = EnvClient(address)
+obs = client.reset()                    # dict of 8 x ... arrays
+obs, rewards, dones, infos = client.step(actions)   # actions: 8 x action_dim
+env = RemoteEnv(client, env_id=3)       # single-env MultitaskEnv view
+```
+
+`address` is a path for a Unix socket or a (host, port) tuple for TCP.
+
+The spaces are sent once, when a client connects. After that, messages are
+raw numpy bytes laid out according to the Dict observation space, the
+action space and the envs' `info_schema`. Nothing on the hot path is pickled.
+
+Every message is a frame: a uint8 command (or status) and a uint32 payload
+size, followed by the payload.
+"""
+import os
+import pickle
+import socket
+import struct
+import traceback
+
+import numpy as np
+
+from multiworld.core.multitask_env import MultitaskEnv
+
+_HEADER = struct.Struct('!BI')
+_UINT32 = struct.Struct('!I')
+
+_GET_SPEC = 0
+_STEP = 1
+_RESET = 2
+_SAMPLE_GOALS = 3
+_COMPUTE_REWARDS = 4
+
+_OK = 0
+_ERROR = 1
+
+
+class DictCodec(object):
+    """
+    Binary layout for batches of dictionaries whose keys, shapes and dtypes
+    are known to both sides.
+
+    A batch is encoded as its uint32 batch size, a uint8 number of keys, the
+    uint8 index of each key, and then the raw C-order bytes of each value.
+    Only the keys present in the batch are sent.
+    """
+    def __init__(self, keys, shapes, dtypes):
+        self.keys = list(keys)
+        self.shapes = [tuple(shape) for shape in shapes]
+        self.dtypes = [np.dtype(dtype) for dtype in dtypes]
+        self.key_indices = {k: i for i, k in enumerate(self.keys)}
+        assert len(self.keys) < 256
+
+    @classmethod
+    def from_space(cls, dict_space):
+        spaces = dict_space.spaces
+        return cls(
+            spaces.keys(),
+            [space.shape for space in spaces.values()],
+            [space.dtype for space in spaces.values()],
+        )
+
+    @classmethod
+    def from_info_schema(cls, info_schema):
+        return cls(
+            info_schema.keys(),
+            info_schema.values(),
+            [np.float64] * len(info_schema),
+        )
+
+    def encode(self, batch, batch_size):
+        """
+        :return: List of bytes-like objects.
+        """
+        indices = [i for i, k in enumerate(self.keys) if k in batch]
+        parts = [
+            _UINT32.pack(batch_size),
+            bytes([len(indices)] + indices),
+        ]
+        for i in indices:
+            parts.append(_as_bytes(
+                batch[self.keys[i]],
+                self.dtypes[i],
+                (batch_size,) + self.shapes[i],
+            ))
+        return parts
+
+    def decode(self, buffer, offset):
+        """
+        :return: (batch dictionary, offset after the batch). The arrays are
+        views of `buffer`.
+        """
+        batch_size, = _UINT32.unpack_from(buffer, offset)
+        num_keys = buffer[offset + 4]
+        indices = buffer[offset + 5:offset + 5 + num_keys]
+        offset += 5 + num_keys
+        batch = {}
+        for i in indices:
+            batch[self.keys[i]], offset = _decode_array(
+                buffer, offset, self.dtypes[i], (batch_size,) + self.shapes[i]
+            )
+        return batch, offset
+
+
+class EnvServer(object):
+    def __init__(self, envs, address):
+        """
+        :param envs: List of envs with identical spaces.
+        :param address: Unix socket path or (host, port) tuple.
+        """
+        self.envs = envs
+        self.address = address
+        env = envs[0]
+        self.observation_codec = DictCodec.from_space(env.observation_space)
+        self.info_codec = DictCodec.from_info_schema(
+            getattr(env, 'info_schema', {})
+        )
+        self.action_space = env.action_space
+        self._handlers = {
+            _GET_SPEC: self._get_spec,
+            _STEP: self._step,
+            _RESET: self._reset,
+            _SAMPLE_GOALS: self._sample_goals,
+            _COMPUTE_REWARDS: self._compute_rewards,
+        }
+        self._listener = _create_socket(address)
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.remove(address)
+        self._listener.bind(address)
+        self._listener.listen(1)
+
+    def serve_forever(self):
+        """
+        Serve clients one at a time until `close` is called.
+        """
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except OSError:
+                break
+            _set_nodelay(connection)
+            with connection:
+                self._serve_connection(connection)
+
+    def close(self):
+        # Closing alone does not wake up an `accept` blocked in another
+        # thread.
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def _serve_connection(self, connection):
+        while True:
+            try:
+                command, payload = _recv_frame(connection)
+            except EOFError:
+                return
+            try:
+                response = self._handlers[command](payload)
+                _send_frame(connection, _OK, response)
+            except Exception:
+                _send_frame(
+                    connection, _ERROR, [traceback.format_exc().encode()]
+                )
+
+    def _get_spec(self, payload):
+        env = self.envs[0]
+        return [pickle.dumps(dict(
+            num_envs=len(self.envs),
+            observation_space=env.observation_space,
+            action_space=env.action_space,
+            info_schema=getattr(env, 'info_schema', {}),
+        ))]
+
+    def _step(self, payload):
+        env_ids, offset = _decode_env_ids(payload, 0)
+        actions, _ = _decode_array(
+            payload,
+            offset,
+            self.action_space.dtype,
+            (len(env_ids),) + self.action_space.shape,
+        )
+        obs_list = []
+        rewards = np.zeros(len(env_ids))
+        dones = np.zeros(len(env_ids), dtype=np.bool_)
+        infos = {k: [] for k in self.info_codec.keys}
+        for i, env_id in enumerate(env_ids):
+            obs, rewards[i], dones[i], info = self.envs[env_id].step(
+                actions[i]
+            )
+            obs_list.append(obs)
+            for k in self.info_codec.keys:
+                infos[k].append(info[k])
+        return (
+            self.observation_codec.encode(
+                _stack_dicts(obs_list), len(env_ids)
+            )
+            + [rewards, dones]
+            + self.info_codec.encode(infos, len(env_ids))
+        )
+
+    def _reset(self, payload):
+        env_ids, _ = _decode_env_ids(payload, 0)
+        obs_list = [self.envs[env_id].reset() for env_id in env_ids]
+        return self.observation_codec.encode(
+            _stack_dicts(obs_list), len(env_ids)
+        )
+
+    def _sample_goals(self, payload):
+        batch_size, = _UINT32.unpack_from(payload, 0)
+        goals = self.envs[0].sample_goals(batch_size)
+        return self.observation_codec.encode(goals, batch_size)
+
+    def _compute_rewards(self, payload):
+        obs, offset = self.observation_codec.decode(payload, 0)
+        batch_size = len(next(iter(obs.values())))
+        actions, _ = _decode_array(
+            payload,
+            offset,
+            self.action_space.dtype,
+            (batch_size,) + self.action_space.shape,
+        )
+        rewards = self.envs[0].compute_rewards(actions, obs)
+        return [np.asarray(rewards, dtype=np.float64)]
+
+
+class EnvClient(object):
+    """
+    Batched interface to the envs of an EnvServer.
+    """
+    def __init__(self, address):
+        self._socket = _create_socket(address)
+        self._socket.connect(address)
+        _set_nodelay(self._socket)
+        spec = pickle.loads(bytes(self._request(_GET_SPEC, [])))
+        self.num_envs = spec['num_envs']
+        self.observation_space = spec['observation_space']
+        self.action_space = spec['action_space']
+        self.info_schema = spec['info_schema']
+        self.observation_codec = DictCodec.from_space(self.observation_space)
+        self.info_codec = DictCodec.from_info_schema(self.info_schema)
+        self._all_env_ids = np.arange(self.num_envs)
+
+    def step(self, actions, env_ids=None):
+        """
+        :param actions: Array of size len(env_ids) x action_dim.
+        :param env_ids: Envs to step. Defaults to all envs.
+        :return: (obs, rewards, dones, infos). `obs` and `infos` map each
+        key to an array with one row per env.
+        """
+        if env_ids is None:
+            env_ids = self._all_env_ids
+        num_envs = len(env_ids)
+        payload = self._request(_STEP, _encode_env_ids(env_ids) + [_as_bytes(
+            actions,
+            self.action_space.dtype,
+            (num_envs,) + self.action_space.shape,
+        )])
+        obs, offset = self.observation_codec.decode(payload, 0)
+        rewards, offset = _decode_array(
+            payload, offset, np.float64, (num_envs,)
+        )
+        dones, offset = _decode_array(payload, offset, np.bool_, (num_envs,))
+        infos, _ = self.info_codec.decode(payload, offset)
+        return obs, rewards, dones, infos
+
+    def reset(self, env_ids=None):
+        if env_ids is None:
+            env_ids = self._all_env_ids
+        payload = self._request(_RESET, _encode_env_ids(env_ids))
+        return self.observation_codec.decode(payload, 0)[0]
+
+    def sample_goals(self, batch_size):
+        payload = self._request(_SAMPLE_GOALS, [_UINT32.pack(batch_size)])
+        return self.observation_codec.decode(payload, 0)[0]
+
+    def compute_rewards(self, actions, obs):
+        batch_size = len(actions)
+        payload = self._request(
+            _COMPUTE_REWARDS,
+            self.observation_codec.encode(obs, batch_size) + [_as_bytes(
+                actions,
+                self.action_space.dtype,
+                (batch_size,) + self.action_space.shape,
+            )],
+        )
+        return _decode_array(payload, 0, np.float64, (batch_size,))[0]
+
+    def close(self):
+        self._socket.close()
+
+    def _request(self, command, parts):
+        _send_frame(self._socket, command, parts)
+        status, payload = _recv_frame(self._socket)
+        if status == _ERROR:
+            raise RuntimeError(
+                "EnvServer raised:\n{}".format(bytes(payload).decode())
+            )
+        return payload
+
+
+class RemoteEnv(MultitaskEnv):
+    """
+    A single env of an EnvServer, as a MultitaskEnv.
+    """
+    def __init__(self, client, env_id=0):
+        self.client = client
+        self.env_id = env_id
+        self.observation_space = client.observation_space
+        self.action_space = client.action_space
+        self.info_schema = client.info_schema
+        self._env_ids = np.array([env_id])
+        self._goal = None
+
+    def step(self, action):
+        obs, rewards, dones, infos = self.client.step(
+            np.asarray(action)[None], self._env_ids
+        )
+        obs = self._unbatchify(obs)
+        info = self.unbatchify_dict(infos, 0)
+        return obs, rewards[0], dones[0], info
+
+    def reset(self):
+        obs = self._unbatchify(self.client.reset(self._env_ids))
+        self._goal = {
+            k: v for k, v in obs.items() if k.endswith('desired_goal')
+        }
+        return obs
+
+    def get_goal(self):
+        return self._goal
+
+    def sample_goals(self, batch_size):
+        return self.client.sample_goals(batch_size)
+
+    def compute_rewards(self, actions, obs):
+        return self.client.compute_rewards(actions, obs)
+
+    def _unbatchify(self, obs):
+        return self.unbatchify_dict(obs, 0)
+
+
+def _create_socket(address):
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+def _set_nodelay(sock):
+    if sock.family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def _send_frame(sock, code, parts):
+    parts = [memoryview(part).cast('B') for part in parts]
+    size = sum(part.nbytes for part in parts)
+    sock.sendall(b''.join([_HEADER.pack(code, size)] + parts))
+
+
+def _recv_frame(sock):
+    header = _recv_exactly(sock, _HEADER.size)
+    code, size = _HEADER.unpack(header)
+    return code, _recv_exactly(sock, size)
+
+
+def _recv_exactly(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise EOFError()
+        received += n
+    return buffer
+
+
+def _as_bytes(value, dtype, shape):
+    array = np.ascontiguousarray(value, dtype=dtype)
+    assert array.size == int(np.prod(shape)), (array.shape, shape)
+    return memoryview(array).cast('B')
+
+
+def _decode_array(buffer, offset, dtype, shape):
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    array = np.frombuffer(buffer, dtype, count, offset).reshape(shape)
+    return array, offset + count * dtype.itemsize
+
+
+def _encode_env_ids(env_ids):
+    env_ids = np.asarray(env_ids, dtype=np.uint32)
+    return [
+        _UINT32.pack(len(env_ids)),
+        _as_bytes(env_ids, np.uint32, env_ids.shape),
+    ]
+
+
+def _decode_env_ids(buffer, offset):
+    num_envs, = _UINT32.unpack_from(buffer, offset)
+    return _decode_array(buffer, offset + 4, np.uint32, (num_envs,))
+
+
+def _stack_dicts(dicts):
+    return {k: np.stack([d[k] for d in dicts]) for k in dicts[0]}
@@ -5,7 +5,26 @@ from multiworld.core.wrapper_env import ProxyEnv
 
 
 class FlatGoalEnv(ProxyEnv):
-    def __init__(self, wrapped_env, obs_keys=None, goal_keys=None):
+    def __init__(
+            self,
+            wrapped_env,
+            obs_keys=None,
+            goal_keys=None,
+            dtype=None,
+            reuse_obs_buffer=False,
+    ):
+        """
+        :param obs_keys: Keys of the observation dictionary to concatenate. A
+        key whose space is itself a Dict is flattened recursively.
+        :param dtype: dtype of the flat observations and goals. Defaults to
+        the common dtype of the `obs_keys` (or `goal_keys`) spaces.
+        :param reuse_obs_buffer: If True, `step` and `reset` write the
+        observation into the same preallocated array every time instead of
+        allocating a new one. The caller must then copy observations it
+        keeps, e.g. `obs` when it also stores `next_obs`. The default
+        returns a fresh array, since most rollout and replay buffer code
+        keeps references to past observations.
+        """
         self.quick_init(locals())
         super(FlatGoalEnv, self).__init__(wrapped_env)
 
@@ -21,38 +40,140 @@ class FlatGoalEnv(ProxyEnv):
 
         self.obs_keys = obs_keys
         self.goal_keys = goal_keys
-        # TODO: handle nested dict
-        self.observation_space = Box(
-            np.hstack([
-                self.wrapped_env.observation_space.spaces[k].low
-                for k in obs_keys
-            ]),
-            np.hstack([
-                self.wrapped_env.observation_space.spaces[k].high
-                for k in obs_keys
-            ]),
-        )
-        self.goal_space = Box(
-            np.hstack([
-                self.wrapped_env.observation_space.spaces[k].low
-                for k in goal_keys
-            ]),
-            np.hstack([
-                self.wrapped_env.observation_space.spaces[k].high
-                for k in goal_keys
-            ]),
-        )
+        self._dtype = dtype
+        self._layouts = {}
+        self._obs_layout = self._get_layout(obs_keys)
+        self._goal_layout = self._get_layout(goal_keys)
+        self.observation_space = self._obs_layout.space
+        self.goal_space = self._goal_layout.space
         self._goal = None
+        if reuse_obs_buffer:
+            self._obs_buffer = np.empty(
+                self._obs_layout.size, dtype=self._obs_layout.dtype
+            )
+        else:
+            self._obs_buffer = None
 
     def step(self, action):
         obs, reward, done, info = self.wrapped_env.step(action)
-        flat_obs = np.hstack([obs[k] for k in self.obs_keys])
+        flat_obs = self._obs_layout.flatten(obs, out=self._obs_buffer)
         return flat_obs, reward, done, info
 
     def reset(self):
         obs = self.wrapped_env.reset()
-        self._goal = np.hstack([obs[k] for k in self.goal_keys])
-        return np.hstack([obs[k] for k in self.obs_keys])
+        self._goal = self._goal_layout.flatten(obs)
+        return self._obs_layout.flatten(obs, out=self._obs_buffer)
 
     def get_goal(self):
         return self._goal
+
+    def flatten(self, obs, keys=None, out=None):
+        """
+        :param obs: Observation dictionary.
+        :param keys: Keys to flatten. Defaults to `obs_keys`.
+        :param out: Optional array to reuse.
+        :return: Flat vector.
+        """
+        return self._get_layout(keys).flatten(obs, out=out)
+
+    def flatten_batch(self, obs_batch, keys=None, out=None):
+        """
+        :param obs_batch: Dictionary mapping keys to arrays of size N x ...
+        :param keys: Keys to flatten. Defaults to `obs_keys`.
+        :param out: Optional N x D array to reuse.
+        :return: N x D array.
+        """
+        return self._get_layout(keys).flatten_batch(obs_batch, out=out)
+
+    def unflatten_batch(self, flat_batch, keys=None):
+        """
+        Inverse of `flatten_batch`.
+
+        :param flat_batch: N x D array.
+        :param keys: Keys that were flattened. Defaults to `obs_keys`.
+        :return: (Nested) dictionary of arrays of size N x ... The arrays are
+        views of `flat_batch` whenever possible.
+        """
+        return self._get_layout(keys).unflatten_batch(flat_batch)
+
+    def _get_layout(self, keys):
+        if keys is None:
+            keys = self.obs_keys
+        keys = tuple(keys)
+        if keys not in self._layouts:
+            self._layouts[keys] = FlatLayout(
+                self.wrapped_env.observation_space, keys, dtype=self._dtype,
+            )
+        return self._layouts[keys]
+
+
+class FlatLayout(object):
+    """
+    Precomputed mapping from the (possibly nested) keys of a Dict space to
+    slices of a flat vector.
+    """
+    def __init__(self, dict_space, keys, dtype=None):
+        self.keys = keys
+        self.leaves = []
+        lows = []
+        highs = []
+        dtypes = []
+        start = 0
+        for path, space in _get_leaf_spaces(dict_space, keys):
+            size = int(np.prod(space.shape))
+            self.leaves.append((path, slice(start, start + size), space.shape))
+            lows.append(np.ravel(space.low))
+            highs.append(np.ravel(space.high))
+            dtypes.append(space.dtype)
+            start += size
+        self.size = start
+        if dtype is None:
+            dtype = np.result_type(*dtypes)
+        self.dtype = np.dtype(dtype)
+        self.space = Box(np.hstack(lows), np.hstack(highs), dtype=self.dtype)
+
+    def flatten(self, obs, out=None):
+        if out is None:
+            out = np.empty(self.size, dtype=self.dtype)
+        for path, flat_slice, _ in self.leaves:
+            out[flat_slice] = np.reshape(_get_value(obs, path), -1)
+        return out
+
+    def flatten_batch(self, obs_batch, out=None):
+        batch_size = len(_get_value(obs_batch, self.leaves[0][0]))
+        if out is None:
+            out = np.empty((batch_size, self.size), dtype=self.dtype)
+        for path, flat_slice, _ in self.leaves:
+            out[:, flat_slice] = np.reshape(
+                _get_value(obs_batch, path), (batch_size, -1)
+            )
+        return out
+
+    def unflatten_batch(self, flat_batch):
+        batch_size = len(flat_batch)
+        obs_batch = {}
+        for path, flat_slice, shape in self.leaves:
+            d = obs_batch
+            for k in path[:-1]:
+                d = d.setdefault(k, {})
+            d[path[-1]] = flat_batch[:, flat_slice].reshape(
+                (batch_size,) + shape
+            )
+        return obs_batch
+
+
+def _get_leaf_spaces(dict_space, keys, prefix=()):
+    leaves = []
+    for k in keys:
+        space = dict_space.spaces[k]
+        if isinstance(space, Dict):
+            leaves += _get_leaf_spaces(space, space.spaces.keys(), prefix + (k,))
+        else:
+            leaves.append((prefix + (k,), space))
+    return leaves
+
+
+def _get_value(obs, path):
+    for k in path:
+        obs = obs[k]
+    return obs
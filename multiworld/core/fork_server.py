@@ -0,0 +1,202 @@
+"""
+Spawn env worker processes by forking a fully initialized template env.
+
+Building a Sawyer env compiles the XML, creates the `MjSim`, sets up cameras,
+and settles the arm during `reset`. Rather than paying for this in every
+worker, a `ForkServerEnvFactory` builds the env once in a server process and
+forks that process for each new worker. Workers start with the template's
+state, and the model memory is shared copy-on-write.
+
+```
+factory = ForkServerEnvFactory.from_env(env)
+worker = factory.spawn()
+obs = worker.reset()
+next_obs, reward, done, info = worker.step(action)
+worker.close()
+factory.close()
+```
+
+Only works on Unix. GPU rendering contexts usually do not survive a fork, so
+camera setup in the template should use a CPU (OSMesa) renderer.
+"""
+import os
+import random
+import signal
+import socket
+import struct
+import traceback
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+
+import numpy as np
+
+_PID_FORMAT = '!i'
+_SEED_FORMAT = '!q'
+
+
+class ForkServerEnvFactory(object):
+    def __init__(self, env_class, env_state, reset_template=True):
+        """
+        :param env_class: Class of the env. Must be `Serializable`.
+        :param env_state: The env's `__getstate__()` payload.
+        :param reset_template: If True, reset the template env once so that
+        workers start from a settled state.
+        """
+        self.env_class = env_class
+        self.env_state = env_state
+        self._control, server_control = socket.socketpair(socket.AF_UNIX)
+        self._server = get_context('fork').Process(
+            target=_serve,
+            args=(
+                env_class, env_state, reset_template, server_control,
+                self._control,
+            ),
+            daemon=True,
+        )
+        self._server.start()
+        server_control.close()
+        # Wait until the template env is built.
+        self._recv_pid()
+
+    @classmethod
+    def from_env(cls, env, **kwargs):
+        return cls(type(env), env.__getstate__(), **kwargs)
+
+    def spawn(self, seed=None):
+        """
+        Fork a new worker from the template env.
+
+        :param seed: Seed for the worker's `np.random` and `env.seed`. By
+        default, the worker's `np.random` is seeded from OS entropy so that
+        workers do not replay the template's random numbers.
+        :return: ForkedEnvWorker
+        """
+        worker_socket, child_socket = socket.socketpair(socket.AF_UNIX)
+        message = struct.pack(_SEED_FORMAT, -1 if seed is None else seed)
+        socket.send_fds(self._control, [message], [child_socket.fileno()])
+        child_socket.close()
+        pid = self._recv_pid()
+        return ForkedEnvWorker(Connection(worker_socket.detach()), pid)
+
+    def close(self):
+        if self._control is not None:
+            # Processes forked later (e.g. other factories' servers) hold
+            # copies of this socket, so closing it alone would not signal EOF.
+            self._control.shutdown(socket.SHUT_RDWR)
+            self._control.close()
+            self._control = None
+            self._server.join()
+
+    def _recv_pid(self):
+        data = b''
+        while len(data) < struct.calcsize(_PID_FORMAT):
+            chunk = self._control.recv(struct.calcsize(_PID_FORMAT) - len(data))
+            if not chunk:
+                raise EOFError("Fork server exited.")
+            data += chunk
+        return struct.unpack(_PID_FORMAT, data)[0]
+
+
+class ForkedEnvWorker(object):
+    """
+    Handle to an env running in a forked worker process. Env methods are
+    called remotely, e.g. `worker.step(action)`.
+    """
+    def __init__(self, connection, pid):
+        self._connection = connection
+        self.pid = pid
+
+    def call(self, method_name, *args, **kwargs):
+        self.call_async(method_name, *args, **kwargs)
+        return self.wait()
+
+    def call_async(self, method_name, *args, **kwargs):
+        """
+        Start a remote call without waiting for it. Get the result with
+        `wait`.
+        """
+        self._connection.send((method_name, args, kwargs))
+
+    def wait(self):
+        status, result = self._connection.recv()
+        if status == 'error':
+            raise RuntimeError(
+                "Env worker {} raised:\n{}".format(self.pid, result)
+            )
+        return result
+
+    def get_attr(self, attrname):
+        return self.call(None, attrname)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.send(None)
+            self._connection.close()
+            self._connection = None
+
+    def __getattr__(self, attrname):
+        if attrname.startswith('_'):
+            raise AttributeError(attrname)
+
+        def remote_method(*args, **kwargs):
+            return self.call(attrname, *args, **kwargs)
+        return remote_method
+
+
+def _serve(env_class, env_state, reset_template, control, client_control):
+    # Otherwise the server would never see the client close its end.
+    client_control.close()
+    # Forked workers are reaped automatically.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    env = env_class.__new__(env_class)
+    env.__setstate__(env_state)
+    if reset_template:
+        env.reset()
+    control.sendall(struct.pack(_PID_FORMAT, os.getpid()))
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(
+                control, struct.calcsize(_SEED_FORMAT), 1
+            )
+        except OSError:
+            break
+        if not message:
+            break
+        seed = struct.unpack(_SEED_FORMAT, message)[0]
+        pid = os.fork()
+        if pid == 0:
+            control.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            try:
+                _run_worker(env, Connection(fds[0]), seed)
+            finally:
+                os._exit(0)
+        os.close(fds[0])
+        control.sendall(struct.pack(_PID_FORMAT, pid))
+
+
+def _run_worker(env, connection, seed):
+    if seed < 0:
+        np.random.seed()
+        random.seed()
+    else:
+        np.random.seed(seed)
+        random.seed(seed)
+        env.seed(seed)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method_name, args, kwargs = request
+        try:
+            if method_name is None:
+                result = getattr(env, args[0])
+            else:
+                result = getattr(env, method_name)(*args, **kwargs)
+            connection.send(('ok', result))
+        except Exception:
+            connection.send(('error', traceback.format_exc()))
+    connection.close()
@@ -1,11 +1,10 @@
-import cv2
-import mujoco_py
 import numpy as np
 import warnings
-from PIL import Image
 from gym.spaces import Box, Dict
 
-from multiworld.core.wrapper_env import ProxyEnv
+from multiworld.core.display import LatestFrameDisplay
+from multiworld.core.fork_server import ForkServerEnvFactory
+from multiworld.core.wrapper_env import ProxyEnv, get_attr_owner
 
 
 class ImageEnv(ProxyEnv):
@@ -17,7 +16,21 @@ class ImageEnv(ProxyEnv):
             transpose=False,
             grayscale=False,
             normalize=False,
+            dtype=None,
+            depth=False,
+            segmentation=False,
+            depth_dtype=np.float16,
     ):
+        """
+        :param dtype: dtype of the images if `normalize` is True. Defaults to
+        the dtype of the wrapped env, or float64.
+        :param depth: If True, add a 'depth_observation' key with the depth
+        image from the same render as the RGB image.
+        :param segmentation: If True, add a 'segmentation_observation' key
+        with the body id + 1 of each pixel (0 for background) as uint8.
+        :param depth_dtype: A float dtype for depth values in [0, 1], or
+        np.uint16 for depth values scaled to [0, 65535].
+        """
         self.quick_init(locals())
         super().__init__(wrapped_env)
         self.wrapped_env.hide_goal_markers = True
@@ -26,6 +39,12 @@ class ImageEnv(ProxyEnv):
         self.transpose = transpose
         self.grayscale = grayscale
         self.normalize = normalize
+        self.depth = depth
+        self.segmentation = segmentation
+        self.depth_dtype = np.dtype(depth_dtype)
+        if dtype is None:
+            dtype = getattr(wrapped_env, 'dtype', np.float64)
+        self.dtype = dtype
 
         if grayscale:
             self.image_length = self.imsize * self.imsize
@@ -40,10 +59,15 @@ class ImageEnv(ProxyEnv):
             # viewer = mujoco_py.MjRenderContextOffscreen(sim, device_id=-1)
             # init_camera(viewer.cam)
             # sim.add_render_context(viewer)
-        self._render_local = False
+        self._display = None
         self._img_goal = None
+        self._render_factory = None
+        self._render_workers = []
 
-        img_space = Box(0, 1, (self.image_length,))
+        if self.normalize:
+            img_space = Box(0, 1, (self.image_length,), dtype=self.dtype)
+        else:
+            img_space = Box(0, 255, (self.image_length,), dtype=np.uint8)
         spaces = self.wrapped_env.observation_space.spaces
         spaces['observation'] = img_space
         spaces['desired_goal'] = img_space
@@ -51,6 +75,20 @@ class ImageEnv(ProxyEnv):
         spaces['image_observation'] = img_space
         spaces['image_desired_goal'] = img_space
         spaces['image_achieved_goal'] = img_space
+        pixels_shape = (self.imsize * self.imsize,)
+        if depth:
+            if self.depth_dtype == np.uint16:
+                spaces['depth_observation'] = Box(
+                    0, 65535, pixels_shape, dtype=np.uint16
+                )
+            else:
+                spaces['depth_observation'] = Box(
+                    0, 1, pixels_shape, dtype=self.depth_dtype
+                )
+        if segmentation:
+            spaces['segmentation_observation'] = Box(
+                0, 255, pixels_shape, dtype=np.uint8
+            )
         self.observation_space = Dict(spaces)
 
     def step(self, action):
@@ -67,7 +105,7 @@ class ImageEnv(ProxyEnv):
         return self._update_obs(obs)
 
     def _update_obs(self, obs):
-        img_obs = self._get_flat_img()
+        img_obs = self._get_flat_img(extra_obs=obs)
         obs['image_observation'] = img_obs
         obs['image_desired_goal'] = self._img_goal
         obs['image_achieved_goal'] = img_obs
@@ -76,23 +114,140 @@ class ImageEnv(ProxyEnv):
         obs['achieved_goal'] = img_obs
         return obs
 
-    def _get_flat_img(self):
+    def _get_flat_img(self, extra_obs=None):
+        """
+        :param extra_obs: If given, the depth and segmentation images (if
+        enabled) from the same render are added to this dictionary.
+        """
         # returns the image as a torch format np array
-        image_obs = self._wrapped_env.get_image()
-        if self._render_local:
-            cv2.imshow('env', image_obs)
-            cv2.waitKey(1)
-        if self.grayscale:
+        if self.depth or self.segmentation:
+            images = self._wrapped_env.get_images(
+                width=self.imsize,
+                height=self.imsize,
+                depth=self.depth,
+                segmentation=self.segmentation,
+            )
+            image_obs = images['rgb']
+            if extra_obs is not None:
+                self._add_depth_and_segmentation(images, extra_obs)
+        else:
+            image_obs = self._get_rgb_image()
+        if self._display is not None:
+            self._display.publish(image_obs)
+        image_obs = self._flatten_image(image_obs)
+        if self.normalize:
+            image_obs = image_obs.astype(self.dtype)
+            image_obs /= 255.0
+        return image_obs
+
+    def _get_rgb_image(self):
+        # Same size as the images from `get_images`, so that `image_length`
+        # holds whether or not depth and segmentation are enabled.
+        return self._wrapped_env.get_image(
+            width=self.imsize, height=self.imsize,
+        )
+
+    def _add_depth_and_segmentation(self, images, obs):
+        if self.depth:
+            depth = images['depth']
+            if self.depth_dtype == np.uint16:
+                depth = depth * 65535
+            depth = depth.astype(self.depth_dtype)
+            if self.transpose:
+                depth = depth.transpose()
+            obs['depth_observation'] = depth.ravel()
+        if self.segmentation:
+            segmentation = images['segmentation']
+            if self.transpose:
+                segmentation = segmentation.transpose()
+            obs['segmentation_observation'] = segmentation.ravel()
+
+    def _flatten_image(self, image_obs):
+        # Single-channel images, e.g. from Point2DEnv, are already grayscale.
+        if self.grayscale and image_obs.ndim == 3:
+            from PIL import Image
             image_obs = Image.fromarray(image_obs).convert('L')
             image_obs = np.array(image_obs)
-        if self.normalize:
-            image_obs = image_obs / 255.0
         if self.transpose:
             image_obs = image_obs.transpose()
-        return image_obs.flatten()
+        # The rendered image is a new array, so a view is enough.
+        return image_obs.ravel()
+
+    def enable_render(self, fps=30):
+        """
+        Show the rendered images in a window. The window is updated on a
+        separate thread, so this does not slow down `step`.
+        """
+        if self._display is None:
+            self._display = LatestFrameDisplay(_show_with_cv2, fps=fps)
 
-    def enable_render(self):
-        self._render_local = True
+    def disable_render(self):
+        if self._display is not None:
+            self._display.stop()
+            self._display = None
+
+    """
+    Batched rendering
+    """
+    def render_states(self, states, out=None):
+        """
+        Render a batch of env states. The env's own state is left unchanged.
+
+        :param states: Sequence of states as returned by `get_env_state`.
+        :param out: Optional N x image_length uint8 array to fill.
+        :return: N x image_length uint8 array of unnormalized images.
+        """
+        if out is None:
+            out = np.empty((len(states), self.image_length), dtype=np.uint8)
+        if self._render_workers:
+            chunks = np.array_split(
+                np.arange(len(states)), len(self._render_workers)
+            )
+            for worker, chunk in zip(self._render_workers, chunks):
+                worker.call_async('render_states', [states[i] for i in chunk])
+            for worker, chunk in zip(self._render_workers, chunks):
+                out[chunk] = worker.wait()
+            return out
+
+        env = self.wrapped_env
+        original_state = env.get_env_state()
+        try:
+            # Rendering only needs positions, so skip the full sim.forward.
+            sim_env = get_attr_owner(env, 'forward_kinematics_only')
+        except AttributeError:
+            sim_env = None
+        if sim_env is not None:
+            sim_env.forward_kinematics_only = True
+        try:
+            for i, state in enumerate(states):
+                env.set_env_state(state)
+                out[i] = self._flatten_image(self._get_rgb_image())
+        finally:
+            if sim_env is not None:
+                sim_env.forward_kinematics_only = False
+            env.set_env_state(original_state)
+        return out
+
+    def start_render_workers(self, num_workers):
+        """
+        Make `render_states` split its batches over `num_workers` processes
+        forked from a copy of this env.
+        """
+        self.stop_render_workers()
+        self._render_factory = ForkServerEnvFactory.from_env(
+            self, reset_template=False,
+        )
+        self._render_workers = [
+            self._render_factory.spawn() for _ in range(num_workers)
+        ]
+
+    def stop_render_workers(self):
+        for worker in self._render_workers:
+            worker.close()
+        self._render_workers = []
+        if self._render_factory is not None:
+            self._render_factory.close()
+            self._render_factory = None
 
     """
     Multitask functions
@@ -106,7 +261,10 @@ class ImageEnv(ProxyEnv):
     def sample_goals(self, batch_size):
         if batch_size > 1:
             warnings.warn("Sampling goal images is slow")
-        img_goals = np.zeros((batch_size, self.image_length))
+        img_goals = np.zeros(
+            (batch_size, self.image_length),
+            dtype=self.observation_space.spaces['image_desired_goal'].dtype,
+        )
         goals = self.wrapped_env.sample_goals(batch_size)
         for i in range(batch_size):
             goal = self.unbatchify_dict(goals, i)
@@ -116,9 +274,16 @@ class ImageEnv(ProxyEnv):
         goals['image_desired_goal'] = img_goals
         return goals
 
-    def compute_rewards(self, achieved_goals, desired_goals, info):
+    def compute_rewards(self, actions, obs):
+        achieved_goals = np.asarray(obs['achieved_goal'], dtype=np.float64)
+        desired_goals = obs['desired_goal']
         return - np.linalg.norm(achieved_goals - desired_goals, axis=1)
 
+def _show_with_cv2(image):
+    import cv2
+    cv2.imshow('env', image)
+    cv2.waitKey(1)
+
 def normalize_image(image):
     assert image.dtype == np.uint8
     return np.float64(image) / 255.0
@@ -1,9 +1,19 @@
 import abc
 from collections import OrderedDict
+from collections.abc import Mapping
 import numpy as np
 
+from multiworld.core import async_env
+from multiworld.core.env_info_buffer import EnvInfoBuffer
+
 
 class MultitaskEnv(metaclass=abc.ABCMeta):
+    # Ordered mapping from each key of the info dictionary returned by `step`
+    # to the shape of its value. Envs that declare this and implement
+    # `_get_info_values` support columnar info recording.
+    info_schema = OrderedDict()
+    _info_buffer = None
+
     @abc.abstractmethod
     def get_goal(self):
         """
@@ -38,10 +48,12 @@ class MultitaskEnv(metaclass=abc.ABCMeta):
         return self.unbatchify_dict(goals, 0)
 
     def compute_reward(self, action, obs):
+        """
+        Single-sample version of `compute_rewards`. Envs can override this
+        with a faster path, as long as the result is identical.
+        """
         actions = action[None]
-        next_obs = {
-            k: v[None] for k, v in obs.items()
-        }
+        next_obs = _BatchOfOne(obs)
         return self.compute_rewards(actions, next_obs)[0]
 
     def get_diagnostics(self, *args, **kwargs):
@@ -61,6 +73,55 @@ class MultitaskEnv(metaclass=abc.ABCMeta):
         """
         return OrderedDict()
 
+    """
+    asyncio versions of the blocking functions. See `async_env`.
+    """
+    async def async_step(self, action, executor=None):
+        return await async_env.async_step(self, action, executor)
+
+    async def async_reset(self, executor=None):
+        return await async_env.async_reset(self, executor)
+
+    async def async_sample_goals(self, batch_size, executor=None):
+        return await async_env.async_sample_goals(self, batch_size, executor)
+
+    """
+    Columnar env_info recording.
+    """
+    def start_info_recording(self, max_path_length):
+        """
+        Write the info of every `step` into a preallocated EnvInfoBuffer
+        instead of building a new dictionary. While recording, `step` returns
+        an empty info dictionary.
+
+        Usage:
+        ```
+        info_buffer = env.start_info_recording(max_path_length)
+        for _ in range(path_length):
+            env.step(action)
+        path['env_infos'] = info_buffer.pop_path()
+        ```
+        :return: The EnvInfoBuffer that `step` writes into.
+        """
+        self._info_buffer = EnvInfoBuffer(self.info_schema, max_path_length)
+        return self._info_buffer
+
+    def stop_info_recording(self):
+        self._info_buffer = None
+
+    def _get_info_values(self, *args, **kwargs):
+        """
+        :return: Sequence of info values in the same order as `info_schema`.
+        """
+        raise NotImplementedError()
+
+    def _get_info(self, *args, **kwargs):
+        values = self._get_info_values(*args, **kwargs)
+        if self._info_buffer is not None:
+            self._info_buffer.append_values(values)
+            return {}
+        return dict(zip(self.info_schema, values))
+
     @staticmethod
     def unbatchify_dict(batch_dict, i):
         """
@@ -84,3 +145,23 @@ class MultitaskEnv(metaclass=abc.ABCMeta):
         for k in batch_dict.keys():
             new_d[k] = batch_dict[k][i]
         return new_d
+
+
+class _BatchOfOne(Mapping):
+    """
+    Read-only view of a single observation dictionary as a batch of size one.
+    The batch dimension is only added to the values that are accessed.
+    """
+    __slots__ = ['_obs']
+
+    def __init__(self, obs):
+        self._obs = obs
+
+    def __getitem__(self, key):
+        return self._obs[key][None]
+
+    def __iter__(self):
+        return iter(self._obs)
+
+    def __len__(self):
+        return len(self._obs)
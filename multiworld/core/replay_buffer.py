@@ -0,0 +1,172 @@
+import numpy as np
+from gym.spaces import Dict
+
+from multiworld.core.image_env import normalize_image, unormalize_image
+
+
+class ObsDictRelabelingBuffer(object):
+    """
+    Replay buffer for MultitaskEnvs that relabels goals (as in Hindsight
+    Experience Replay) and recomputes rewards with `env.compute_rewards`.
+
+    Every observation key is stored column-wise in a preallocated array. Image
+    keys (keys that start with 'image') are stored as uint8.
+
+    Each goal key `X_desired_goal` is relabeled with the corresponding
+    `X_achieved_goal` of the new goal state. For a sampled batch,
+     - `fraction_goals_future` get an achieved goal from later in the same
+       path,
+     - `fraction_goals_final` get the final achieved goal of the same path,
+     - `fraction_goals_random` get an achieved goal from a random transition
+       in the buffer,
+     - `fraction_goals_env` get a goal from `env.sample_goals`,
+     - the rest keep the goal that was used in the rollout.
+    """
+    def __init__(
+            self,
+            max_size,
+            env,
+            observation_keys=None,
+            fraction_goals_future=0.4,
+            fraction_goals_final=0.,
+            fraction_goals_random=0.4,
+            fraction_goals_env=0.,
+    ):
+        assert isinstance(env.observation_space, Dict)
+        assert (
+            fraction_goals_future + fraction_goals_final
+            + fraction_goals_random + fraction_goals_env
+        ) <= 1
+        spaces = env.observation_space.spaces
+        if observation_keys is None:
+            observation_keys = list(spaces.keys())
+        self.max_size = max_size
+        self.env = env
+        self.observation_keys = observation_keys
+        self.fraction_goals_future = fraction_goals_future
+        self.fraction_goals_final = fraction_goals_final
+        self.fraction_goals_random = fraction_goals_random
+        self.fraction_goals_env = fraction_goals_env
+
+        self.desired_to_achieved_keys = {
+            k: k.replace('desired_goal', 'achieved_goal')
+            for k in observation_keys
+            if k.endswith('desired_goal')
+            and k.replace('desired_goal', 'achieved_goal') in observation_keys
+        }
+        self._normalized_image_keys = set()
+        self._obs = {}
+        self._next_obs = {}
+        for k in observation_keys:
+            space = spaces[k]
+            dtype = space.dtype
+            if k.startswith('image'):
+                if dtype != np.uint8:
+                    self._normalized_image_keys.add(k)
+                dtype = np.uint8
+            self._obs[k] = np.zeros((max_size,) + space.shape, dtype=dtype)
+            self._next_obs[k] = np.zeros(
+                (max_size,) + space.shape, dtype=dtype
+            )
+        action_space = env.action_space
+        self._actions = np.zeros(
+            (max_size,) + action_space.shape, dtype=action_space.dtype
+        )
+        self._terminals = np.zeros(max_size, dtype=np.bool_)
+        # Number of transitions from each transition to the end of its path,
+        # including itself.
+        self._steps_left = np.zeros(max_size, dtype=np.int64)
+        self._top = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add_path(self, path):
+        """
+        :param path: Dictionary with keys 'observations', 'actions',
+        'next_observations', and optionally 'terminals'. The observations
+        are either a list of observation dictionaries or a dictionary of
+        arrays.
+        """
+        actions = np.asarray(path['actions'])
+        path_len = len(actions)
+        assert path_len <= self.max_size
+        indices = (self._top + np.arange(path_len)) % self.max_size
+        for column, observations in [
+            (self._obs, path['observations']),
+            (self._next_obs, path['next_observations']),
+        ]:
+            for k in self.observation_keys:
+                if isinstance(observations, dict):
+                    values = np.asarray(observations[k])
+                else:
+                    values = np.array([o[k] for o in observations])
+                if k in self._normalized_image_keys:
+                    values = unormalize_image(values)
+                column[k][indices] = values
+        self._actions[indices] = actions.reshape(
+            (path_len,) + self._actions.shape[1:]
+        )
+        if 'terminals' in path:
+            self._terminals[indices] = np.asarray(path['terminals']).ravel()
+        else:
+            self._terminals[indices] = False
+        self._steps_left[indices] = np.arange(path_len, 0, -1)
+        self._top = (self._top + path_len) % self.max_size
+        self._size = min(self._size + path_len, self.max_size)
+
+    def random_batch(self, batch_size):
+        indices = np.random.randint(0, self._size, batch_size)
+        obs = {k: v[indices] for k, v in self._obs.items()}
+        next_obs = {k: v[indices] for k, v in self._next_obs.items()}
+        actions = self._actions[indices]
+
+        num_future = int(batch_size * self.fraction_goals_future)
+        num_final = int(batch_size * self.fraction_goals_final)
+        num_random = int(batch_size * self.fraction_goals_random)
+        num_env = int(batch_size * self.fraction_goals_env)
+
+        future_end = num_future
+        final_end = future_end + num_final
+        random_end = final_end + num_random
+        env_end = random_end + num_env
+
+        future_indices = indices[:future_end]
+        future_offsets = np.floor(
+            np.random.random(num_future) * self._steps_left[future_indices]
+        ).astype(np.int64)
+        final_indices = indices[future_end:final_end]
+        final_offsets = self._steps_left[final_indices] - 1
+        goal_indices = np.concatenate((
+            (future_indices + future_offsets) % self.max_size,
+            (final_indices + final_offsets) % self.max_size,
+            np.random.randint(0, self._size, num_random),
+        ))
+        for desired_key, achieved_key in self.desired_to_achieved_keys.items():
+            new_goals = self._next_obs[achieved_key][goal_indices]
+            obs[desired_key][:random_end] = new_goals
+            next_obs[desired_key][:random_end] = new_goals
+
+        if num_env > 0:
+            env_goals = self.env.sample_goals(num_env)
+            for k, goals in env_goals.items():
+                if k not in obs:
+                    continue
+                if k in self._normalized_image_keys:
+                    goals = unormalize_image(goals)
+                obs[k][random_end:env_end] = goals
+                next_obs[k][random_end:env_end] = goals
+
+        for k in self._normalized_image_keys:
+            obs[k] = normalize_image(obs[k])
+            next_obs[k] = normalize_image(next_obs[k])
+        rewards = self.env.compute_rewards(actions, next_obs)
+        return {
+            'observations': obs,
+            'actions': actions,
+            'rewards': rewards,
+            'terminals': self._terminals[indices],
+            'next_observations': next_obs,
+            'indices': indices,
+        }
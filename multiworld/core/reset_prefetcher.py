@@ -0,0 +1,56 @@
+import os
+
+from multiworld.core.fork_server import ForkServerEnvFactory
+
+
+class ResetPrefetcher(object):
+    """
+    Prepares the next episode's start state in a worker process.
+
+    A copy of the env runs in a process forked by a `ForkServerEnvFactory`.
+    It resets while the current episode runs, and `get` hands out its
+    `get_flat_env_state()`. The owning env then only needs
+    `set_flat_env_state` to start a new episode. The copy has its own
+    process, so its reset overlaps with the owner's stepping even though
+    mujoco_py holds the GIL.
+    """
+    def __init__(self, env_class, env_state, seed=None):
+        """
+        :param env_class: Class of the env. Must be `Serializable`.
+        :param env_state: `__getstate__()` payload used to build the copy.
+        :param seed: Seed of the copy's random number generators, so that
+        the sequence of start states is reproducible.
+        """
+        self.env_class = env_class
+        self.env_state = env_state
+        self._start(seed)
+
+    def get(self):
+        """
+        :return: The next start state. Blocks if it is not ready yet.
+        """
+        if self._pid != os.getpid():
+            # The worker belongs to the process this one was forked from.
+            self._start(None)
+        self._worker.wait()
+        state = self._worker.wait()
+        self._request_state()
+        return state
+
+    def close(self):
+        if self._pid == os.getpid():
+            self._worker.close()
+            self._factory.close()
+
+    def _start(self, seed):
+        self._pid = os.getpid()
+        self._factory = ForkServerEnvFactory(
+            self.env_class, self.env_state, reset_template=False,
+        )
+        self._worker = self._factory.spawn(seed=seed)
+        self._request_state()
+
+    def _request_state(self):
+        # The worker handles calls in order, so both are queued at once.
+        self._worker.call_async('reset')
+        self._worker.call_async('get_flat_env_state')
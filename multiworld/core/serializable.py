@@ -7,6 +7,19 @@ https://github.com/rll/rllab
 import inspect
 import sys
 
+_init_argspecs = {}
+
+
+def _get_init_argspec(cls):
+    spec = _init_argspecs.get(cls)
+    if spec is None:
+        if sys.version_info >= (3, 0):
+            spec = inspect.getfullargspec(cls.__init__)
+        else:
+            spec = inspect.getargspec(cls.__init__)
+        _init_argspecs[cls] = spec
+    return spec
+
 
 class Serializable(object):
 
@@ -17,8 +30,8 @@ class Serializable(object):
     def quick_init(self, locals_):
         if getattr(self, "_serializable_initialized", False):
             return
+        spec = _get_init_argspec(type(self))
         if sys.version_info >= (3, 0):
-            spec = inspect.getfullargspec(self.__init__)
             # Exclude the first "self" parameter
             if spec.varkw:
                 kwargs = locals_[spec.varkw].copy()
@@ -28,7 +41,6 @@ class Serializable(object):
                 for key in spec.kwonlyargs:
                     kwargs[key] = locals_[key]
         else:
-            spec = inspect.getargspec(self.__init__)
             if spec.keywords:
                 kwargs = locals_[spec.keywords]
             else:
@@ -42,18 +54,40 @@ class Serializable(object):
         self.__kwargs = kwargs
         setattr(self, "_serializable_initialized", True)
 
+    def set_snapshot_pickling(self, enabled=True):
+        """
+        If enabled, pickling also stores the env's state, and unpickling
+        restores that state right after construction. The copy is then ready
+        to step without a `reset`.
+
+        The state is the compact `get_flat_env_state()` if the env has it,
+        and `get_env_state()` otherwise. Unpickling still runs the
+        constructor: MuJoCo models and sims cannot be pickled, so each copy
+        has to build its own. Only the `reset` is skipped.
+        """
+        self._serializable_snapshot = enabled
+
     def __getstate__(self):
-        return {"__args": self.__args, "__kwargs": self.__kwargs}
+        d = {"__args": self.__args, "__kwargs": self.__kwargs}
+        if self.__dict__.get("_serializable_snapshot", False):
+            if hasattr(self, "get_flat_env_state"):
+                d["__flat_snapshot"] = self.get_flat_env_state()
+            else:
+                d["__snapshot"] = self.get_env_state()
+        return d
 
     def __setstate__(self, d):
         # convert all __args to keyword-based arguments
-        if sys.version_info >= (3, 0):
-            spec = inspect.getfullargspec(self.__init__)
-        else:
-            spec = inspect.getargspec(self.__init__)
+        spec = _get_init_argspec(type(self))
         in_order_args = spec.args[1:]
         out = type(self)(**dict(zip(in_order_args, d["__args"]), **d["__kwargs"]))
         self.__dict__.update(out.__dict__)
+        if "__flat_snapshot" in d:
+            self.set_snapshot_pickling()
+            self.set_flat_env_state(d["__flat_snapshot"])
+        elif "__snapshot" in d:
+            self.set_snapshot_pickling()
+            self.set_env_state(d["__snapshot"])
 
     @classmethod
     def clone(cls, obj, **kwargs):
@@ -0,0 +1,179 @@
+"""
+Archive of visited env states for reset-to-any-state (Go-Explore style)
+exploration.
+
+States are stored as the fixed-width vectors returned by
+`env.get_flat_env_state()`, in one preallocated array that doubles in size
+when it is full. If `cell_size` is given, states are deduplicated by cell:
+the achieved goal is snapped to a grid of that size, and only the first
+state seen in each cell is kept.
+
+```
+archive = StateArchive(env.get_flat_env_state().size, cell_size=0.02)
+obs = env.reset()
+archive.add_from_env(env, obs)
+...
+archive.restore(env)  # Resets env to a state sampled by weight.
+```
+"""
+import numpy as np
+
+
+class StateArchive(object):
+    def __init__(
+            self,
+            state_size,
+            cell_size=None,
+            initial_capacity=1024,
+            dtype=np.float64,
+    ):
+        """
+        :param state_size: Size of the flat env states.
+        :param cell_size: Grid size used to deduplicate states by their
+        achieved goal. If None, every state is kept.
+        :param initial_capacity: Number of states allocated up front.
+        :param dtype: dtype of the stored states. float32 halves the memory,
+        but restored states are then only approximately equal.
+        """
+        self.state_size = state_size
+        self.cell_size = cell_size
+        self._states = np.zeros((initial_capacity, state_size), dtype=dtype)
+        self._weights = np.zeros(initial_capacity)
+        self._visit_counts = np.zeros(initial_capacity, dtype=np.int64)
+        self._cell_to_index = {}
+        self.size = 0
+
+    """
+    Adding states
+    """
+    def add(self, state, achieved_goal=None, weight=1.):
+        """
+        :param state: Flat env state.
+        :param achieved_goal: Used to find the state's cell. Required if
+        `cell_size` is set.
+        :param weight: Sampling weight of the new state.
+        :return: Index of the state in the archive. If the cell is already
+        in the archive, nothing is added and the existing index is returned.
+        """
+        if self.cell_size is not None:
+            key = self.get_cell(achieved_goal).tobytes()
+            index = self._cell_to_index.get(key)
+            if index is not None:
+                self._visit_counts[index] += 1
+                return index
+            self._cell_to_index[key] = self.size
+        if self.size == len(self._states):
+            self._grow()
+        index = self.size
+        self._states[index] = state
+        self._weights[index] = weight
+        self._visit_counts[index] = 1
+        self.size += 1
+        return index
+
+    def add_from_env(self, env, obs, weight=1.):
+        """
+        Add the env's current state, using `obs['state_achieved_goal']` as
+        the achieved goal.
+        """
+        return self.add(
+            env.get_flat_env_state(),
+            achieved_goal=obs['state_achieved_goal'],
+            weight=weight,
+        )
+
+    def get_cell(self, achieved_goal):
+        return np.floor(
+            np.asarray(achieved_goal) / self.cell_size
+        ).astype(np.int64)
+
+    def _grow(self):
+        capacity = 2 * len(self._states)
+        self._states = _resized(self._states, capacity)
+        self._weights = _resized(self._weights, capacity)
+        self._visit_counts = _resized(self._visit_counts, capacity)
+
+    """
+    Sampling and restoring
+    """
+    @property
+    def states(self):
+        return self._states[:self.size]
+
+    @property
+    def weights(self):
+        """
+        Sampling weights. Assign to this view to reweight the archive, e.g.
+        `archive.weights[:] = 1 / np.sqrt(archive.visit_counts)`.
+        """
+        return self._weights[:self.size]
+
+    @property
+    def visit_counts(self):
+        """
+        Number of times each cell was added. Always 1 without dedup.
+        """
+        return self._visit_counts[:self.size]
+
+    def sample_indices(self, batch_size):
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty archive.")
+        cumulative_weights = np.cumsum(self.weights)
+        total_weight = cumulative_weights[-1]
+        if not total_weight > 0:
+            raise ValueError(
+                "Cannot sample: the weights sum to {}.".format(total_weight)
+            )
+        thresholds = np.random.uniform(0, total_weight, size=batch_size)
+        indices = np.searchsorted(cumulative_weights, thresholds, side='right')
+        # uniform can return its upper bound due to rounding, which would
+        # select past the last state with a nonzero weight.
+        return np.minimum(indices, np.flatnonzero(self.weights)[-1])
+
+    def sample(self, batch_size):
+        """
+        :return: (indices, batch_size x state_size array of states)
+        """
+        indices = self.sample_indices(batch_size)
+        return indices, self.states[indices]
+
+    def restore(self, env, index=None):
+        """
+        Set the env to an archived state.
+
+        :param index: Index of the state. If None, one is sampled by weight.
+        :return: The index of the restored state.
+        """
+        if index is None:
+            index = self.sample_indices(1)[0]
+        env.set_flat_env_state(self.states[index])
+        return index
+
+    """
+    Memory
+    """
+    @property
+    def nbytes_per_state(self):
+        return (
+            self._states.itemsize * self.state_size
+            + self._weights.itemsize
+            + self._visit_counts.itemsize
+        )
+
+    @property
+    def nbytes(self):
+        """
+        Bytes allocated for the arrays, including the unused capacity. The
+        cell dictionary is not counted.
+        """
+        return (
+            self._states.nbytes
+            + self._weights.nbytes
+            + self._visit_counts.nbytes
+        )
+
+
+def _resized(array, capacity):
+    new_array = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    new_array[:len(array)] = array
+    return new_array
@@ -0,0 +1,329 @@
+"""
+Stream trajectories to disk as chunked `.npy` files and read them back with
+memory-mapping.
+
+On disk, every column (e.g. `observations/image_observation` or `actions`)
+is a directory of chunk files:
+```
+directory/
+    metadata.json
+    actions/00000.npy
+    actions/00001.npy
+    observations/image_observation/00000.npy
+    ...
+```
+Each chunk file is preallocated with `chunk_size` rows. `metadata.json`
+records the schema and how many rows are valid.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from queue import Queue
+
+import numpy as np
+from gym.spaces import Dict
+
+from multiworld.core.wrapper_env import ProxyEnv
+
+METADATA_FILE_NAME = 'metadata.json'
+
+
+def _get_chunk_path(directory, column_name, chunk_index):
+    return os.path.join(directory, column_name, '%05d.npy' % chunk_index)
+
+
+class TrajectoryWriter(object):
+    def __init__(
+            self,
+            directory,
+            schema,
+            chunk_size=10000,
+            num_write_threads=2,
+            max_pending_chunks=4,
+    ):
+        """
+        :param directory: Where to save the chunk files.
+        :param schema: Ordered mapping from column name to (shape, dtype) of a
+        single row.
+        :param chunk_size: Number of rows per chunk file.
+        :param num_write_threads: Number of background threads writing full
+        chunks to disk.
+        :param max_pending_chunks: Number of full chunks that can wait to be
+        written before `add` blocks.
+        """
+        self.directory = directory
+        self.schema = OrderedDict(
+            (name, (tuple(shape), np.dtype(dtype)))
+            for name, (shape, dtype) in schema.items()
+        )
+        self.chunk_size = chunk_size
+        for name in self.schema:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+        self._size = 0
+        self._num_chunks = 0
+        self._error = None
+        self._free_chunks = Queue()
+        for _ in range(max_pending_chunks + 1):
+            self._free_chunks.put(None)
+        self._pending_chunks = Queue(maxsize=max_pending_chunks)
+        self._threads = [
+            threading.Thread(target=self._write_loop, daemon=True)
+            for _ in range(num_write_threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._chunk = self._get_free_chunk()
+        self._chunk_top = 0
+        self._closed = False
+
+    def __len__(self):
+        return self._size
+
+    def add(self, row):
+        """
+        :param row: Dictionary mapping every column name to a single value.
+        """
+        self._check_error()
+        for name, column in self._chunk.items():
+            column[self._chunk_top] = row[name]
+        self._chunk_top += 1
+        self._size += 1
+        if self._chunk_top == self.chunk_size:
+            self._submit_chunk()
+
+    def flush(self):
+        """
+        Block until everything added so far is on disk.
+        """
+        if self._chunk_top > 0:
+            # The partial chunk is written now and rewritten once full.
+            self._write_chunk(
+                self._num_chunks, self._chunk, self._chunk_top
+            )
+        self._pending_chunks.join()
+        self._check_error()
+        self._save_metadata()
+
+    def close(self):
+        if self._closed:
+            return
+        if self._chunk_top > 0:
+            self._submit_chunk()
+        for _ in self._threads:
+            self._pending_chunks.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._closed = True
+        self._check_error()
+        self._save_metadata()
+
+    def _get_free_chunk(self):
+        chunk = self._free_chunks.get()
+        if chunk is None:
+            chunk = OrderedDict(
+                (name, np.zeros((self.chunk_size,) + shape, dtype=dtype))
+                for name, (shape, dtype) in self.schema.items()
+            )
+        return chunk
+
+    def _submit_chunk(self):
+        self._pending_chunks.put(
+            (self._num_chunks, self._chunk, self._chunk_top)
+        )
+        self._num_chunks += 1
+        self._chunk = self._get_free_chunk()
+        self._chunk_top = 0
+
+    def _write_loop(self):
+        while True:
+            job = self._pending_chunks.get()
+            if job is None:
+                self._pending_chunks.task_done()
+                return
+            chunk_index, chunk, num_rows = job
+            try:
+                self._write_chunk(chunk_index, chunk, num_rows)
+            except Exception as e:
+                self._error = e
+            self._free_chunks.put(chunk)
+            self._pending_chunks.task_done()
+
+    def _write_chunk(self, chunk_index, chunk, num_rows):
+        for name, column in chunk.items():
+            shape, dtype = self.schema[name]
+            out = np.lib.format.open_memmap(
+                _get_chunk_path(self.directory, name, chunk_index),
+                mode='w+',
+                dtype=dtype,
+                shape=(self.chunk_size,) + shape,
+            )
+            out[:num_rows] = column[:num_rows]
+            out.flush()
+            del out
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _save_metadata(self):
+        metadata = {
+            'size': self._size,
+            'chunk_size': self.chunk_size,
+            'columns': [
+                {'name': name, 'shape': list(shape), 'dtype': dtype.str}
+                for name, (shape, dtype) in self.schema.items()
+            ],
+        }
+        path = os.path.join(self.directory, METADATA_FILE_NAME)
+        with open(path, 'w') as f:
+            json.dump(metadata, f)
+
+
+class TrajectoryReader(object):
+    """
+    Random access to trajectories saved by a TrajectoryWriter. Chunk files are
+    memory-mapped, so only the sampled rows are read from disk.
+    """
+    def __init__(self, directory):
+        path = os.path.join(directory, METADATA_FILE_NAME)
+        with open(path) as f:
+            metadata = json.load(f)
+        self.directory = directory
+        self.chunk_size = metadata['chunk_size']
+        self._size = metadata['size']
+        num_chunks = -(-self._size // self.chunk_size)
+        self.schema = OrderedDict()
+        for column in metadata['columns']:
+            self.schema[column['name']] = (
+                tuple(column['shape']), np.dtype(column['dtype'])
+            )
+        self._chunks = OrderedDict(
+            (name, [
+                np.load(
+                    _get_chunk_path(directory, name, chunk_index),
+                    mmap_mode='r',
+                )
+                for chunk_index in range(num_chunks)
+            ])
+            for name in self.schema
+        )
+
+    def __len__(self):
+        return self._size
+
+    def get_batch(self, indices, column_names=None):
+        """
+        :param indices: Array of row indices.
+        :param column_names: Which columns to load. Defaults to all columns.
+        :return: Dictionary mapping column name to a batch array.
+        """
+        if column_names is None:
+            column_names = self.schema.keys()
+        indices = np.asarray(indices)
+        chunk_indices = indices // self.chunk_size
+        offsets = indices % self.chunk_size
+        unique_chunk_indices = np.unique(chunk_indices)
+        masks = [chunk_indices == i for i in unique_chunk_indices]
+        batch = {}
+        for name in column_names:
+            shape, dtype = self.schema[name]
+            out = np.empty((len(indices),) + shape, dtype=dtype)
+            chunks = self._chunks[name]
+            for chunk_index, mask in zip(unique_chunk_indices, masks):
+                out[mask] = chunks[chunk_index][offsets[mask]]
+            batch[name] = out
+        return batch
+
+    def random_batch(self, batch_size, column_names=None):
+        indices = np.random.randint(0, self._size, batch_size)
+        return self.get_batch(indices, column_names=column_names)
+
+
+class TrajectoryRecorderEnv(ProxyEnv):
+    """
+    Records every transition of the wrapped env to disk.
+
+    Each transition is saved as the columns
+    ```
+    observations/<obs key>
+    next_observations/<obs key>
+    actions
+    rewards
+    terminals
+    env_infos/<info key>
+    ```
+    The observation columns are taken from the Dict observation space and the
+    info columns from the env's `info_schema`.
+    """
+    def __init__(
+            self,
+            wrapped_env,
+            directory,
+            obs_keys=None,
+            info_keys=None,
+            chunk_size=10000,
+            num_write_threads=2,
+    ):
+        self.quick_init(locals())
+        super().__init__(wrapped_env)
+        assert isinstance(self.wrapped_env.observation_space, Dict)
+        spaces = self.wrapped_env.observation_space.spaces
+        if obs_keys is None:
+            obs_keys = list(spaces.keys())
+        info_schema = getattr(self.wrapped_env, 'info_schema', OrderedDict())
+        if info_keys is None:
+            info_keys = list(info_schema.keys())
+        self.obs_keys = obs_keys
+        self.info_keys = info_keys
+
+        action_space = self.wrapped_env.action_space
+        schema = OrderedDict()
+        for prefix in ['observations', 'next_observations']:
+            for k in obs_keys:
+                schema['%s/%s' % (prefix, k)] = (
+                    spaces[k].shape, spaces[k].dtype
+                )
+        schema['actions'] = (action_space.shape, action_space.dtype)
+        schema['rewards'] = ((), np.float32)
+        schema['terminals'] = ((), np.bool_)
+        for k in info_keys:
+            schema['env_infos/%s' % k] = (info_schema[k], np.float64)
+        self._writer = TrajectoryWriter(
+            directory,
+            schema,
+            chunk_size=chunk_size,
+            num_write_threads=num_write_threads,
+        )
+        self._row = {}
+        self._last_obs = None
+
+    def reset(self):
+        obs = self.wrapped_env.reset()
+        self._last_obs = obs
+        return obs
+
+    def step(self, action):
+        obs, reward, done, info = self.wrapped_env.step(action)
+        row = self._row
+        for k in self.obs_keys:
+            row['observations/' + k] = self._last_obs[k]
+            row['next_observations/' + k] = obs[k]
+        row['actions'] = action
+        row['rewards'] = reward
+        row['terminals'] = done
+        for k in self.info_keys:
+            row['env_infos/' + k] = info[k]
+        self._writer.add(row)
+        self._last_obs = obs
+        return obs, reward, done, info
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+        close = getattr(self.wrapped_env, 'close', None)
+        if close is not None:
+            close()
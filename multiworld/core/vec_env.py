@@ -0,0 +1,103 @@
+import numpy as np
+
+from multiworld.core.async_env import get_executor
+
+
+class AutoResetVecEnv(object):
+    """
+    Steps N envs as a batch, with a time limit and automatic resets.
+
+    Each env's step counter is kept in `episode_steps`. An env whose step
+    returns `done` or hits `max_episode_steps` is reset right away, in the
+    same executor task as its step. Its terminal observation is kept in
+    `terminal_obs`, and the observation returned by `step` is the first
+    observation of its new episode.
+
+    ```
+    obs = vec_env.reset()
+    obs, rewards, dones, infos = vec_env.step(actions)
+    final_obs = {k: v[dones] for k, v in vec_env.terminal_obs.items()}
+    ```
+    """
+    def __init__(self, envs, max_episode_steps=None, executor=None):
+        """
+        :param envs: List of envs with identical spaces.
+        :param max_episode_steps: Defaults to the envs' `_max_episode_steps`.
+        Required for envs without it, such as the Sawyer envs.
+        :param executor: Executor for the per-env work. Defaults to the shared
+        thread pool of `async_env`. Pass False to run serially.
+        """
+        self.envs = envs
+        self.num_envs = len(envs)
+        if max_episode_steps is None:
+            max_episode_steps = getattr(envs[0], '_max_episode_steps', None)
+        if max_episode_steps is None:
+            raise ValueError(
+                "The envs have no _max_episode_steps. Pass max_episode_steps."
+            )
+        self.max_episode_steps = max_episode_steps
+        if executor is None:
+            executor = get_executor()
+        self.executor = executor
+        self.observation_space = envs[0].observation_space
+        self.action_space = envs[0].action_space
+
+        self.episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+        # True where the episode ended because of the time limit.
+        self.timeouts = np.zeros(self.num_envs, dtype=np.bool_)
+        self.terminal_obs = self._new_obs_batch()
+
+    def reset(self):
+        obs = self._new_obs_batch()
+        self._map(lambda i: self._reset_env(i, obs))
+        return obs
+
+    def step(self, actions):
+        """
+        :param actions: N x action_dim array.
+        :return: (obs, rewards, dones, infos) where `obs` maps each key to
+        an N x ... array, and `infos` is a list of N info dictionaries.
+        """
+        obs = self._new_obs_batch()
+        rewards = np.zeros(self.num_envs)
+        dones = np.zeros(self.num_envs, dtype=np.bool_)
+        infos = [None] * self.num_envs
+
+        def step_env(i):
+            next_obs, rewards[i], done, infos[i] = self.envs[i].step(
+                actions[i]
+            )
+            self.episode_steps[i] += 1
+            self.timeouts[i] = (
+                not done and self.episode_steps[i] >= self.max_episode_steps
+            )
+            dones[i] = done or self.timeouts[i]
+            if dones[i]:
+                for k, v in self.terminal_obs.items():
+                    v[i] = next_obs[k]
+                self._reset_env(i, obs)
+            else:
+                for k, v in obs.items():
+                    v[i] = next_obs[k]
+        self._map(step_env)
+        return obs, rewards, dones, infos
+
+    def _reset_env(self, i, obs):
+        next_obs = self.envs[i].reset()
+        for k, v in obs.items():
+            v[i] = next_obs[k]
+        self.episode_steps[i] = 0
+
+    def _map(self, fn):
+        if self.executor is False:
+            for i in range(self.num_envs):
+                fn(i)
+        else:
+            # list() waits for every env and re-raises their exceptions.
+            list(self.executor.map(fn, range(self.num_envs)))
+
+    def _new_obs_batch(self):
+        return {
+            k: np.zeros((self.num_envs,) + space.shape, dtype=space.dtype)
+            for k, space in self.observation_space.spaces.items()
+        }
@@ -0,0 +1,171 @@
+"""
+Record videos of an env without slowing down `step`.
+
+Frames are copied into a bounded ring of preallocated buffers and encoded on
+a background thread. If the encoder falls behind and no buffer is free, the
+frame is dropped (and counted in `num_dropped_frames`) instead of blocking.
+"""
+import os
+import threading
+from queue import Queue, Empty
+
+import numpy as np
+
+from multiworld.core.wrapper_env import ProxyEnv, get_wrapper_stack
+
+
+class VideoRecorderEnv(ProxyEnv):
+    def __init__(
+            self,
+            wrapped_env,
+            directory,
+            frame_stride=1,
+            width=None,
+            height=None,
+            camera_name=None,
+            num_frame_buffers=32,
+            fps=30,
+    ):
+        """
+        Every episode (from one `reset` to the next) is written to
+        `directory/episode_XXXXX.mp4`. Encoding uses imageio.
+
+        :param frame_stride: Record every `frame_stride`-th step.
+        :param width: Frame width. Defaults to 256 for MuJoCo envs and to the
+        render size for pygame envs.
+        :param height: Frame height. Same defaults as `width`.
+        :param camera_name: MuJoCo camera to render from.
+        :param num_frame_buffers: Number of frames that can wait to be
+        encoded before new frames get dropped.
+        """
+        self.quick_init(locals())
+        super().__init__(wrapped_env)
+        # Fail now rather than on the background thread.
+        import imageio
+        self.directory = directory
+        self.frame_stride = frame_stride
+        self.camera_name = camera_name
+        self.fps = fps
+        os.makedirs(directory, exist_ok=True)
+
+        self._base_env = get_wrapper_stack(wrapped_env)[-1]
+        if hasattr(self._base_env, 'sim'):
+            self._grab_frame = self._grab_mujoco_frame
+            native_width = native_height = 256
+        elif hasattr(self._base_env, 'drawer'):
+            self._grab_frame = self._grab_pygame_frame
+            native_width = native_height = self._base_env.render_size
+        else:
+            raise NotImplementedError(
+                "Can only record MuJoCo and pygame envs."
+            )
+        self.width = native_width if width is None else width
+        self.height = native_height if height is None else height
+        # Nearest-neighbor indices for resizing pygame frames.
+        self._rows = (
+            np.arange(self.height) * native_height // self.height
+        )
+        self._columns = (
+            np.arange(self.width) * native_width // self.width
+        )
+
+        self.num_recorded_frames = 0
+        self.num_dropped_frames = 0
+        self._frames = np.zeros(
+            (num_frame_buffers, self.height, self.width, 3), dtype=np.uint8
+        )
+        self._free_frames = Queue()
+        for i in range(num_frame_buffers):
+            self._free_frames.put(i)
+        # Frame indices to encode, plus episode numbers marking the start of
+        # a new video and None to stop.
+        self._encode_queue = Queue()
+        self._num_episodes = 0
+        self._step_count = 0
+        self._error = None
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    def step(self, action):
+        result = self.wrapped_env.step(action)
+        self._step_count += 1
+        if self._step_count % self.frame_stride == 0:
+            self._record_frame()
+        return result
+
+    def reset(self):
+        obs = self.wrapped_env.reset()
+        self._encode_queue.put(('episode', self._num_episodes))
+        self._num_episodes += 1
+        self._step_count = 0
+        self._record_frame()
+        return obs
+
+    def close(self):
+        """
+        Finish encoding the frames recorded so far and close the video file.
+        """
+        if self._thread is not None:
+            self._encode_queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+    def _record_frame(self):
+        if self._error is not None:
+            raise self._error
+        try:
+            i = self._free_frames.get_nowait()
+        except Empty:
+            self.num_dropped_frames += 1
+            return
+        self._grab_frame(self._frames[i])
+        self.num_recorded_frames += 1
+        self._encode_queue.put(('frame', i))
+
+    def _grab_mujoco_frame(self, out):
+        self._base_env.render(
+            'rgb_array',
+            width=self.width,
+            height=self.height,
+            camera_name=self.camera_name,
+            out=out,
+        )
+
+    def _grab_pygame_frame(self, out):
+        import pygame
+        self._base_env.render()
+        # pixels3d is a view of the screen in (x, y) order.
+        pixels = pygame.surfarray.pixels3d(self._base_env.drawer.screen)
+        np.copyto(out, pixels[self._columns][:, self._rows].transpose(1, 0, 2))
+        del pixels  # Unlock the surface.
+
+    def _encode_loop(self):
+        import imageio
+        writer = None
+        try:
+            while True:
+                item = self._encode_queue.get()
+                if item is None:
+                    break
+                kind, value = item
+                if kind == 'episode':
+                    if writer is not None:
+                        writer.close()
+                    writer = imageio.get_writer(
+                        os.path.join(
+                            self.directory, 'episode_%05d.mp4' % value
+                        ),
+                        fps=self.fps,
+                    )
+                else:
+                    # Frames recorded before the first reset have no video.
+                    if writer is not None:
+                        writer.append_data(self._frames[value])
+                    self._free_frames.put(value)
+        except Exception as e:
+            self._error = e
+        finally:
+            if writer is not None:
+                writer.close()
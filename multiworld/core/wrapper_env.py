@@ -1,7 +1,20 @@
+import inspect
+import weakref
+
+from multiworld.core import async_env
 from multiworld.core.serializable import Serializable
 
 
 class ProxyEnv(Serializable):
+    """
+    Forwards missing attributes to the wrapped env.
+
+    Forwarded bound methods are cached on the wrapper, so repeated calls like
+    `env.compute_rewards` do not walk the wrapper chain every time. The cache
+    is cleared whenever `_wrapped_env` is reassigned, here or in any wrapper
+    further down the chain. Call `clear_attribute_cache` after monkey-patching
+    a method of a wrapped env.
+    """
     def __init__(self, wrapped_env):
         self.quick_init(locals())
         self._wrapped_env = wrapped_env
@@ -10,8 +23,86 @@ class ProxyEnv(Serializable):
     def wrapped_env(self):
         return self._wrapped_env
 
+    # Defined here so that the wrapper's own methods run, rather than
+    # forwarding to the wrapped env's.
+    async def async_step(self, action, executor=None):
+        return await async_env.async_step(self, action, executor)
+
+    async def async_reset(self, executor=None):
+        return await async_env.async_reset(self, executor)
+
+    async def async_sample_goals(self, batch_size, executor=None):
+        return await async_env.async_sample_goals(self, batch_size, executor)
+
     def __getattr__(self, attrname):
         if attrname == '_serializable_initialized':
             return None
-        return getattr(self._wrapped_env, attrname)
+        if attrname == '_wrapped_env' or attrname.startswith('__'):
+            raise AttributeError(attrname)
+        value = getattr(self._wrapped_env, attrname)
+        if inspect.ismethod(value):
+            self.__dict__[attrname] = value
+            self.__dict__.setdefault('_cached_attrnames', set()).add(attrname)
+        return value
+
+    def __setattr__(self, attrname, value):
+        super().__setattr__(attrname, value)
+        if attrname == '_wrapped_env':
+            self.clear_attribute_cache()
+            if isinstance(value, ProxyEnv):
+                value._add_parent(self)
+        else:
+            self.__dict__.get('_cached_attrnames', set()).discard(attrname)
+
+    def __setstate__(self, d):
+        super().__setstate__(d)
+        # The cache was copied from a different wrapper instance.
+        self.__dict__.pop('_parents', None)
+        self.clear_attribute_cache()
+        if isinstance(self._wrapped_env, ProxyEnv):
+            self._wrapped_env._add_parent(self)
+
+    def clear_attribute_cache(self):
+        for attrname in self.__dict__.pop('_cached_attrnames', ()):
+            self.__dict__.pop(attrname, None)
+        for parent in list(self.__dict__.get('_parents', ())):
+            parent.clear_attribute_cache()
+
+    def _add_parent(self, parent):
+        self.__dict__.setdefault('_parents', weakref.WeakSet()).add(parent)
+
+
+def get_wrapper_stack(env):
+    """
+    :return: List of envs from `env` down to the innermost wrapped env.
+    """
+    stack = [env]
+    while isinstance(env, ProxyEnv):
+        env = env.wrapped_env
+        stack.append(env)
+    return stack
+
+
+def get_attr_owner(env, attrname):
+    """
+    :return: The outermost env in the wrapper stack that defines `attrname`
+    itself, i.e. without forwarding. Calling methods on it directly skips the
+    wrappers in between.
+    """
+    for e in get_wrapper_stack(env):
+        if not isinstance(e, ProxyEnv):
+            if hasattr(e, attrname):
+                return e
+            break
+        if (attrname not in e.__dict__.get('_cached_attrnames', ())
+                and _has_own_attr(e, attrname)):
+            return e
+    raise AttributeError(attrname)
+
 
+def _has_own_attr(env, attrname):
+    try:
+        object.__getattribute__(env, attrname)
+    except AttributeError:
+        return False
+    return True
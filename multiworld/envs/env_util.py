@@ -55,6 +55,118 @@ def create_stats_ordered_dict(
     return stats
 
 
+class RunningStat(object):
+    """
+    Keeps track of the mean, standard deviation, max, and min of a stream of
+    values using O(1) memory.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.
+        self.max = -np.inf
+        self.min = np.inf
+        self._sum_squared_diffs = 0.
+
+    def update(self, value):
+        if isinstance(value, Number):
+            value = float(value)
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._sum_squared_diffs += delta * (value - self.mean)
+            self.max = max(self.max, value)
+            self.min = min(self.min, value)
+            return
+
+        values = np.asarray(value, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        batch_mean = values.mean()
+        batch_sum_squared_diffs = np.sum((values - batch_mean) ** 2)
+        total = self.count + values.size
+        delta = batch_mean - self.mean
+        self.mean += delta * values.size / total
+        self._sum_squared_diffs += (
+            batch_sum_squared_diffs
+            + delta ** 2 * self.count * values.size / total
+        )
+        self.count = total
+        self.max = max(self.max, values.max())
+        self.min = min(self.min, values.min())
+
+    @property
+    def std(self):
+        if self.count == 0:
+            return 0.
+        return np.sqrt(self._sum_squared_diffs / self.count)
+
+    def get_stats_ordered_dict(self, name, exclude_max_min=False):
+        """
+        Same output as `create_stats_ordered_dict(name, all_values)`.
+        """
+        if self.count == 0:
+            return OrderedDict()
+        stats = OrderedDict([
+            (name + ' Mean', self.mean),
+            (name + ' Std', self.std),
+        ])
+        if not exclude_max_min:
+            stats[name + ' Max'] = self.max
+            stats[name + ' Min'] = self.min
+        return stats
+
+
+class DiagnosticsAggregator(object):
+    """
+    Incrementally computes the statistics that an env's `get_diagnostics`
+    computes from a list of paths, without storing the paths.
+
+    Usage:
+    ```
+    aggregator = env.create_diagnostics_aggregator()
+    for _ in range(num_paths):
+        env.reset()
+        for _ in range(path_length):
+            _, _, _, info = env.step(action)
+            aggregator.record_step(info)
+        aggregator.end_path()
+    statistics = aggregator.get_diagnostics()
+    ```
+    """
+    def __init__(self, stat_names, prefix=''):
+        self.stat_names = list(stat_names)
+        self.prefix = prefix
+        self.reset()
+
+    def reset(self):
+        self._stats = {name: RunningStat() for name in self.stat_names}
+        self._final_stats = {name: RunningStat() for name in self.stat_names}
+        self._last_values = {}
+
+    def record_step(self, info):
+        for name in self.stat_names:
+            if name in info:
+                value = info[name]
+                self._stats[name].update(value)
+                self._last_values[name] = value
+
+    def end_path(self):
+        for name, value in self._last_values.items():
+            self._final_stats[name].update(value)
+        self._last_values = {}
+
+    def get_diagnostics(self):
+        statistics = OrderedDict()
+        for name in self.stat_names:
+            statistics.update(self._stats[name].get_stats_ordered_dict(
+                '%s%s' % (self.prefix, name),
+            ))
+            statistics.update(self._final_stats[name].get_stats_ordered_dict(
+                'Final %s%s' % (self.prefix, name),
+            ))
+        return statistics
+
+
 def get_generic_path_information(paths, stat_prefix=''):
     """
     Get an OrderedDict with a bunch of statistic names and values.
@@ -90,11 +202,17 @@ def get_path_lengths(paths):
 
 
 def get_stat_in_paths(paths, dict_name, scalar_name):
+    """
+    :param paths: List of paths. `path[dict_name]` is either a list of
+    per-step dictionaries or a dictionary of columns (e.g. from
+    `EnvInfoBuffer.pop_path()`).
+    :return: List with the values of `scalar_name` for each path.
+    """
     if len(paths) == 0:
         return np.array([[]])
 
-    if type(paths[0][dict_name]) == dict:
-        # Support rllab interface
+    if isinstance(paths[0][dict_name], dict):
+        # Columnar env_infos (also the rllab interface)
         return [path[dict_name][scalar_name] for path in paths]
 
     return [
@@ -103,5 +221,35 @@ def get_stat_in_paths(paths, dict_name, scalar_name):
     ]
 
 
+def squared_distances(x, y):
+    """
+    :param x: N x D array
+    :param y: N x D array
+    :return: Array of size N with the squared L2 distance between each row.
+    """
+    diff = x - y
+    return np.einsum('ij,ij->i', diff, diff)
+
+
+def distance_rewards(squared_distances, out=None):
+    """
+    :return: The negative distances. Written into `out` if given.
+    """
+    out = np.sqrt(squared_distances, out=out)
+    return np.negative(out, out=out)
+
+
+def success_rewards(squared_distances, threshold, out=None):
+    """
+    :return: -1 where the distance is less than `threshold` and 0 elsewhere,
+    i.e. `-(distances < threshold)`, as in the original success rewards.
+    Written into `out` if given.
+    """
+    if out is None:
+        out = np.empty(len(squared_distances))
+    np.less(squared_distances, threshold ** 2, out=out)
+    return np.negative(out, out=out)
+
+
 def get_asset_full_path(file_name):
     return os.path.join(ENV_ASSET_DIR, file_name)
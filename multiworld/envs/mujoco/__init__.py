@@ -0,0 +1,19 @@
+import os
+
+# mujoco_py picks its offscreen renderer (OSMesa or EGL) when it is first
+# imported, so this has to run before any mujoco env module imports it.
+# mujoco_py has no switch that forces EGL: it uses EGL only if it finds the
+# NVIDIA driver and MUJOCO_PY_FORCE_CPU is not set, and OSMesa otherwise. So
+# 'egl' removes the CPU override here, and mujoco_env.py raises an error if
+# mujoco_py still picked OSMesa.
+_renderer = os.environ.get('MULTIWORLD_MUJOCO_RENDERER')
+if _renderer == 'osmesa':
+    os.environ['MUJOCO_PY_FORCE_CPU'] = '1'
+elif _renderer == 'egl':
+    os.environ.pop('MUJOCO_PY_FORCE_CPU', None)
+elif _renderer is not None:
+    raise ValueError(
+        "Invalid MULTIWORLD_MUJOCO_RENDERER: {}. Use 'osmesa' or 'egl'.".format(
+            _renderer
+        )
+    )
@@ -11,6 +11,19 @@ try:
 except ImportError as e:
     raise error.DependencyNotInstalled("{}. (HINT: you need to install mujoco_py, and also perform the setup instructions here: https://github.com/openai/mujoco-py/.)".format(e))
 
+# See multiworld/envs/mujoco/__init__.py. mujoco_py names its compiled
+# extension after the builder it picked, which tells which renderer it uses.
+if (
+        os.environ.get('MULTIWORLD_MUJOCO_RENDERER') == 'egl'
+        and 'gpuextensionbuilder'
+        not in os.path.basename(mujoco_py.cymj.__file__)
+):
+    raise error.DependencyNotInstalled(
+        "MULTIWORLD_MUJOCO_RENDERER=egl, but mujoco_py was built for OSMesa "
+        "({}). mujoco_py only builds for EGL if it finds the NVIDIA "
+        "driver.".format(mujoco_py.cymj.__file__)
+    )
+
 
 class MujocoEnv(gym.Env):
     """
@@ -18,7 +31,17 @@ class MujocoEnv(gym.Env):
 
     Some differences are:
      - Do not automatically set the observation/action space.
+     - render('rgb_array') renders offscreen at a given size and camera.
+
+    Offscreen rendering uses OSMesa or EGL, depending on how mujoco_py was
+    built. Set the environment variable MULTIWORLD_MUJOCO_RENDERER to
+    'osmesa' or 'egl' (before importing multiworld.envs.mujoco) to pick one.
+    With 'egl', importing this module fails if mujoco_py could only build
+    for OSMesa.
     """
+    # GPU used by EGL offscreen rendering. -1 means the default device.
+    render_device_id = -1
+
     def __init__(self, model_path, frame_skip, automatically_set_spaces=False):
         if model_path.startswith("/"):
             fullpath = model_path
@@ -106,15 +129,41 @@ class MujocoEnv(gym.Env):
         for _ in range(n_frames):
             self.sim.step()
 
-    def render(self, mode='human'):
+    def render(
+            self,
+            mode='human',
+            width=500,
+            height=500,
+            camera_name=None,
+            out=None,
+    ):
+        """
+        :param width: Only used for 'rgb_array'.
+        :param height: Only used for 'rgb_array'.
+        :param camera_name: Only used for 'rgb_array'. Defaults to the free
+        camera of the offscreen render context.
+        :param out: Only used for 'rgb_array'. Optional height x width x 3
+        uint8 buffer that receives the frame. mujoco_py reads the pixels into
+        a new array on every render, so this cannot avoid that allocation.
+        It does avoid a second copy for callers that need a contiguous frame
+        in their own buffer.
+        :return: For 'rgb_array', `out` if given. Otherwise a flipped view of
+        the rendered array, which is not contiguous.
+        """
         if mode == 'rgb_array':
-            self._get_viewer().render()
-            # window size used for old mujoco-py:
-            width, height = 500, 500
-            width, height = 4000, 4000
-            data = self._get_viewer().read_pixels(width, height, depth=False)
+            # sim.render reuses the sim's offscreen render context, so this
+            # works without a display.
+            data = self.sim.render(
+                width=width,
+                height=height,
+                camera_name=camera_name,
+                device_id=self.render_device_id,
+            )
             # original image is upside-down, so flip it
-            return data[::-1, :, :]
+            if out is None:
+                return data[::-1]
+            np.copyto(out, data[::-1])
+            return out
         elif mode == 'human':
             self._get_viewer().render()
 
@@ -143,10 +192,61 @@ class MujocoEnv(gym.Env):
             width=width,
             height=height,
             camera_name=camera_name,
+            device_id=self.render_device_id,
         )
 
+    def get_images(
+            self,
+            width=84,
+            height=84,
+            camera_name=None,
+            depth=False,
+            segmentation=False,
+    ):
+        """
+        Render an RGB image and, optionally, depth and segmentation images.
+
+        The RGB and depth images come from the same render. mujoco_py needs
+        different scene flags to render segment ids, so segmentation takes a
+        second render.
+
+        :return: Dictionary with key 'rgb' (uint8) and, if requested,
+        'depth' (float32 z-buffer values in [0, 1]) and 'segmentation'
+        (uint8 body id + 1 of each pixel, 0 for background).
+        """
+        images = {}
+        if depth:
+            images['rgb'], images['depth'] = self.sim.render(
+                width=width,
+                height=height,
+                camera_name=camera_name,
+                depth=True,
+                device_id=self.render_device_id,
+            )
+        else:
+            images['rgb'] = self.get_image(width, height, camera_name)
+        if segmentation:
+            segments = self.sim.render(
+                width=width,
+                height=height,
+                camera_name=camera_name,
+                segmentation=True,
+                device_id=self.render_device_id,
+            )
+            object_types = segments[:, :, 0]
+            object_ids = segments[:, :, 1]
+            body_ids = np.where(
+                object_types == mujoco_py.const.OBJ_GEOM,
+                self.model.geom_bodyid[object_ids] + 1,
+                0,
+            )
+            images['segmentation'] = body_ids.astype(np.uint8)
+        return images
+
     def initialize_camera(self, init_fctn):
         sim = self.sim
-        viewer = mujoco_py.MjRenderContextOffscreen(sim, device_id=-1)
+        viewer = mujoco_py.MjRenderContextOffscreen(
+            sim, device_id=self.render_device_id,
+        )
         init_fctn(viewer.cam)
         sim.add_render_context(viewer)
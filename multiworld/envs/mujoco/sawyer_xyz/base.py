@@ -2,6 +2,7 @@ import abc
 import numpy as np
 import mujoco_py
 
+from multiworld.core.reset_prefetcher import ResetPrefetcher
 from multiworld.core.serializable import Serializable
 from multiworld.envs.mujoco.mujoco_env import MujocoEnv
 
@@ -15,6 +16,9 @@ class SawyerMocapBase(MujocoEnv, Serializable, metaclass=abc.ABCMeta):
     """
     mocap_low = np.array([-0.2, 0.5, 0.06])
     mocap_high = np.array([0.2, 0.7, 0.6])
+    # If True, `set_env_state` only computes the kinematics and camera poses
+    # instead of running a full `sim.forward`. That is enough for rendering.
+    forward_kinematics_only = False
 
     def __init__(self, model_name, frame_skip=50):
         MujocoEnv.__init__(self, model_name, frame_skip=frame_skip)
@@ -54,7 +58,59 @@ class SawyerMocapBase(MujocoEnv, Serializable, metaclass=abc.ABCMeta):
         mocap_pos, mocap_quat = mocap_state
         self.data.set_mocap_pos('mocap', mocap_pos)
         self.data.set_mocap_quat('mocap', mocap_quat)
-        self.sim.forward()
+        self._forward_state()
+
+    def get_flat_env_state(self):
+        """
+        :return: 1D array of qpos, qvel, mocap_pos and mocap_quat. Unlike
+        `get_env_state`, it has a fixed width and is cheap to copy.
+        """
+        return get_flat_sim_state(self.sim)
+
+    def set_flat_env_state(self, flat_state):
+        """
+        Entries past the layout of `get_flat_env_state` are ignored, so
+        subclasses can append their own state.
+        """
+        set_flat_sim_state(self.sim, flat_state)
+        self._forward_state()
+
+    def _forward_state(self):
+        if self.forward_kinematics_only:
+            mujoco_py.functions.mj_kinematics(self.model, self.data)
+            mujoco_py.functions.mj_camlight(self.model, self.data)
+        else:
+            self.sim.forward()
+
+
+def get_flat_sim_state(sim):
+    data = sim.data
+    return np.concatenate((
+        data.qpos,
+        data.qvel,
+        data.mocap_pos.ravel(),
+        data.mocap_quat.ravel(),
+    ))
+
+
+def set_flat_sim_state(sim, flat_state):
+    """
+    Load a state from `get_flat_sim_state` into `sim`, without calling
+    `sim.forward`.
+    """
+    model, data = sim.model, sim.data
+    i = 0
+    data.qpos[:] = flat_state[i:i + model.nq]
+    i += model.nq
+    data.qvel[:] = flat_state[i:i + model.nv]
+    i += model.nv
+    data.mocap_pos[:] = flat_state[i:i + 3 * model.nmocap].reshape(
+        model.nmocap, 3
+    )
+    i += 3 * model.nmocap
+    data.mocap_quat[:] = flat_state[i:i + 4 * model.nmocap].reshape(
+        model.nmocap, 4
+    )
 
 
 class SawyerXYZEnv(SawyerMocapBase, metaclass=abc.ABCMeta):
@@ -64,15 +120,62 @@ class SawyerXYZEnv(SawyerMocapBase, metaclass=abc.ABCMeta):
             hand_low=(-0.2, 0.55, 0.05),
             hand_high=(0.2, 0.75, 0.3),
             action_scale=1./100,
+            dtype=np.float64,
+            prefetch_resets=False,
             **kwargs
     ):
+        """
+        :param dtype: dtype of the observations, goals, and their spaces.
+        :param prefetch_resets: If True, a second copy of the env prepares
+        the next episode's start state and goal in a worker process while
+        the current episode runs, and `reset` only has to load that state.
+        The copy is seeded from `self.np_random`, so `seed` still determines
+        the start states. Call `close` to stop the worker.
+        """
         super().__init__(*args, **kwargs)
+        self.dtype = dtype
+        self.prefetch_resets = prefetch_resets
+        self._reset_prefetcher = None
         self.action_scale = action_scale
         self.hand_low = np.array(hand_low)
         self.hand_high = np.array(hand_high)
         self.mocap_low = np.hstack(hand_low)
         self.mocap_high = np.hstack(hand_high)
 
+    def reset(self):
+        if not self.prefetch_resets:
+            return super().reset()
+        if self._reset_prefetcher is None:
+            env_state = self.__getstate__()
+            env_state["__kwargs"] = dict(
+                env_state["__kwargs"], prefetch_resets=False
+            )
+            self._reset_prefetcher = ResetPrefetcher(
+                type(self),
+                env_state,
+                seed=self.np_random.randint(2 ** 31),
+            )
+        self.set_flat_env_state(self._reset_prefetcher.get())
+        if self.viewer is not None:
+            self.viewer_setup()
+        return self._get_obs()
+
+    def seed(self, seed=None):
+        seeds = super().seed(seed)
+        # Restart the prefetcher so that its copy is seeded from the new seed.
+        self._close_reset_prefetcher()
+        return seeds
+
+    def close(self):
+        self._close_reset_prefetcher()
+        super().close()
+
+    def _close_reset_prefetcher(self):
+        # `seed` is called by MujocoEnv.__init__, before this is set.
+        if getattr(self, '_reset_prefetcher', None) is not None:
+            self._reset_prefetcher.close()
+            self._reset_prefetcher = None
+
     def set_xyz_action(self, action):
         action = np.clip(action, -1, 1)
         pos_delta = action * self.action_scale
@@ -0,0 +1,232 @@
+"""
+Batched Sawyer envs that step N sims in parallel native threads.
+
+A batch env holds N `MjSim`s in a `mujoco_py.MjSimPool`. Each `step` writes
+the N mocap targets and controls, advances every sim by `frame_skip` steps
+with a single `pool.step()` call (which releases the GIL), and gathers the
+observations through precomputed body indices.
+
+The batch env is built from a regular env, the template, which provides the
+model, spaces, goal sampling, resets and rewards:
+
+```
+env = SawyerPushAndReachBatchEnv(SawyerPushAndReachXYEnv(), num_envs=64)
+obs = env.reset()
+obs, rewards, dones, infos = env.step(actions)  # actions: 64 x action_dim
+```
+Goal markers are not updated, so the sims are not meant for rendering.
+"""
+import abc
+from collections import OrderedDict
+
+import mujoco_py
+import numpy as np
+
+from multiworld.envs.mujoco.sawyer_xyz.base import get_flat_sim_state, \
+    set_flat_sim_state
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv, SawyerPickAndPlaceEnvYZ
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYZEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYZEnv
+
+
+class SawyerBatchEnv(object, metaclass=abc.ABCMeta):
+    def __init__(self, env, num_envs):
+        """
+        :param env: Template env. It is reset to produce each start state.
+        XY envs (with a `hand_z_position`) keep the hand at that height, like
+        their `step`.
+        :param num_envs: Number of sims in the pool.
+        """
+        self.env = env
+        self.num_envs = num_envs
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+        self.hand_z_position = getattr(env, 'hand_z_position', None)
+
+        self.sims = [mujoco_py.MjSim(env.model) for _ in range(num_envs)]
+        self.pool = mujoco_py.MjSimPool(self.sims, nsubsteps=env.frame_skip)
+
+        body_names = self._get_body_names()
+        self._body_ids = np.array(
+            [env.model.body_name2id(name) for name in body_names]
+        )
+        self._body_positions = np.zeros((num_envs, len(body_names), 3))
+        self._mocap_pos = np.zeros((num_envs, 3))
+        goal_dim = self.observation_space.spaces['state_desired_goal'].low.size
+        self._goals = np.zeros((num_envs, goal_dim), dtype=env.dtype)
+
+    def reset(self, indices=None):
+        """
+        :param indices: Envs to reset. Defaults to all of them.
+        :return: Observations of all the envs.
+        """
+        if indices is None:
+            indices = range(self.num_envs)
+        for i in indices:
+            self.env.reset()
+            sim = self.sims[i]
+            set_flat_sim_state(sim, get_flat_sim_state(self.env.sim))
+            sim.forward()
+            self._mocap_pos[i] = sim.data.mocap_pos[0]
+            self._goals[i] = self.env._state_goal
+            self._body_positions[i] = sim.data.body_xpos[self._body_ids]
+        return self._get_obs()
+
+    def step(self, actions):
+        """
+        :param actions: N x action_dim array.
+        :return: (obs, rewards, dones, infos) where `obs` maps each key to an
+        N x ... array and `infos` maps each info name to an array of N values.
+        """
+        if self.hand_z_position is not None:
+            delta_z = self.hand_z_position - self._mocap_pos[:, 2:3]
+            actions = np.hstack((actions, delta_z))
+        pos_deltas = np.clip(actions[:, :3], -1, 1) * self.env.action_scale
+        self._mocap_pos = np.clip(
+            self._mocap_pos + pos_deltas,
+            self.env.mocap_low,
+            self.env.mocap_high,
+        )
+        controls = self._get_controls(actions)
+        for sim, mocap_pos, ctrl in zip(self.sims, self._mocap_pos, controls):
+            sim.data.mocap_pos[0] = mocap_pos
+            sim.data.mocap_quat[0] = (1, 0, 1, 0)
+            sim.data.ctrl[:] = ctrl
+        self.pool.step()
+        for i, sim in enumerate(self.sims):
+            self._body_positions[i] = sim.data.body_xpos[self._body_ids]
+
+        obs = self._get_obs()
+        rewards = self.env.compute_rewards(actions, obs)
+        dones = np.zeros(self.num_envs, dtype=np.bool_)
+        return obs, rewards, dones, self._get_infos()
+
+    def _get_obs(self):
+        # astype copies, so the next step does not overwrite these arrays.
+        flat_obs = self._get_flat_obs().astype(self.env.dtype)
+        goals = self._goals.copy()
+        return dict(
+            observation=flat_obs,
+            desired_goal=goals,
+            achieved_goal=flat_obs,
+            state_observation=flat_obs,
+            state_desired_goal=goals,
+            state_achieved_goal=flat_obs,
+        )
+
+    def _get_flat_obs(self):
+        return self._body_positions.reshape(self.num_envs, -1)
+
+    def _get_controls(self, actions):
+        # keep gripper closed
+        return np.ones((self.num_envs, self.env.model.nu))
+
+    def _get_distance_infos(self, names, distances):
+        """
+        :param names: Names of the distances, e.g. 'hand' for 'hand_distance'.
+        :param distances: One array of N distances per name.
+        """
+        threshold = self.env.indicator_threshold
+        infos = OrderedDict()
+        for name, distance in zip(names, distances):
+            infos[name + '_distance'] = distance
+        for name, distance in zip(names, distances):
+            infos[name + '_success'] = (distance < threshold).astype(float)
+        return infos
+
+    @abc.abstractmethod
+    def _get_body_names(self):
+        """
+        :return: Names of the bodies whose positions are gathered each step.
+        """
+        pass
+
+    @abc.abstractmethod
+    def _get_infos(self):
+        pass
+
+
+class SawyerReachBatchEnv(SawyerBatchEnv):
+    def __init__(self, env, num_envs):
+        assert isinstance(env, SawyerReachXYZEnv)
+        super().__init__(env, num_envs)
+
+    def _get_body_names(self):
+        return ['hand']
+
+    def _get_infos(self):
+        hand_distance = np.linalg.norm(
+            self._goals - self._body_positions[:, 0], axis=1
+        )
+        return self._get_distance_infos(['hand'], [hand_distance])
+
+
+class SawyerPushAndReachBatchEnv(SawyerBatchEnv):
+    def __init__(self, env, num_envs):
+        assert isinstance(env, SawyerPushAndReachXYZEnv)
+        super().__init__(env, num_envs)
+
+    def _get_body_names(self):
+        return ['hand', 'puck']
+
+    def _get_flat_obs(self):
+        # Hand xyz and puck xy
+        return self._body_positions.reshape(self.num_envs, -1)[:, :5]
+
+    def _get_infos(self):
+        hand_pos = self._body_positions[:, 0]
+        puck_pos = self._body_positions[:, 1]
+        hand_distance = np.linalg.norm(self._goals[:, :3] - hand_pos, axis=1)
+        puck_distance = np.linalg.norm(
+            self._goals[:, 3:] - puck_pos[:, :2], axis=1
+        )
+        touch_distance = np.linalg.norm(hand_pos - puck_pos, axis=1)
+        return self._get_distance_infos(
+            ['hand', 'puck', 'hand_and_puck', 'touch'],
+            [
+                hand_distance,
+                puck_distance,
+                hand_distance + puck_distance,
+                touch_distance,
+            ],
+        )
+
+
+class SawyerPickAndPlaceBatchEnv(SawyerBatchEnv):
+    def __init__(self, env, num_envs):
+        # The YZ env's step derives its x action from the hand position.
+        assert isinstance(env, SawyerPickAndPlaceEnv)
+        assert not isinstance(env, SawyerPickAndPlaceEnvYZ)
+        super().__init__(env, num_envs)
+
+    def _get_body_names(self):
+        return ['hand'] + [
+            'obj' + str(i) for i in range(self.env.num_objects)
+        ]
+
+    def _get_controls(self, actions):
+        return actions[:, 3:]
+
+    def _get_infos(self):
+        hand_pos = self._body_positions[:, 0]
+        object_positions = self._body_positions[:, 1:]
+        hand_distance = np.linalg.norm(self._goals[:, :3] - hand_pos, axis=1)
+        obj_distance = np.linalg.norm(
+            self._goals[:, 3:]
+            - object_positions.reshape(self.num_envs, -1),
+            axis=1,
+        )
+        touch_distance = np.linalg.norm(
+            hand_pos - object_positions[:, 0], axis=1
+        )
+        return self._get_distance_infos(
+            ['hand', 'obj', 'hand_and_obj', 'touch'],
+            [
+                hand_distance,
+                obj_distance,
+                hand_distance + obj_distance,
+                touch_distance,
+            ],
+        )
@@ -3,13 +3,36 @@ import numpy as np
 from gym.spaces import Box, Dict
 
 from multiworld.envs.env_util import get_stat_in_paths, \
-    create_stats_ordered_dict, get_asset_full_path
+    create_stats_ordered_dict, get_asset_full_path, DiagnosticsAggregator, \
+    squared_distances, distance_rewards, success_rewards
 from multiworld.core.multitask_env import MultitaskEnv
 from multiworld.envs.mujoco.sawyer_xyz.base import SawyerXYZEnv
 from multiworld.envs.mujoco.cameras import sawyer_pick_and_place_camera
 
 
 class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
+    info_schema = OrderedDict([
+        ('hand_distance', ()),
+        ('obj_distance', ()),
+        ('hand_and_obj_distance', ()),
+        ('touch_distance', ()),
+        ('hand_success', ()),
+        ('obj_success', ()),
+        ('hand_and_obj_success', ()),
+        ('touch_success', ()),
+    ])
+
+    diagnostic_stat_names = [
+        'hand_distance',
+        'obj_distance',
+        'hand_and_obj_distance',
+        'touch_distance',
+        'hand_success',
+        'obj_success',
+        'hand_and_obj_success',
+        'touch_success',
+    ]
+
     def __init__(
             self,
             obj_low=None,
@@ -68,6 +91,7 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
         self.hand_and_obj_space = Box(
             np.hstack((self.hand_low, np.tile(obj_low, num_objects))),
             np.hstack((self.hand_high, np.tile(obj_high, num_objects))),
+            dtype=self.dtype,
         )
         self.observation_space = Dict([
             ('observation', self.hand_and_obj_space),
@@ -108,9 +132,12 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
         return ob, reward, done, info
 
     def _get_obs(self):
-        e = self.get_endeff_pos()
-        b = np.concatenate(self.get_object_positions())
-        flat_obs = np.concatenate((e, b))
+        flat_obs = np.concatenate(
+            [self.data.get_body_xpos('hand')] + [
+                self.data.get_body_xpos('obj' + str(i))
+                for i in range(self.num_objects)
+            ]
+        ).astype(self.dtype, copy=False)
 
         return dict(
             observation=flat_obs,
@@ -121,25 +148,26 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
             state_achieved_goal=flat_obs,
         )
 
-    def _get_info(self):
+    def _get_info_values(self):
         hand_goal = self._state_goal[:3]
         obj_goal = self._state_goal[3:]
-        hand_distance = np.linalg.norm(hand_goal - self.get_endeff_pos())
-        obj_distance = np.linalg.norm(obj_goal - np.concatenate(self.get_object_positions()))
-        # touch_distance = np.linalg.norm(
-            # self.get_endeff_pos() - self.get_obj_pos()
-        # )
-        return dict(
-            hand_distance=hand_distance,
-            obj_distance=obj_distance,
-            hand_and_obj_distance=hand_distance+obj_distance,
-            # touch_distance=touch_distance,
-            hand_success=float(hand_distance < self.indicator_threshold),
-            obj_success=float(obj_distance < self.indicator_threshold),
-            hand_and_obj_success=float(
-                hand_distance+obj_distance < self.indicator_threshold
-            ),
-            # touch_success=float(touch_distance < self.indicator_threshold),
+        hand_pos = self.data.get_body_xpos('hand')
+        object_positions = [
+            self.data.get_body_xpos('obj' + str(i))
+            for i in range(self.num_objects)
+        ]
+        hand_distance = np.linalg.norm(hand_goal - hand_pos)
+        obj_distance = np.linalg.norm(obj_goal - np.concatenate(object_positions))
+        touch_distance = np.linalg.norm(hand_pos - object_positions[0])
+        return (
+            hand_distance,
+            obj_distance,
+            hand_distance+obj_distance,
+            touch_distance,
+            float(hand_distance < self.indicator_threshold),
+            float(obj_distance < self.indicator_threshold),
+            float(hand_distance+obj_distance < self.indicator_threshold),
+            float(touch_distance < self.indicator_threshold),
         )
 
     def get_obj_pos(self):
@@ -251,6 +279,7 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
                 self.hand_and_obj_space.high,
                 size=(batch_size, self.hand_and_obj_space.low.size),
             )
+        goals = goals.astype(self.dtype, copy=False)
         num_objs_in_hand = int(batch_size * p_obj_in_hand)
         if batch_size == 1:
             num_objs_in_hand = int(np.random.random() < p_obj_in_hand)
@@ -280,54 +309,111 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
             'state_desired_goal': goals,
         }
 
-    def compute_rewards(self, actions, obs):
-        achieved_goals = obs['state_achieved_goal']
-        desired_goals = obs['state_desired_goal']
-        hand_pos = achieved_goals[:, :3]
-        obj_pos = achieved_goals[:, 3:]
-        hand_goals = desired_goals[:, :3]
-        obj_goals = desired_goals[:, 3:]
-
-        hand_distances = np.linalg.norm(hand_goals - hand_pos, axis=1)
-        obj_distances = np.linalg.norm(obj_goals - obj_pos, axis=1)
-        hand_and_obj_distances = hand_distances + obj_distances
-        #touch_distances = np.linalg.norm(hand_pos - obj_pos, axis=1)
-
-        if self.reward_type == 'hand_distance':
-            r = -hand_distances
-        elif self.reward_type == 'hand_success':
-            r = -(hand_distances < self.indicator_threshold).astype(float)
-        elif self.reward_type == 'obj_distance':
-            r = -obj_distances
-        elif self.reward_type == 'obj_success':
-            r = -(obj_distances < self.indicator_threshold).astype(float)
-        elif self.reward_type == 'hand_and_obj_distance':
-            r = -hand_and_obj_distances
-        elif self.reward_type == 'hand_and_obj_success':
-            r = -(
-                hand_and_obj_distances < self.indicator_threshold
-            ).astype(float)
-        elif self.reward_type == 'touch_distance':
-            r = -touch_distances
-        elif self.reward_type == 'touch_success':
-            r = -(touch_distances < self.indicator_threshold).astype(float)
+    def compute_rewards(self, actions, obs, out=None):
+        return self._reward_kernel(
+            obs['state_achieved_goal'],
+            obs['state_desired_goal'],
+            out,
+        )
+
+    def compute_reward(self, action, obs):
+        return self._reward_kernel(
+            obs['state_achieved_goal'][None],
+            obs['state_desired_goal'][None],
+            None,
+        )[0]
+
+    @property
+    def reward_type(self):
+        return self._reward_type
+
+    @reward_type.setter
+    def reward_type(self, reward_type):
+        self._reward_kernel = self._get_reward_kernel(reward_type)
+        self._reward_type = reward_type
+
+    def _get_reward_kernel(self, reward_type):
+        """
+        Returns a function
+            (achieved_goals, desired_goals, out) --> rewards
+        that only computes the distances needed for `reward_type`.
+        """
+        def hand_squared_distances(achieved_goals, desired_goals):
+            return squared_distances(
+                achieved_goals[:, :3], desired_goals[:, :3]
+            )
+
+        def obj_squared_distances(achieved_goals, desired_goals):
+            return squared_distances(
+                achieved_goals[:, 3:], desired_goals[:, 3:]
+            )
+
+        def touch_squared_distances(achieved_goals, desired_goals):
+            # Distance between the hand and the first object
+            return squared_distances(
+                achieved_goals[:, :3], achieved_goals[:, 3:6]
+            )
+
+        def hand_and_obj_distances(achieved_goals, desired_goals):
+            distances = np.sqrt(
+                hand_squared_distances(achieved_goals, desired_goals)
+            )
+            distances += np.sqrt(
+                obj_squared_distances(achieved_goals, desired_goals)
+            )
+            return distances
+
+        def distance_kernel(squared_distance_fn):
+            def kernel(achieved_goals, desired_goals, out):
+                return distance_rewards(
+                    squared_distance_fn(achieved_goals, desired_goals),
+                    out=out,
+                )
+            return kernel
+
+        def success_kernel(squared_distance_fn):
+            def kernel(achieved_goals, desired_goals, out):
+                return success_rewards(
+                    squared_distance_fn(achieved_goals, desired_goals),
+                    self.indicator_threshold,
+                    out=out,
+                )
+            return kernel
+
+        if reward_type == 'hand_distance':
+            return distance_kernel(hand_squared_distances)
+        elif reward_type == 'hand_success':
+            return success_kernel(hand_squared_distances)
+        elif reward_type == 'obj_distance':
+            return distance_kernel(obj_squared_distances)
+        elif reward_type == 'obj_success':
+            return success_kernel(obj_squared_distances)
+        elif reward_type == 'hand_and_obj_distance':
+            def kernel(achieved_goals, desired_goals, out):
+                distances = hand_and_obj_distances(
+                    achieved_goals, desired_goals
+                )
+                return np.negative(distances, out=out)
+            return kernel
+        elif reward_type == 'hand_and_obj_success':
+            def kernel(achieved_goals, desired_goals, out):
+                distances = hand_and_obj_distances(
+                    achieved_goals, desired_goals
+                )
+                return success_rewards(
+                    distances ** 2, self.indicator_threshold, out=out
+                )
+            return kernel
+        elif reward_type == 'touch_distance':
+            return distance_kernel(touch_squared_distances)
+        elif reward_type == 'touch_success':
+            return success_kernel(touch_squared_distances)
         else:
             raise NotImplementedError("Invalid/no reward type.")
-        return r
 
     def get_diagnostics(self, paths, prefix=''):
         statistics = OrderedDict()
-        for stat_name in [
-            'hand_distance',
-            'obj_distance',
-            'hand_and_obj_distance',
-            'touch_distance',
-            'hand_success',
-            'obj_success',
-            'hand_and_obj_success',
-            'touch_success',
-        ]:
-            stat_name = stat_name
+        for stat_name in self.diagnostic_stat_names:
             stat = get_stat_in_paths(paths, 'env_infos', stat_name)
             statistics.update(create_stats_ordered_dict(
                 '%s%s' % (prefix, stat_name),
@@ -341,6 +427,9 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
             ))
         return statistics
 
+    def create_diagnostics_aggregator(self, prefix=''):
+        return DiagnosticsAggregator(self.diagnostic_stat_names, prefix=prefix)
+
     def get_env_state(self):
         base_state = super().get_env_state()
         goal = self._state_goal.copy()
@@ -352,6 +441,15 @@ class SawyerPickAndPlaceEnv(MultitaskEnv, SawyerXYZEnv):
         self._state_goal = goal
         self._set_goal_marker(goal)
 
+    def get_flat_env_state(self):
+        return np.concatenate((super().get_flat_env_state(), self._state_goal))
+
+    def set_flat_env_state(self, flat_state):
+        goal_dim = self.observation_space.spaces['state_desired_goal'].low.size
+        super().set_flat_env_state(flat_state)
+        self._state_goal = flat_state[-goal_dim:].astype(self.dtype)
+        self._set_goal_marker(self._state_goal)
+
 
 class SawyerPickAndPlaceEnvYZ(SawyerPickAndPlaceEnv):
 
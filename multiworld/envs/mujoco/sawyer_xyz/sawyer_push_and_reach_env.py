@@ -3,12 +3,35 @@ import numpy as np
 from gym.spaces import Box, Dict
 
 from multiworld.envs.env_util import get_stat_in_paths, \
-    create_stats_ordered_dict, get_asset_full_path
+    create_stats_ordered_dict, get_asset_full_path, DiagnosticsAggregator, \
+    squared_distances, distance_rewards, success_rewards
 from multiworld.core.multitask_env import MultitaskEnv
 from multiworld.envs.mujoco.sawyer_xyz.base import SawyerXYZEnv
 
 
 class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
+    info_schema = OrderedDict([
+        ('hand_distance', ()),
+        ('puck_distance', ()),
+        ('hand_and_puck_distance', ()),
+        ('touch_distance', ()),
+        ('hand_success', ()),
+        ('puck_success', ()),
+        ('hand_and_puck_success', ()),
+        ('touch_success', ()),
+    ])
+
+    diagnostic_stat_names = [
+        'hand_distance',
+        'puck_distance',
+        'hand_and_puck_distance',
+        'touch_distance',
+        'hand_success',
+        'puck_success',
+        'hand_and_puck_success',
+        'touch_success',
+    ]
+
     def __init__(
             self,
             puck_low=None,
@@ -59,6 +82,7 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
         self.hand_and_puck_space = Box(
             np.hstack((self.hand_low, puck_low)),
             np.hstack((self.hand_high, puck_high)),
+            dtype=self.dtype,
         )
         self.observation_space = Dict([
             ('observation', self.hand_and_puck_space),
@@ -97,9 +121,9 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
         return ob, reward, done, info
 
     def _get_obs(self):
-        e = self.get_endeff_pos()
-        b = self.get_puck_pos()[:2]
-        flat_obs = np.concatenate((e, b))
+        e = self.data.get_body_xpos('hand')
+        b = self.data.get_body_xpos('puck')[:2]
+        flat_obs = np.concatenate((e, b)).astype(self.dtype, copy=False)
 
         return dict(
             observation=flat_obs,
@@ -110,25 +134,23 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
             state_achieved_goal=flat_obs,
         )
 
-    def _get_info(self):
+    def _get_info_values(self):
         hand_goal = self._state_goal[:3]
         puck_goal = self._state_goal[3:]
-        hand_distance = np.linalg.norm(hand_goal - self.get_endeff_pos())
-        puck_distance = np.linalg.norm(puck_goal - self.get_puck_pos()[:2])
-        touch_distance = np.linalg.norm(
-            self.get_endeff_pos() - self.get_puck_pos()
-        )
-        return dict(
-            hand_distance=hand_distance,
-            puck_distance=puck_distance,
-            hand_and_puck_distance=hand_distance+puck_distance,
-            touch_distance=touch_distance,
-            hand_success=float(hand_distance < self.indicator_threshold),
-            puck_success=float(puck_distance < self.indicator_threshold),
-            hand_and_puck_success=float(
-                hand_distance+puck_distance < self.indicator_threshold
-            ),
-            touch_success=float(touch_distance < self.indicator_threshold),
+        hand_pos = self.data.get_body_xpos('hand')
+        puck_pos = self.data.get_body_xpos('puck')
+        hand_distance = np.linalg.norm(hand_goal - hand_pos)
+        puck_distance = np.linalg.norm(puck_goal - puck_pos[:2])
+        touch_distance = np.linalg.norm(hand_pos - puck_pos)
+        return (
+            hand_distance,
+            puck_distance,
+            hand_distance+puck_distance,
+            touch_distance,
+            float(hand_distance < self.indicator_threshold),
+            float(puck_distance < self.indicator_threshold),
+            float(hand_distance+puck_distance < self.indicator_threshold),
+            float(touch_distance < self.indicator_threshold),
         )
 
     def get_puck_pos(self):
@@ -212,61 +234,118 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
                 self.hand_and_puck_space.high,
                 size=(batch_size, self.hand_and_puck_space.low.size),
             )
+        goals = goals.astype(self.dtype, copy=False)
         return {
             'desired_goal': goals,
             'state_desired_goal': goals,
         }
 
-    def compute_rewards(self, actions, obs):
-        achieved_goals = obs['state_achieved_goal']
-        desired_goals = obs['state_desired_goal']
-        hand_pos = achieved_goals[:, :3]
-        puck_pos = achieved_goals[:, 3:]
-        hand_goals = desired_goals[:, :3]
-        puck_goals = desired_goals[:, 3:]
-
-        hand_distances = np.linalg.norm(hand_goals - hand_pos, axis=1)
-        puck_distances = np.linalg.norm(puck_goals - puck_pos, axis=1)
-        hand_and_puck_distances = hand_distances + puck_distances
-        puck_zs = self.init_puck_z * np.ones((desired_goals.shape[0], 1))
-        touch_distances = np.linalg.norm(
-            hand_pos - np.hstack((puck_pos, puck_zs)),
-            axis=1,
+    def compute_rewards(self, actions, obs, out=None):
+        return self._reward_kernel(
+            obs['state_achieved_goal'],
+            obs['state_desired_goal'],
+            out,
         )
 
-        if self.reward_type == 'hand_distance':
-            r = -hand_distances
-        elif self.reward_type == 'hand_success':
-            r = -(hand_distances < self.indicator_threshold).astype(float)
-        elif self.reward_type == 'puck_distance':
-            r = -puck_distances
-        elif self.reward_type == 'puck_success':
-            r = -(puck_distances < self.indicator_threshold).astype(float)
-        elif self.reward_type == 'hand_and_puck_distance':
-            r = -hand_and_puck_distances
-        elif self.reward_type == 'hand_and_puck_success':
-            r = -(hand_and_puck_distances < self.indicator_threshold).astype(float)
-        elif self.reward_type == 'touch_distance':
-            r = -touch_distances
-        elif self.reward_type == 'touch_success':
-            r = -(touch_distances < self.indicator_threshold).astype(float)
+    def compute_reward(self, action, obs):
+        return self._reward_kernel(
+            obs['state_achieved_goal'][None],
+            obs['state_desired_goal'][None],
+            None,
+        )[0]
+
+    @property
+    def reward_type(self):
+        return self._reward_type
+
+    @reward_type.setter
+    def reward_type(self, reward_type):
+        self._reward_kernel = self._get_reward_kernel(reward_type)
+        self._reward_type = reward_type
+
+    def _get_reward_kernel(self, reward_type):
+        """
+        Returns a function
+            (achieved_goals, desired_goals, out) --> rewards
+        that only computes the distances needed for `reward_type`.
+        """
+        def hand_squared_distances(achieved_goals, desired_goals):
+            return squared_distances(
+                achieved_goals[:, :3], desired_goals[:, :3]
+            )
+
+        def puck_squared_distances(achieved_goals, desired_goals):
+            return squared_distances(
+                achieved_goals[:, 3:], desired_goals[:, 3:]
+            )
+
+        def touch_squared_distances(achieved_goals, desired_goals):
+            hand_pos = achieved_goals[:, :3]
+            puck_pos = achieved_goals[:, 3:]
+            distances = squared_distances(hand_pos[:, :2], puck_pos)
+            distances += (hand_pos[:, 2] - self.init_puck_z) ** 2
+            return distances
+
+        def hand_and_puck_distances(achieved_goals, desired_goals):
+            distances = np.sqrt(
+                hand_squared_distances(achieved_goals, desired_goals)
+            )
+            distances += np.sqrt(
+                puck_squared_distances(achieved_goals, desired_goals)
+            )
+            return distances
+
+        def distance_kernel(squared_distance_fn):
+            def kernel(achieved_goals, desired_goals, out):
+                return distance_rewards(
+                    squared_distance_fn(achieved_goals, desired_goals),
+                    out=out,
+                )
+            return kernel
+
+        def success_kernel(squared_distance_fn):
+            def kernel(achieved_goals, desired_goals, out):
+                return success_rewards(
+                    squared_distance_fn(achieved_goals, desired_goals),
+                    self.indicator_threshold,
+                    out=out,
+                )
+            return kernel
+
+        if reward_type == 'hand_distance':
+            return distance_kernel(hand_squared_distances)
+        elif reward_type == 'hand_success':
+            return success_kernel(hand_squared_distances)
+        elif reward_type == 'puck_distance':
+            return distance_kernel(puck_squared_distances)
+        elif reward_type == 'puck_success':
+            return success_kernel(puck_squared_distances)
+        elif reward_type == 'hand_and_puck_distance':
+            def kernel(achieved_goals, desired_goals, out):
+                distances = hand_and_puck_distances(
+                    achieved_goals, desired_goals
+                )
+                return np.negative(distances, out=out)
+            return kernel
+        elif reward_type == 'hand_and_puck_success':
+            def kernel(achieved_goals, desired_goals, out):
+                distances = hand_and_puck_distances(
+                    achieved_goals, desired_goals
+                )
+                return success_rewards(
+                    distances ** 2, self.indicator_threshold, out=out
+                )
+            return kernel
+        elif reward_type == 'touch_distance':
+            return distance_kernel(touch_squared_distances)
+        elif reward_type == 'touch_success':
+            return success_kernel(touch_squared_distances)
         else:
             raise NotImplementedError("Invalid/no reward type.")
-        return r
 
     def get_diagnostics(self, paths, prefix=''):
         statistics = OrderedDict()
-        for stat_name in [
-            'hand_distance',
-            'puck_distance',
-            'hand_and_puck_distance',
-            'touch_distance',
-            'hand_success',
-            'puck_success',
-            'hand_and_puck_success',
-            'touch_success',
-        ]:
-            stat_name = stat_name
+        for stat_name in self.diagnostic_stat_names:
             stat = get_stat_in_paths(paths, 'env_infos', stat_name)
             statistics.update(create_stats_ordered_dict(
                 '%s%s' % (prefix, stat_name),
@@ -280,6 +359,9 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
                 ))
         return statistics
 
+    def create_diagnostics_aggregator(self, prefix=''):
+        return DiagnosticsAggregator(self.diagnostic_stat_names, prefix=prefix)
+
     def get_env_state(self):
         base_state = super().get_env_state()
         goal = self._state_goal.copy()
@@ -291,6 +373,15 @@ class SawyerPushAndReachXYZEnv(MultitaskEnv, SawyerXYZEnv):
         self._state_goal = goal
         self._set_goal_marker(goal)
 
+    def get_flat_env_state(self):
+        return np.concatenate((super().get_flat_env_state(), self._state_goal))
+
+    def set_flat_env_state(self, flat_state):
+        goal_dim = self.observation_space.spaces['state_desired_goal'].low.size
+        super().set_flat_env_state(flat_state)
+        self._state_goal = flat_state[-goal_dim:].astype(self.dtype)
+        self._set_goal_marker(self._state_goal)
+
 
 class SawyerPushAndReachXYEnv(SawyerPushAndReachXYZEnv):
     def __init__(self, *args, hand_z_position=0.055, **kwargs):
@@ -303,7 +394,9 @@ class SawyerPushAndReachXYEnv(SawyerPushAndReachXYZEnv):
         hand_and_puck_low[2] = hand_z_position
         hand_and_puck_high = self.hand_and_puck_space.high.copy()
         hand_and_puck_high[2] = hand_z_position
-        self.hand_and_puck_space = Box(hand_and_puck_low, hand_and_puck_high)
+        self.hand_and_puck_space = Box(
+            hand_and_puck_low, hand_and_puck_high, dtype=self.dtype,
+        )
         self.observation_space = Dict([
             ('observation', self.hand_and_puck_space),
             ('desired_goal', self.hand_and_puck_space),
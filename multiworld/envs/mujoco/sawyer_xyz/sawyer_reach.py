@@ -3,12 +3,23 @@ import numpy as np
 from gym.spaces import Box, Dict
 
 from multiworld.envs.env_util import get_stat_in_paths, \
-    create_stats_ordered_dict, get_asset_full_path
+    create_stats_ordered_dict, get_asset_full_path, DiagnosticsAggregator, \
+    squared_distances, distance_rewards, success_rewards
 from multiworld.core.multitask_env import MultitaskEnv
 from multiworld.envs.mujoco.sawyer_xyz.base import SawyerXYZEnv
 
 
 class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
+    info_schema = OrderedDict([
+        ('hand_distance', ()),
+        ('hand_success', ()),
+    ])
+
+    diagnostic_stat_names = [
+        'hand_distance',
+        'hand_success',
+    ]
+
     def __init__(
             self,
             reward_type='hand_distance',
@@ -37,14 +48,13 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
 
         self.fix_goal = fix_goal
         self.fixed_goal = np.array(fixed_goal)
-        self.goal_space = Box(goal_low, goal_high)
+        self.goal_space = Box(goal_low, goal_high, dtype=self.dtype)
         self._state_goal = None
 
         self.hide_goal_markers = hide_goal_markers
 
         self.action_space = Box(np.array([-1, -1, -1]), np.array([1, 1, 1]))
-        self.observation_space = Box(self.hand_low, self.hand_high)
-        self.hand_space = Box(self.hand_low, self.hand_high)
+        self.hand_space = Box(self.hand_low, self.hand_high, dtype=self.dtype)
         self.observation_space = Dict([
             ('observation', self.hand_space),
             ('desired_goal', self.hand_space),
@@ -67,7 +77,7 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
         return ob, reward, done, info
 
     def _get_obs(self):
-        flat_obs = self.get_endeff_pos()
+        flat_obs = self.data.get_body_xpos('hand').astype(self.dtype)
         return dict(
             observation=flat_obs,
             desired_goal=self._state_goal,
@@ -77,11 +87,13 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
             state_achieved_goal=flat_obs,
         )
 
-    def _get_info(self):
-        hand_distance = np.linalg.norm(self._state_goal - self.get_endeff_pos())
-        return dict(
-            hand_distance=hand_distance,
-            hand_success=float(hand_distance < self.indicator_threshold),
+    def _get_info_values(self):
+        hand_distance = np.linalg.norm(
+            self._state_goal - self.data.get_body_xpos('hand')
+        )
+        return (
+            hand_distance,
+            float(hand_distance < self.indicator_threshold),
         )
 
     def _set_goal_marker(self, goal):
@@ -156,32 +168,60 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
                 self.hand_space.high,
                 size=(batch_size, self.hand_space.low.size),
             )
+        goals = goals.astype(self.dtype, copy=False)
         return {
             'desired_goal': goals,
             'state_desired_goal': goals,
         }
 
-    def compute_rewards(self, actions, obs):
-        achieved_goals = obs['state_achieved_goal']
-        desired_goals = obs['state_desired_goal']
-        hand_pos = achieved_goals
-        goals = desired_goals
-        distances = np.linalg.norm(hand_pos - goals, axis=1)
-        if self.reward_type == 'hand_distance':
-            r = -distances
-        elif self.reward_type == 'hand_success':
-            r = -(distances < self.indicator_threshold).astype(float)
+    def compute_rewards(self, actions, obs, out=None):
+        return self._reward_kernel(
+            obs['state_achieved_goal'],
+            obs['state_desired_goal'],
+            out,
+        )
+
+    def compute_reward(self, action, obs):
+        return self._reward_kernel(
+            obs['state_achieved_goal'][None],
+            obs['state_desired_goal'][None],
+            None,
+        )[0]
+
+    @property
+    def reward_type(self):
+        return self._reward_type
+
+    @reward_type.setter
+    def reward_type(self, reward_type):
+        self._reward_kernel = self._get_reward_kernel(reward_type)
+        self._reward_type = reward_type
+
+    def _get_reward_kernel(self, reward_type):
+        """
+        Returns a function
+            (achieved_goals, desired_goals, out) --> rewards
+        """
+        if reward_type == 'hand_distance':
+            def kernel(achieved_goals, desired_goals, out):
+                return distance_rewards(
+                    squared_distances(achieved_goals, desired_goals),
+                    out=out,
+                )
+        elif reward_type == 'hand_success':
+            def kernel(achieved_goals, desired_goals, out):
+                return success_rewards(
+                    squared_distances(achieved_goals, desired_goals),
+                    self.indicator_threshold,
+                    out=out,
+                )
         else:
             raise NotImplementedError("Invalid/no reward type.")
-        return r
+        return kernel
 
     def get_diagnostics(self, paths, prefix=''):
         statistics = OrderedDict()
-        for stat_name in [
-            'hand_distance',
-            'hand_success',
-        ]:
-            stat_name = stat_name
+        for stat_name in self.diagnostic_stat_names:
             stat = get_stat_in_paths(paths, 'env_infos', stat_name)
             statistics.update(create_stats_ordered_dict(
                 '%s%s' % (prefix, stat_name),
@@ -195,6 +235,9 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
                 ))
         return statistics
 
+    def create_diagnostics_aggregator(self, prefix=''):
+        return DiagnosticsAggregator(self.diagnostic_stat_names, prefix=prefix)
+
     def get_env_state(self):
         base_state = super().get_env_state()
         goal = self._state_goal.copy()
@@ -206,6 +249,15 @@ class SawyerReachXYZEnv(SawyerXYZEnv, MultitaskEnv):
         self._state_goal = goal
         self._set_goal_marker(goal)
 
+    def get_flat_env_state(self):
+        return np.concatenate((super().get_flat_env_state(), self._state_goal))
+
+    def set_flat_env_state(self, flat_state):
+        goal_dim = self.observation_space.spaces['state_desired_goal'].low.size
+        super().set_flat_env_state(flat_state)
+        self._state_goal = flat_state[-goal_dim:].astype(self.dtype)
+        self._set_goal_marker(self._state_goal)
+
 
 class SawyerReachXYEnv(SawyerReachXYZEnv):
     def __init__(self, *args,
@@ -222,7 +274,8 @@ class SawyerReachXYEnv(SawyerReachXYZEnv):
         self.action_space = Box(np.array([-1, -1]), np.array([1, 1]))
         self.hand_space = Box(
             np.hstack((self.hand_space.low[:2], self.hand_z_position)),
-            np.hstack((self.hand_space.high[:2], self.hand_z_position))
+            np.hstack((self.hand_space.high[:2], self.hand_z_position)),
+            dtype=self.dtype,
         )
         self.observation_space = Dict([
             ('observation', self.hand_space),
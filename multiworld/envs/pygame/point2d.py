@@ -1,8 +1,9 @@
+from collections import OrderedDict
+
 import numpy as np
 from gym import spaces
 from pygame import Color
 
-from multiworld.core.image_env import ImageEnv
 from multiworld.core.multitask_env import MultitaskEnv
 from multiworld.core.serializable import Serializable
 from multiworld.envs.pygame.pygame_viewer import PygameViewer
@@ -13,6 +14,14 @@ class Point2DEnv(MultitaskEnv, Serializable):
     """
     A little 2D point whose life goal is to reach a target.
     """
+    info_schema = OrderedDict([
+        ('radius', ()),
+        ('target_position', (2,)),
+        ('distance_to_target', ()),
+        ('velocity', (2,)),
+        ('speed', ()),
+        ('is_success', ()),
+    ])
 
     def __init__(
             self,
@@ -26,6 +35,7 @@ class Point2DEnv(MultitaskEnv, Serializable):
             ball_radius = 0.25,
             walls = [],
             fixed_goal=None,
+            dtype=np.float64,
             **kwargs
     ):
         print("WARNING, ignoring kwargs:", kwargs)
@@ -40,6 +50,7 @@ class Point2DEnv(MultitaskEnv, Serializable):
         self.ball_radius = ball_radius
         self.walls = walls
         self.fixed_goal = fixed_goal
+        self.dtype = dtype
 
         self._max_episode_steps = 50
         self.max_target_distance = self.boundary_dist - self.target_radius
@@ -51,7 +62,7 @@ class Point2DEnv(MultitaskEnv, Serializable):
         self.action_space = spaces.Box(-u, u, dtype=np.float32)
 
         o = self.boundary_dist * np.ones(2)
-        self.obs_range = spaces.Box(-o, o, dtype='float32')
+        self.obs_range = spaces.Box(-o, o, dtype=self.dtype)
         self.observation_space = spaces.Dict([
             ('observation', self.obs_range),
             ('desired_goal', self.obs_range),
@@ -77,21 +88,23 @@ class Point2DEnv(MultitaskEnv, Serializable):
             a_max=self.boundary_dist,
         )
         distance_to_target = np.linalg.norm(self._position - self._target_position)
-        is_success = distance_to_target < self.target_radius
 
         ob = self._get_obs()
         reward = self.compute_reward(velocities, ob)
-        info = {
-            'radius': self.target_radius,
-            'target_position': self._target_position,
-            'distance_to_target': distance_to_target,
-            'velocity': velocities,
-            'speed': np.linalg.norm(velocities),
-            'is_success': is_success,
-        }
+        info = self._get_info(velocities, distance_to_target)
         done = False
         return ob, reward, done, info
 
+    def _get_info_values(self, velocities, distance_to_target):
+        return (
+            self.target_radius,
+            self._target_position,
+            distance_to_target,
+            velocities,
+            np.linalg.norm(velocities),
+            distance_to_target < self.target_radius,
+        )
+
     def _sample_goal(self):
         return np.random.uniform(
             size=2, low=-self.max_target_distance, high=self.max_target_distance
@@ -111,13 +124,16 @@ class Point2DEnv(MultitaskEnv, Serializable):
         pass
 
     def _get_obs(self):
+        # Alias keys share the same copy.
+        position = self._position.astype(self.dtype)
+        target_position = self._target_position.astype(self.dtype)
         return dict(
-            observation=self._position.copy(),
-            desired_goal=self._target_position.copy(),
-            achieved_goal=self._position.copy(),
-            state_observation=self._position.copy(),
-            state_desired_goal=self._target_position.copy(),
-            state_achieved_goal=self._position.copy(),
+            observation=position,
+            desired_goal=target_position,
+            achieved_goal=position,
+            state_observation=position,
+            state_desired_goal=target_position,
+            state_achieved_goal=position,
         )
 
     def compute_rewards(self, actions, obs):
@@ -129,10 +145,14 @@ class Point2DEnv(MultitaskEnv, Serializable):
         if self.reward_type == "dense":
             return -d
 
+    def compute_reward(self, action, obs):
+        # compute_rewards also works on a single, unbatched observation.
+        return self.compute_rewards(action, obs)
+
     def get_goal(self):
         return {
-            'desired_goal': self._target_position.copy(),
-            'state_desired_goal': self._target_position.copy(),
+            'desired_goal': self._target_position.astype(self.dtype),
+            'state_desired_goal': self._target_position.astype(self.dtype),
         }
 
     def sample_goals(self, batch_size):
@@ -148,6 +168,7 @@ class Point2DEnv(MultitaskEnv, Serializable):
                 self.obs_range.high,
                 size=(batch_size, self.obs_range.low.size),
             )
+        goals = goals.astype(self.dtype, copy=False)
         return {
             'desired_goal': goals,
             'state_desired_goal': goals,
@@ -159,8 +180,22 @@ class Point2DEnv(MultitaskEnv, Serializable):
 
     """Functions for ImageEnv wrapper"""
 
-    def get_image(self):
-        """Returns a black and white image"""
+    def get_image(self, width=None, height=None):
+        """
+        Returns a black and white image
+
+        :param width: Must be `render_size` if given. The image is always
+        rendered at `render_size`.
+        :param height: Same as `width`.
+        """
+        for size in (width, height):
+            if size is not None and size != self.render_size:
+                raise ValueError(
+                    "Point2DEnv renders {0}x{0} images. Set render_size to "
+                    "get {1}x{2} images.".format(
+                        self.render_size, width, height,
+                    )
+                )
         self.render()
         img = self.drawer.get_image()
         # img = img / 255.0
@@ -183,6 +218,13 @@ class Point2DEnv(MultitaskEnv, Serializable):
         self._position = position
         self._target_position = goal
 
+    def get_flat_env_state(self):
+        return np.concatenate((self._position, self._target_position))
+
+    def set_flat_env_state(self, flat_state):
+        self._position = flat_state[:2].copy()
+        self._target_position = flat_state[2:4].copy()
+
     def render(self, close=False):
         if close:
             self.drawer = None
@@ -195,6 +237,7 @@ class Point2DEnv(MultitaskEnv, Serializable):
                 x_bounds=(-self.boundary_dist, self.boundary_dist),
                 y_bounds=(-self.boundary_dist, self.boundary_dist),
                 render_onscreen=self.render_onscreen,
+                display_fps=self._get_display_fps(),
             )
 
         self.drawer.fill(Color('white'))
@@ -219,29 +262,65 @@ class Point2DEnv(MultitaskEnv, Serializable):
         self.drawer.render()
         self.drawer.tick(self.render_dt_msec)
 
-    """Static visualization/utility methods"""
-
-    @staticmethod
-    def true_model(state, action):
-        velocities = np.clip(action, a_min=-1, a_max=1)
-        position = state
-        new_position = position + velocities
-        return np.clip(
-            new_position,
-            a_min=-Point2DEnv.boundary_dist,
-            a_max=Point2DEnv.boundary_dist,
-        )
-
+    def _get_display_fps(self):
+        # The window is updated by the viewer's display thread, which is
+        # where `render_dt_msec` limits the frame rate.
+        if self.render_dt_msec > 0:
+            return 1000. / self.render_dt_msec
+        return 30
+
+    """Dynamics model utility methods"""
+
+    def true_model(self, state, action):
+        return self.true_states(state, action[None])[-1]
+
+    def true_states(self, state, actions):
+        """
+        :param state: Start position
+        :param actions: H x 2 array of actions
+        :return: (H+1) x 2 array of positions, starting with `state`
+        """
+        return self.true_states_batch(state[None], actions[None])[0]
+
+    def true_states_batch(self, states, actions, goals=None):
+        """
+        Roll out the true dynamics (including walls) for a batch of action
+        sequences at once. Useful for sampling-based planners.
+
+        :param states: K x 2 array of start positions
+        :param actions: K x H x 2 array of actions
+        :param goals: Optional K x 2 array (or a single 2D goal). If given,
+        the rewards along each trajectory are also computed and summed.
+        :return: K x (H+1) x 2 array of positions. If `goals` is given, a
+        tuple of the positions and a length-K array of summed rewards.
+        """
+        velocities = np.clip(actions, a_min=-1, a_max=1)
+        num_sequences, horizon = velocities.shape[:2]
+        positions = np.empty((num_sequences, horizon + 1, 2))
+        positions[:, 0] = states
+        for t in range(horizon):
+            new_positions = positions[:, t] + velocities[:, t]
+            for wall in self.walls:
+                new_positions = wall.handle_collision_batch(
+                    positions[:, t], new_positions
+                )
+            np.clip(
+                new_positions,
+                a_min=-self.boundary_dist,
+                a_max=self.boundary_dist,
+                out=positions[:, t + 1],
+            )
+        if goals is None:
+            return positions
 
-    @staticmethod
-    def true_states(state, actions):
-        real_states = [state]
-        for action in actions:
-            next_state = Point2DEnv.true_model(state, action)
-            real_states.append(next_state)
-            state = next_state
-        return real_states
+        goals = np.broadcast_to(goals, (num_sequences, 2))
+        rewards = self.compute_rewards(velocities, {
+            'state_achieved_goal': positions[:, 1:],
+            'state_desired_goal': goals[:, None],
+        })
+        return positions, rewards.sum(axis=1)
 
+    """Static visualization methods"""
 
     @staticmethod
     def plot_trajectory(ax, states, actions, goal=None):
@@ -370,6 +449,7 @@ class Point2DWallEnv(Point2DEnv):
 if __name__ == "__main__":
     # e = Point2DEnv()
     import matplotlib.pyplot as plt
+    from multiworld.core.image_env import ImageEnv
     # e = Point2DWallEnv("-", render_size=84)
     e = ImageEnv(Point2DWallEnv(wall_shape="u", render_size=84))
     for i in range(10):
@@ -1,7 +1,9 @@
 from enum import Enum
 
 import pygame
-from collections import Iterable
+from collections.abc import Iterable
+
+from multiworld.core.display import LatestFrameDisplay
 
 
 class PygameViewer(object):
@@ -12,6 +14,7 @@ class PygameViewer(object):
             x_bounds=(0, 640),
             y_bounds=(0, 480),
             render_onscreen=True,
+            display_fps=30,
     ):
         """
         All xy-coordinates are scaled linear to map from
@@ -25,6 +28,9 @@ class PygameViewer(object):
         :param screen_height:
         :param x_bounds:
         :param y_bounds:
+        :param display_fps: Maximum rate at which the window is updated if
+        `render_onscreen` is True. Drawing always happens on an offscreen
+        surface, and a separate thread shows the latest rendered frame.
         """
         self.width = screen_width
         self.height = screen_width
@@ -32,25 +38,37 @@ class PygameViewer(object):
         self.y_scaler = LinearMapper(y_bounds, (0, screen_height - 1))
         self.terminated = False
         self.clock = pygame.time.Clock()
-        self.render_onscreen = render_onscreen
-        if self.render_onscreen:
-            self.screen = pygame.display.set_mode((screen_width, screen_height))
-        else:
-            self.screen = pygame.Surface((screen_width, screen_height))
+        self.display_fps = display_fps
+        self._display = None
+        self.reinit_screen(render_onscreen)
 
     def render(self):
         if self.render_onscreen:
-            pygame.display.update()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    self.terminated = True
+            self._display.publish(self.screen.copy())
+            if not self._display.running:
+                self.terminated = True
+
+    def _open_window(self):
+        self._window = pygame.display.set_mode((self.width, self.height))
+
+    def _show_frame(self, surface):
+        self._window.blit(surface, (0, 0))
+        pygame.display.update()
+
+    def _poll_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        return True
 
     def fill(self, color):
         self.screen.fill(color)
 
     def tick(self, dt):
-        self.clock.tick(dt)
+        # The display thread already limits the window to `display_fps`, so
+        # the caller's thread is not slowed down.
+        if self._display is None:
+            self.clock.tick(dt)
 
     def draw_segment(self, p1, p2, color):
         p1 = self.convert_xy(p1)
@@ -91,10 +109,18 @@ class PygameViewer(object):
 
     def reinit_screen(self, render_onscreen):
         self.render_onscreen = render_onscreen
+        self.screen = pygame.Surface((self.width, self.height))
+        if self._display is not None:
+            self._display.stop()
+            self._display = None
         if self.render_onscreen:
-            self.screen = pygame.display.set_mode((self.width, self.height))
-        else:
-            self.screen = pygame.Surface((self.width, self.height))
+            self._display = LatestFrameDisplay(
+                self._show_frame,
+                fps=self.display_fps,
+                open_window=self._open_window,
+                poll=self._poll_events,
+                close_window=pygame.display.quit,
+            )
 
 
 class LinearMapper(object):
@@ -14,6 +14,8 @@ if v_wall.collides_with(init_xy, new_xy):
 """
 import abc
 
+import numpy as np
+
 
 class Wall(object, metaclass=abc.ABCMeta):
     def __init__(self, min_x, max_x, min_y, max_y, min_dist):
@@ -74,6 +76,43 @@ class Wall(object, metaclass=abc.ABCMeta):
             end_point[0] = self.min_x
         return end_point
 
+    def handle_collision_batch(self, start_points, end_points):
+        """
+        Vectorized version of `handle_collision`.
+
+        :param start_points: N x 2 array
+        :param end_points: N x 2 array
+        :return: N x 2 array of corrected end points. The inputs are not
+        modified.
+        """
+        trajectory_segments = np.hstack((start_points, end_points))
+        end_points = end_points.copy()
+        hit = (
+            self.top_segment.intersects_with_batch(trajectory_segments)
+            & (end_points[:, 1] <= start_points[:, 1])
+            & (start_points[:, 1] >= self.max_y)
+        )
+        end_points[hit, 1] = self.max_y
+        hit = (
+            self.bottom_segment.intersects_with_batch(trajectory_segments)
+            & (end_points[:, 1] >= start_points[:, 1])
+            & (start_points[:, 1] <= self.min_y)
+        )
+        end_points[hit, 1] = self.min_y
+        hit = (
+            self.right_segment.intersects_with_batch(trajectory_segments)
+            & (end_points[:, 1] <= start_points[:, 0])
+            & (start_points[:, 0] >= self.max_x)
+        )
+        end_points[hit, 0] = self.max_x
+        hit = (
+            self.left_segment.intersects_with_batch(trajectory_segments)
+            & (end_points[:, 1] >= start_points[:, 0])
+            & (start_points[:, 0] <= self.min_x)
+        )
+        end_points[hit, 0] = self.min_x
+        return end_points
+
 
 class Segment(object):
     def __init__(self, x0, y0, x1, y1):
@@ -93,6 +132,25 @@ class Segment(object):
 
         return True
 
+    def intersects_with_batch(self, segments):
+        """
+        :param segments: N x 4 array where each row is (x0, y0, x1, y1)
+        :return: Boolean array of size N
+        """
+        left = np.maximum(
+            min(self.x0, self.x1), np.minimum(segments[:, 0], segments[:, 2])
+        )
+        right = np.minimum(
+            max(self.x0, self.x1), np.maximum(segments[:, 0], segments[:, 2])
+        )
+        top = np.maximum(
+            min(self.y0, self.y1), np.minimum(segments[:, 1], segments[:, 3])
+        )
+        bottom = np.minimum(
+            max(self.y0, self.y1), np.maximum(segments[:, 1], segments[:, 3])
+        )
+        return (top <= bottom) & (left <= right)
+
 
 class VerticalWall(Wall):
     def __init__(self, min_dist, x_pos, bottom_y, top_y):
@@ -0,0 +1,110 @@
+"""
+Lazy env registry.
+
+Envs are registered by id with a `'module:Class'` entry point string, so
+registering them imports nothing. An env's module (and with it mujoco_py,
+pygame, etc.) is only imported when the env is first made:
+```
+from multiworld.envs.registration import make
+env = make('SawyerPushAndReachXY-v0', reward_type='puck_distance')
+```
+"""
+import importlib
+
+
+class EnvSpec(object):
+    def __init__(self, id, entry_point, kwargs=None):
+        """
+        :param id: gym-style id, e.g. 'Point2D-v0'
+        :param entry_point: 'module.path:ClassName'
+        :param kwargs: Default keyword arguments for the constructor.
+        """
+        self.id = id
+        self.entry_point = entry_point
+        self.kwargs = {} if kwargs is None else dict(kwargs)
+        self._env_class = None
+
+    def load(self):
+        if self._env_class is None:
+            module_name, class_name = self.entry_point.split(':')
+            module = importlib.import_module(module_name)
+            self._env_class = getattr(module, class_name)
+        return self._env_class
+
+    def make(self, **kwargs):
+        return self.load()(**dict(self.kwargs, **kwargs))
+
+
+_env_specs = {}
+
+
+def register(id, entry_point, **kwargs):
+    if id in _env_specs:
+        raise ValueError("Env {} is already registered.".format(id))
+    _env_specs[id] = EnvSpec(id, entry_point, kwargs)
+
+
+def spec(id):
+    try:
+        return _env_specs[id]
+    except KeyError:
+        raise KeyError("No registered env with id: {}".format(id))
+
+
+def make(id, **kwargs):
+    """
+    :param kwargs: Overrides the keyword arguments given at registration.
+    """
+    return spec(id).make(**kwargs)
+
+
+def registered_env_ids():
+    return list(_env_specs.keys())
+
+
+"""
+Point2D
+"""
+register(
+    'Point2D-v0',
+    'multiworld.envs.pygame.point2d:Point2DEnv',
+    render_onscreen=False,
+)
+register(
+    'Point2DWall-U-v0',
+    'multiworld.envs.pygame.point2d:Point2DWallEnv',
+    wall_shape='u',
+    render_onscreen=False,
+)
+
+"""
+Sawyer
+"""
+register(
+    'SawyerReachXYZ-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_reach:SawyerReachXYZEnv',
+)
+register(
+    'SawyerReachXY-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_reach:SawyerReachXYEnv',
+)
+register(
+    'SawyerPushAndReachXYZ-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env:'
+    'SawyerPushAndReachXYZEnv',
+)
+register(
+    'SawyerPushAndReachXY-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env:'
+    'SawyerPushAndReachXYEnv',
+)
+register(
+    'SawyerPickAndPlace-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place:'
+    'SawyerPickAndPlaceEnv',
+)
+register(
+    'SawyerPickAndPlaceYZ-v0',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place:'
+    'SawyerPickAndPlaceEnvYZ',
+)
@@ -0,0 +1,50 @@
+"""
+Benchmark the per-step cost of `compute_reward` against the old approach of
+batching every observation key and calling `compute_rewards`.
+"""
+import time
+
+import numpy as np
+
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYZEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_CALLS = 100000
+
+
+def compute_reward_by_batching(env, action, obs):
+    actions = action[None]
+    next_obs = {
+        k: v[None] for k, v in obs.items()
+    }
+    return env.compute_rewards(actions, next_obs)[0]
+
+
+def time_calls(fn, env, action, obs):
+    start = time.time()
+    for _ in range(NUM_CALLS):
+        fn(env, action, obs)
+    return (time.time() - start) / NUM_CALLS
+
+
+def main():
+    for env in [
+        Point2DEnv(render_onscreen=False),
+        SawyerPushAndReachXYZEnv(),
+    ]:
+        obs = env.reset()
+        action = env.action_space.sample()
+        assert (
+            compute_reward_by_batching(env, action, obs)
+            == env.compute_reward(action, obs)
+        )
+        batched_time = time_calls(compute_reward_by_batching, env, action, obs)
+        single_time = time_calls(type(env).compute_reward, env, action, obs)
+        print("{}: {:.2f} us -> {:.2f} us per call".format(
+            type(env).__name__, 1e6 * batched_time, 1e6 * single_time,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark batched stepping through an EnvServer on a Unix socket against
+stepping the same envs in-process.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from multiworld.core.env_server import EnvClient, EnvServer
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_ENVS = 16
+NUM_STEPS = 2000
+
+
+def make_envs():
+    return [Point2DEnv(render_onscreen=False) for _ in range(NUM_ENVS)]
+
+
+def serve(address):
+    EnvServer(make_envs(), address).serve_forever()
+
+
+def main():
+    actions = np.random.uniform(-1, 1, (NUM_ENVS, 2))
+
+    envs = make_envs()
+    for env in envs:
+        env.reset()
+    start = time.time()
+    for _ in range(NUM_STEPS):
+        for env, action in zip(envs, actions):
+            env.step(action)
+    local_time = (time.time() - start) / NUM_STEPS
+
+    address = os.path.join(tempfile.mkdtemp(), 'env_server.sock')
+    server = multiprocessing.Process(target=serve, args=(address,), daemon=True)
+    server.start()
+    while not os.path.exists(address):
+        time.sleep(0.01)
+    client = EnvClient(address)
+    client.reset()
+    start = time.time()
+    for _ in range(NUM_STEPS):
+        client.step(actions)
+    remote_time = (time.time() - start) / NUM_STEPS
+    client.close()
+    server.terminate()
+
+    print("{} envs: {:.0f} us per batched step in-process, {:.0f} us "
+          "remote ({:.0f} env steps/sec remote)".format(
+              NUM_ENVS, 1e6 * local_time, 1e6 * remote_time,
+              NUM_ENVS / remote_time,
+          ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark how long it takes to get a ready-to-step Sawyer env: cold
+construction plus reset versus forking a worker from a ForkServerEnvFactory.
+"""
+import time
+
+import numpy as np
+
+from multiworld.core.fork_server import ForkServerEnvFactory
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+
+NUM_ENVS = 20
+
+
+def main():
+    start = time.time()
+    for _ in range(NUM_ENVS):
+        env = SawyerPushAndReachXYEnv()
+        env.reset()
+        env.step(np.zeros(2))
+    cold_time = (time.time() - start) / NUM_ENVS
+
+    factory = ForkServerEnvFactory.from_env(env)
+    workers = []
+    start = time.time()
+    for _ in range(NUM_ENVS):
+        worker = factory.spawn()
+        worker.step(np.zeros(2))
+        workers.append(worker)
+    fork_time = (time.time() - start) / NUM_ENVS
+    for worker in workers:
+        worker.close()
+    factory.close()
+
+    print("Time to a ready env: {:.1f} ms (cold) -> {:.1f} ms (fork)".format(
+        1e3 * cold_time, 1e3 * fork_time,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark how long it takes a fresh interpreter to import multiworld modules.
+Each module is imported in its own subprocess, and `numpy` and `gym` are
+imported first so that only multiworld's share is measured.
+"""
+import subprocess
+import sys
+
+NUM_TRIALS = 5
+MODULES = [
+    'multiworld.envs.registration',
+    'multiworld.core.flat_goal_env',
+    'multiworld.core.image_env',
+    'multiworld.envs.pygame.point2d',
+    'multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env',
+]
+TIMING_CODE = """
+import time
+import numpy
+import gym
+start = time.time()
+import {}
+print(time.time() - start)
+"""
+
+
+def time_import(module):
+    times = []
+    for _ in range(NUM_TRIALS):
+        output = subprocess.check_output(
+            [sys.executable, '-c', TIMING_CODE.format(module)],
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(float(output.decode().split()[-1]))
+    return min(times)
+
+
+def main():
+    for module in MODULES:
+        print("{}: {:.0f} ms".format(module, 1e3 * time_import(module)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark how long it takes to get a ready-to-step copy of an env through a
+pickle round trip: the default mode (unpickle, then reset) versus snapshot
+pickling (unpickle and restore the pickled sim state).
+
+Both modes run the env's constructor when unpickling, since MuJoCo models
+and sims cannot be pickled. Snapshot pickling only saves the reset.
+"""
+import pickle
+import time
+
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_ROUND_TRIPS = 20
+
+
+def time_round_trips(env, reset):
+    start = time.time()
+    for _ in range(NUM_ROUND_TRIPS):
+        copy = pickle.loads(pickle.dumps(env))
+        if reset:
+            copy.reset()
+    return (time.time() - start) / NUM_ROUND_TRIPS
+
+
+def main():
+    print("Both modes replay the constructor; snapshots only skip the reset.")
+    for env in [
+        Point2DEnv(render_onscreen=False),
+        SawyerReachXYEnv(),
+        SawyerPushAndReachXYEnv(),
+        SawyerPickAndPlaceEnv(),
+    ]:
+        env.reset()
+        default_time = time_round_trips(env, reset=True)
+        env.set_snapshot_pickling()
+        snapshot_time = time_round_trips(env, reset=False)
+        print("{}: {:.2f} ms -> {:.2f} ms per round trip ({} bytes)".format(
+            type(env).__name__,
+            1e3 * default_time,
+            1e3 * snapshot_time,
+            len(pickle.dumps(env)),
+        ))
+
+
+if __name__ == "__main__":
+    main()
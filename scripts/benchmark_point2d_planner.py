@@ -0,0 +1,56 @@
+"""
+Benchmark how many action sequences per second a sampling-based planner (e.g.
+CEM or MPPI) can evaluate with the Point2D dynamics model.
+
+Compares rolling out each sequence with `env.step` against evaluating all of
+them at once with `Point2DEnv.true_states_batch`.
+"""
+import time
+
+import numpy as np
+
+from multiworld.envs.pygame.point2d import Point2DWallEnv
+
+NUM_SEQUENCES = 1000
+HORIZON = 15
+NUM_TRIALS = 10
+
+
+def rollout_with_step(env, starts, actions, goal):
+    returns = np.zeros(len(starts))
+    for k in range(len(starts)):
+        env._position = starts[k].copy()
+        env._target_position = goal.copy()
+        for t in range(actions.shape[1]):
+            _, reward, _, _ = env.step(actions[k, t])
+            returns[k] += reward
+    return returns
+
+
+def main():
+    env = Point2DWallEnv(wall_shape="u", render_onscreen=False)
+    env.reset()
+    starts = np.random.uniform(-4, 4, size=(NUM_SEQUENCES, 2))
+    actions = np.random.uniform(-1, 1, size=(NUM_SEQUENCES, HORIZON, 2))
+    goal = env.sample_goal()['state_desired_goal']
+
+    start = time.time()
+    rollout_with_step(env, starts, actions, goal)
+    serial_time = time.time() - start
+
+    start = time.time()
+    for _ in range(NUM_TRIALS):
+        env.true_states_batch(starts, actions, goal)
+    batch_time = (time.time() - start) / NUM_TRIALS
+
+    print("Sequences: {}, horizon: {}".format(NUM_SEQUENCES, HORIZON))
+    print("env.step loop:     {:10.0f} sequences/sec".format(
+        NUM_SEQUENCES / serial_time
+    ))
+    print("true_states_batch: {:10.0f} sequences/sec".format(
+        NUM_SEQUENCES / batch_time
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark forwarded method lookups through stacks of 1, 3, and 6 ProxyEnvs,
+with and without the attribute cache.
+"""
+import time
+
+from multiworld.core.wrapper_env import ProxyEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_LOOKUPS = 1000000
+
+
+class UncachedProxyEnv(ProxyEnv):
+    def __getattr__(self, attrname):
+        if attrname == '_serializable_initialized':
+            return None
+        if attrname == '_wrapped_env' or attrname.startswith('__'):
+            raise AttributeError(attrname)
+        return getattr(self._wrapped_env, attrname)
+
+
+def wrap(env, wrapper_cls, num_layers):
+    for _ in range(num_layers):
+        env = wrapper_cls(env)
+    return env
+
+
+def time_lookups(env):
+    start = time.time()
+    for _ in range(NUM_LOOKUPS):
+        env.compute_rewards
+    return (time.time() - start) / NUM_LOOKUPS
+
+
+def main():
+    base_env = Point2DEnv(render_onscreen=False)
+    print("No wrapper: {:.0f} ns per lookup".format(
+        1e9 * time_lookups(base_env)
+    ))
+    for num_layers in [1, 3, 6]:
+        uncached_time = time_lookups(
+            wrap(base_env, UncachedProxyEnv, num_layers)
+        )
+        cached_time = time_lookups(wrap(base_env, ProxyEnv, num_layers))
+        print("{} layer(s): {:.0f} ns -> {:.0f} ns per lookup".format(
+            num_layers, 1e9 * uncached_time, 1e9 * cached_time,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark how many relabeled transitions per second ObsDictRelabelingBuffer
+can sample from a state-based Sawyer env.
+"""
+import time
+
+import numpy as np
+
+from multiworld.core.replay_buffer import ObsDictRelabelingBuffer
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+
+MAX_SIZE = 100000
+PATH_LENGTH = 100
+BATCH_SIZE = 1024
+NUM_BATCHES = 1000
+
+
+def random_observations(env, path_length):
+    return {
+        k: np.random.uniform(
+            space.low, space.high, size=(path_length,) + space.shape
+        )
+        for k, space in env.observation_space.spaces.items()
+    }
+
+
+def main():
+    env = SawyerPushAndReachXYEnv(reward_type='puck_distance')
+    buffer = ObsDictRelabelingBuffer(MAX_SIZE, env)
+    for _ in range(MAX_SIZE // PATH_LENGTH):
+        buffer.add_path(dict(
+            observations=random_observations(env, PATH_LENGTH),
+            next_observations=random_observations(env, PATH_LENGTH),
+            actions=np.random.uniform(-1, 1, size=(PATH_LENGTH, 2)),
+        ))
+
+    start = time.time()
+    for _ in range(NUM_BATCHES):
+        buffer.random_batch(BATCH_SIZE)
+    total_time = time.time() - start
+    print("Batch size {}: {:.0f} relabeled transitions/sec".format(
+        BATCH_SIZE, NUM_BATCHES * BATCH_SIZE / total_time
+    ))
+
+
+if __name__ == "__main__":
+    main()
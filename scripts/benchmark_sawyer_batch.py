@@ -0,0 +1,64 @@
+"""
+Benchmark single-process stepping throughput of N serial Sawyer envs versus
+one batch env that steps N sims in an MjSimPool.
+"""
+import time
+
+import numpy as np
+
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_batch import \
+    SawyerPickAndPlaceBatchEnv, SawyerPushAndReachBatchEnv, \
+    SawyerReachBatchEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+
+NUM_STEPS = 50
+
+
+def time_serial(envs, actions):
+    for env in envs:
+        env.reset()
+    start = time.time()
+    for _ in range(NUM_STEPS):
+        for env, action in zip(envs, actions):
+            env.step(action)
+    return time.time() - start
+
+
+def time_batch(batch_env, actions):
+    batch_env.reset()
+    start = time.time()
+    for _ in range(NUM_STEPS):
+        batch_env.step(actions)
+    return time.time() - start
+
+
+def main():
+    for env_class, batch_env_class in [
+        (SawyerReachXYEnv, SawyerReachBatchEnv),
+        (SawyerPushAndReachXYEnv, SawyerPushAndReachBatchEnv),
+        (SawyerPickAndPlaceEnv, SawyerPickAndPlaceBatchEnv),
+    ]:
+        for num_envs in [1, 8, 32]:
+            envs = [env_class() for _ in range(num_envs)]
+            batch_env = batch_env_class(env_class(), num_envs)
+            actions = np.random.uniform(
+                -1, 1, size=(num_envs, envs[0].action_space.low.size)
+            )
+            serial_time = time_serial(envs, actions)
+            batch_time = time_batch(batch_env, actions)
+            print(
+                "{} x {}: {:.0f} -> {:.0f} env steps per second".format(
+                    env_class.__name__,
+                    num_envs,
+                    num_envs * NUM_STEPS / serial_time,
+                    num_envs * NUM_STEPS / batch_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
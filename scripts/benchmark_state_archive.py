@@ -0,0 +1,60 @@
+"""
+Report the memory per archived state and the restore latency of
+`StateArchive`, compared with pickled `get_env_state` states restored with
+`set_env_state`.
+"""
+import pickle
+import time
+
+from multiworld.core.state_archive import StateArchive
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_STATES = 1000
+NUM_RESTORES = 1000
+
+
+def main():
+    for env in [
+        Point2DEnv(render_onscreen=False),
+        SawyerReachXYEnv(),
+        SawyerPushAndReachXYEnv(),
+        SawyerPickAndPlaceEnv(),
+    ]:
+        env.reset()
+        archive = StateArchive(env.get_flat_env_state().size)
+        env_states = []
+        for _ in range(NUM_STATES):
+            obs, _, _, _ = env.step(env.action_space.sample())
+            archive.add_from_env(env, obs)
+            env_states.append(env.get_env_state())
+        pickled_bytes = sum(len(pickle.dumps(s)) for s in env_states)
+
+        start = time.time()
+        for _ in range(NUM_RESTORES):
+            archive.restore(env)
+        archive_time = (time.time() - start) / NUM_RESTORES
+
+        start = time.time()
+        for i in range(NUM_RESTORES):
+            env.set_env_state(env_states[i % NUM_STATES])
+        env_state_time = (time.time() - start) / NUM_RESTORES
+
+        print(
+            "{}: {} -> {} bytes per state, "
+            "{:.1f} us -> {:.1f} us per restore".format(
+                type(env).__name__,
+                pickled_bytes // NUM_STATES,
+                archive.nbytes_per_state,
+                1e6 * env_state_time,
+                1e6 * archive_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the write throughput of TrajectoryWriter and the sample latency of
+TrajectoryReader for ImageEnv-sized transitions (84x84 RGB observations and
+goal images).
+"""
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from multiworld.core.trajectory_recorder import TrajectoryReader, \
+    TrajectoryWriter
+
+IMAGE_LENGTH = 84 * 84 * 3
+NUM_TRANSITIONS = 20000
+CHUNK_SIZE = 2000
+BATCH_SIZE = 256
+NUM_BATCHES = 100
+
+
+def main():
+    schema = {
+        'observations/image_observation': ((IMAGE_LENGTH,), np.uint8),
+        'observations/image_desired_goal': ((IMAGE_LENGTH,), np.uint8),
+        'observations/state_observation': ((3,), np.float32),
+        'actions': ((3,), np.float32),
+        'rewards': ((), np.float32),
+    }
+    row = {
+        name: np.random.randint(0, 255, size=shape).astype(dtype)
+        for name, (shape, dtype) in schema.items()
+    }
+    row_bytes = sum(value.nbytes for value in row.values())
+    directory = tempfile.mkdtemp()
+    try:
+        writer = TrajectoryWriter(directory, schema, chunk_size=CHUNK_SIZE)
+        start = time.time()
+        for _ in range(NUM_TRANSITIONS):
+            writer.add(row)
+        add_time = time.time() - start
+        writer.close()
+        total_time = time.time() - start
+        print("add():           {:10.0f} transitions/sec".format(
+            NUM_TRANSITIONS / add_time
+        ))
+        print("add() + close(): {:10.0f} transitions/sec, {:.1f} MB/sec".format(
+            NUM_TRANSITIONS / total_time,
+            NUM_TRANSITIONS * row_bytes / total_time / 1e6,
+        ))
+
+        reader = TrajectoryReader(directory)
+        start = time.time()
+        for _ in range(NUM_BATCHES):
+            reader.random_batch(BATCH_SIZE)
+        sample_time = (time.time() - start) / NUM_BATCHES
+        print("random_batch({}): {:.2f} ms".format(
+            BATCH_SIZE, 1000 * sample_time
+        ))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
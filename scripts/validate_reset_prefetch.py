@@ -0,0 +1,69 @@
+"""
+Check that Sawyer envs with `prefetch_resets=True` produce the same reset
+distribution as regular resets, and compare the time spent in `reset`.
+
+For every observation and goal dimension, this prints the largest two-sample
+Kolmogorov-Smirnov statistic between the two sets of resets. With 500 resets
+each, values above ~0.09 would be significant at the 5% level.
+"""
+import time
+
+import numpy as np
+
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+
+NUM_RESETS = 500
+STEPS_PER_EPISODE = 20
+
+
+def collect_resets(env):
+    observations = []
+    reset_time = 0
+    for _ in range(NUM_RESETS):
+        start = time.time()
+        obs = env.reset()
+        reset_time += time.time() - start
+        observations.append(np.hstack((
+            obs['state_observation'], obs['state_desired_goal']
+        )))
+        for _ in range(STEPS_PER_EPISODE):
+            env.step(env.action_space.sample())
+    env.close()
+    return np.array(observations), reset_time / NUM_RESETS
+
+
+def ks_statistic(x, y):
+    values = np.sort(np.concatenate((x, y)))
+    cdf_x = np.searchsorted(np.sort(x), values, side='right') / len(x)
+    cdf_y = np.searchsorted(np.sort(y), values, side='right') / len(y)
+    return np.max(np.abs(cdf_x - cdf_y))
+
+
+def main():
+    for env_class in [
+        SawyerReachXYEnv,
+        SawyerPushAndReachXYEnv,
+        SawyerPickAndPlaceEnv,
+    ]:
+        regular, regular_time = collect_resets(env_class())
+        prefetched, prefetched_time = collect_resets(
+            env_class(prefetch_resets=True)
+        )
+        max_ks = max(
+            ks_statistic(regular[:, i], prefetched[:, i])
+            for i in range(regular.shape[1])
+        )
+        print("{}: max KS statistic {:.3f}, reset {:.2f} ms -> {:.2f} ms".format(
+            env_class.__name__,
+            max_ks,
+            1e3 * regular_time,
+            1e3 * prefetched_time,
+        ))
+
+
+if __name__ == "__main__":
+    main()
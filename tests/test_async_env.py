@@ -0,0 +1,79 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from multiworld.core.async_env import step_many, step_many_as_completed
+from multiworld.core.flat_goal_env import FlatGoalEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+NUM_ENVS = 4
+
+
+def make_env_pairs():
+    """
+    :return: Two lists of envs, where the envs at the same index are in the
+    same state.
+    """
+    envs = [Point2DEnv(render_onscreen=False) for _ in range(NUM_ENVS)]
+    reference_envs = [Point2DEnv(render_onscreen=False) for _ in envs]
+    for env, reference_env in zip(envs, reference_envs):
+        env.reset()
+        reference_env.reset()
+        reference_env.set_flat_env_state(env.get_flat_env_state())
+    return envs, reference_envs
+
+
+def assert_results_equal(result, reference_result):
+    obs, reward, done, info = result
+    reference_obs, reference_reward, reference_done, reference_info = \
+        reference_result
+    for key in reference_obs:
+        np.testing.assert_array_equal(obs[key], reference_obs[key])
+    assert reward == reference_reward
+    assert done == reference_done
+    assert info.keys() == reference_info.keys()
+
+
+def test_step_many_matches_serial_steps():
+    envs, reference_envs = make_env_pairs()
+    actions = np.random.uniform(-1, 1, (NUM_ENVS, 2))
+    results = asyncio.run(step_many(envs, actions))
+    assert len(results) == NUM_ENVS
+    for env, action, result in zip(reference_envs, actions, results):
+        assert_results_equal(result, env.step(action))
+
+
+def test_step_many_as_completed():
+    envs, reference_envs = make_env_pairs()
+    actions = np.random.uniform(-1, 1, (NUM_ENVS, 2))
+
+    async def collect():
+        with ThreadPoolExecutor(2) as executor:
+            return [
+                item async for item in step_many_as_completed(
+                    envs, actions, executor=executor,
+                )
+            ]
+    results = asyncio.run(collect())
+    assert sorted(i for i, _ in results) == list(range(NUM_ENVS))
+    for i, result in results:
+        assert_results_equal(result, reference_envs[i].step(actions[i]))
+
+
+def test_async_methods_use_wrapper():
+    env = FlatGoalEnv(Point2DEnv(render_onscreen=False))
+
+    async def run():
+        obs = await env.async_reset()
+        next_obs, _, _, _ = await env.async_step(np.zeros(2))
+        goals = await env.async_sample_goals(3)
+        return obs, next_obs, goals
+    obs, next_obs, goals = asyncio.run(run())
+    # The wrapper's flat observations, not the wrapped env's dictionaries.
+    assert obs.shape == next_obs.shape == (2,)
+    np.testing.assert_array_equal(obs, next_obs)
+    assert goals['desired_goal'].shape == (3, 2)
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from multiworld.core.multitask_env import MultitaskEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def random_obs(env):
+    return {
+        k: space.sample()
+        for k, space in env.observation_space.spaces.items()
+    }
+
+
+def assert_single_rewards_match(env, num_samples=20):
+    for _ in range(num_samples):
+        action = env.action_space.sample()
+        obs = random_obs(env)
+        batch_reward = env.compute_rewards(
+            action[None], {k: v[None] for k, v in obs.items()}
+        )[0]
+        assert env.compute_reward(action, obs) == batch_reward
+        # The generic path that envs override.
+        assert MultitaskEnv.compute_reward(env, action, obs) == batch_reward
+
+
+@pytest.mark.parametrize('reward_type', ['dense', 'sparse'])
+def test_point2d(reward_type):
+    assert_single_rewards_match(
+        Point2DEnv(reward_type=reward_type, render_onscreen=False)
+    )
+
+
+def test_only_read_keys_are_batched():
+    class ReadLogger(dict):
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.read_keys = []
+
+        def __getitem__(self, key):
+            self.read_keys.append(key)
+            return super().__getitem__(key)
+
+    env = Point2DEnv(render_onscreen=False)
+    obs = ReadLogger(random_obs(env))
+    MultitaskEnv.compute_reward(env, env.action_space.sample(), obs)
+    assert sorted(obs.read_keys) == [
+        'state_achieved_goal', 'state_desired_goal',
+    ]
+
+
+def sawyer_env_classes():
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+        SawyerPickAndPlaceEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+        SawyerPushAndReachXYEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import \
+        SawyerReachXYEnv
+    return [SawyerReachXYEnv, SawyerPushAndReachXYEnv, SawyerPickAndPlaceEnv]
+
+
+def test_sawyer():
+    pytest.importorskip('mujoco_py')
+    for env_class in sawyer_env_classes():
+        env = env_class()
+        # Every distance and success info is also a reward type.
+        for reward_type in env.info_schema:
+            env.reward_type = reward_type
+            assert_single_rewards_match(env)
@@ -0,0 +1,48 @@
+import os
+import time
+
+import numpy as np
+
+from multiworld.core.display import LatestFrameDisplay
+from multiworld.envs.pygame.point2d import Point2DEnv
+from multiworld.envs.pygame.pygame_viewer import PygameViewer
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def test_display_rate_limit():
+    shown_frames = []
+    display = LatestFrameDisplay(shown_frames.append, fps=10)
+    start = time.time()
+    i = 0
+    while time.time() - start < 0.35:
+        display.publish(i)
+        i += 1
+    display.stop()
+    # At most one frame per display period, and only the latest one.
+    assert 1 <= len(shown_frames) <= 5
+    assert len(shown_frames) < i
+    assert shown_frames == sorted(shown_frames)
+
+
+def test_tick_is_noop_with_display():
+    viewer = PygameViewer(32, 32, render_onscreen=True)
+    start = time.time()
+    for _ in range(3):
+        viewer.render()
+        # Would wait a second per call on the caller's thread.
+        viewer.tick(1)
+    assert time.time() - start < 0.5
+    viewer.reinit_screen(False)
+
+
+def test_point2d_render_dt_sets_display_fps():
+    env = Point2DEnv(render_onscreen=True, render_dt_msec=500)
+    env.reset()
+    start = time.time()
+    for _ in range(3):
+        env.step(np.zeros(2))
+        env.render()
+    assert time.time() - start < 0.5
+    assert env.drawer._display.fps == 2
+    env.drawer.reinit_screen(False)
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+from multiworld.core.flat_goal_env import FlatGoalEnv
+from multiworld.core.image_env import ImageEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+DTYPES = [np.float32, np.float64]
+
+
+def assert_dict_dtype(d, dtype, keys=None):
+    if keys is None:
+        keys = d.keys()
+    for key in keys:
+        assert d[key].dtype == dtype, key
+
+
+def assert_space_dtypes(env, dtype, keys=None):
+    spaces = env.observation_space.spaces
+    if keys is None:
+        keys = spaces.keys()
+    for key in keys:
+        assert spaces[key].dtype == dtype, key
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_point2d(dtype):
+    env = Point2DEnv(dtype=dtype, render_onscreen=False)
+    assert_dict_dtype(env.reset(), dtype)
+    obs, _, _, _ = env.step(env.action_space.sample())
+    assert_dict_dtype(obs, dtype)
+    assert_dict_dtype(env.sample_goals(3), dtype)
+    assert_dict_dtype(env.get_goal(), dtype)
+    assert_space_dtypes(env, dtype)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_flat_goal_env(dtype):
+    env = FlatGoalEnv(Point2DEnv(dtype=dtype, render_onscreen=False))
+    assert env.reset().dtype == dtype
+    obs, _, _, _ = env.step(env.action_space.sample())
+    assert obs.dtype == dtype
+    assert env.get_goal().dtype == dtype
+    assert env.observation_space.dtype == dtype
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_flat_goal_env_cast(dtype):
+    env = FlatGoalEnv(Point2DEnv(render_onscreen=False), dtype=dtype)
+    assert env.reset().dtype == dtype
+    obs, _, _, _ = env.step(env.action_space.sample())
+    assert obs.dtype == dtype
+    assert env.observation_space.dtype == dtype
+
+
+def make_image_env(**kwargs):
+    # Point2D renders a single-channel image.
+    return ImageEnv(Point2DEnv(render_onscreen=False), grayscale=True,
+                    **kwargs)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_image_env(dtype):
+    image_keys = ['observation', 'desired_goal', 'achieved_goal',
+                  'image_observation', 'image_desired_goal',
+                  'image_achieved_goal']
+    state_keys = ['state_observation', 'state_desired_goal',
+                  'state_achieved_goal']
+    env = make_image_env(normalize=True, dtype=dtype)
+    obs = env.reset()
+    assert_dict_dtype(obs, dtype, image_keys)
+    assert_dict_dtype(obs, np.float64, state_keys)
+    obs, _, _, _ = env.step(env.action_space.sample())
+    assert_dict_dtype(obs, dtype, image_keys)
+    assert_dict_dtype(env.sample_goals(2), dtype, ['image_desired_goal'])
+    assert_dict_dtype(env.get_goal(), dtype, ['image_desired_goal'])
+    assert_space_dtypes(env, dtype, image_keys)
+
+
+def test_image_env_uint8():
+    env = make_image_env()
+    assert env.reset()['image_observation'].dtype == np.uint8
+    goals = env.sample_goals(2)
+    assert goals['image_desired_goal'].dtype == np.uint8
+    assert_space_dtypes(env, np.uint8, ['image_observation'])
+
+
+def test_image_env_matches_space():
+    env = make_image_env()
+    obs = env.reset()
+    for key in ['image_observation', 'image_desired_goal']:
+        assert obs[key].shape == env.observation_space.spaces[key].shape
+
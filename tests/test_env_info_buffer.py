@@ -0,0 +1,78 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from multiworld.core.env_info_buffer import EnvInfoBuffer
+from multiworld.envs.env_util import get_stat_in_paths
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+INFO_SCHEMA = OrderedDict([('distance', ()), ('position', (2,))])
+
+
+def test_append_and_grow():
+    buffer = EnvInfoBuffer(INFO_SCHEMA, max_path_length=2)
+    for i in range(5):
+        if i % 2:
+            buffer.append_values([i, [i, -i]])
+        else:
+            buffer.append({'distance': i, 'position': [i, -i]})
+    assert len(buffer) == 5
+    columns = buffer.get_columns()
+    np.testing.assert_array_equal(columns['distance'], np.arange(5))
+    assert columns['position'].shape == (5, 2)
+
+    path = buffer.pop_path()
+    assert len(buffer) == 0
+    buffer.append_values([10, [0, 0]])
+    # pop_path copies, so the next path does not overwrite it.
+    assert path['distance'][0] == 0
+
+
+def make_envs():
+    env = Point2DEnv(render_onscreen=False)
+    reference_env = Point2DEnv(render_onscreen=False)
+    env.reset()
+    reference_env.reset()
+    reference_env.set_flat_env_state(env.get_flat_env_state())
+    return env, reference_env
+
+
+def test_recorded_infos_match_info_dicts():
+    env, reference_env = make_envs()
+    info_buffer = env.start_info_recording(max_path_length=3)
+    info_dicts = []
+    for _ in range(4):
+        action = env.action_space.sample()
+        _, _, _, info = env.step(action)
+        assert info == {}
+        info_dicts.append(reference_env.step(action)[3])
+    columns = info_buffer.pop_path()
+    assert list(columns.keys()) == list(Point2DEnv.info_schema.keys())
+    for key, column in columns.items():
+        np.testing.assert_array_equal(
+            column, [info[key] for info in info_dicts], err_msg=key
+        )
+
+    env.stop_info_recording()
+    _, _, _, info = env.step(env.action_space.sample())
+    assert set(info.keys()) == set(Point2DEnv.info_schema.keys())
+
+
+def test_get_stat_in_paths_columns():
+    env, reference_env = make_envs()
+    info_buffer = env.start_info_recording(max_path_length=3)
+    info_dicts = []
+    for _ in range(3):
+        action = env.action_space.sample()
+        env.step(action)
+        info_dicts.append(reference_env.step(action)[3])
+    columnar_paths = [{'env_infos': info_buffer.pop_path()}]
+    dict_paths = [{'env_infos': info_dicts}]
+    for key in ['distance_to_target', 'is_success']:
+        np.testing.assert_array_equal(
+            get_stat_in_paths(columnar_paths, 'env_infos', key),
+            get_stat_in_paths(dict_paths, 'env_infos', key),
+        )
@@ -0,0 +1,101 @@
+import os
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from multiworld.core.env_server import EnvClient, EnvServer, RemoteEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+NUM_ENVS = 3
+
+
+def free_tcp_address():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+@pytest.fixture(params=['unix', 'tcp'])
+def client(request, tmpdir):
+    if request.param == 'unix':
+        address = str(tmpdir.join('env.sock'))
+    else:
+        address = free_tcp_address()
+    envs = [Point2DEnv(render_onscreen=False) for _ in range(NUM_ENVS)]
+    server = EnvServer(envs, address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = EnvClient(address)
+    yield client
+    client.close()
+    server.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def assert_dicts_equal(a, b):
+    assert set(a.keys()) == set(b.keys())
+    for key in a:
+        np.testing.assert_array_equal(a[key], b[key], err_msg=key)
+
+
+def test_remote_env_matches_local_env(client):
+    remote_env = RemoteEnv(client, env_id=1)
+    local_env = Point2DEnv(render_onscreen=False)
+    assert remote_env.observation_space == local_env.observation_space
+
+    # The server runs in this process, so both envs use the same np.random.
+    np.random.seed(0)
+    remote_obs = remote_env.reset()
+    np.random.seed(0)
+    local_obs = local_env.reset()
+    assert_dicts_equal(remote_obs, local_obs)
+    assert_dicts_equal(remote_env.get_goal(), local_env.get_goal())
+
+    for _ in range(3):
+        action = local_env.action_space.sample()
+        remote_obs, remote_reward, remote_done, remote_info = \
+            remote_env.step(action)
+        local_obs, local_reward, local_done, local_info = \
+            local_env.step(action)
+        assert_dicts_equal(remote_obs, local_obs)
+        assert remote_reward == local_reward
+        assert remote_done == local_done
+        for key in Point2DEnv.info_schema:
+            np.testing.assert_array_equal(remote_info[key], local_info[key])
+
+    np.random.seed(1)
+    remote_goals = remote_env.sample_goals(4)
+    np.random.seed(1)
+    local_goals = local_env.sample_goals(4)
+    assert_dicts_equal(remote_goals, local_goals)
+
+    actions = np.random.uniform(-1, 1, (4, 2)).astype(np.float32)
+    obs = dict(local_goals)
+    obs['state_achieved_goal'] = np.random.uniform(-4, 4, (4, 2))
+    obs['achieved_goal'] = obs['state_achieved_goal']
+    np.testing.assert_array_equal(
+        remote_env.compute_rewards(actions, obs),
+        local_env.compute_rewards(actions, obs),
+    )
+
+
+def test_batched_step(client):
+    obs = client.reset()
+    assert obs['observation'].shape == (NUM_ENVS, 2)
+    actions = np.zeros((2, 2))
+    obs, rewards, dones, infos = client.step(actions, env_ids=[0, 2])
+    assert obs['observation'].shape == (2, 2)
+    assert rewards.shape == dones.shape == (2,)
+    assert infos['target_position'].shape == (2, 2)
+
+
+def test_server_errors_propagate(client):
+    with pytest.raises(RuntimeError, match='IndexError'):
+        client.reset(env_ids=[NUM_ENVS])
+    # The connection is still usable after an error.
+    assert client.reset()['observation'].shape == (NUM_ENVS, 2)
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from multiworld.core.flat_goal_env import FlatGoalEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def make_env(**kwargs):
+    return FlatGoalEnv(
+        Point2DEnv(render_onscreen=False),
+        obs_keys=['observation', 'desired_goal'],
+        **kwargs
+    )
+
+
+def test_flatten_into_out():
+    env = make_env()
+    obs = env.wrapped_env.reset()
+    out = np.empty(4)
+    flat_obs = env.flatten(obs, out=out)
+    assert flat_obs is out
+    np.testing.assert_array_equal(
+        out, np.hstack((obs['observation'], obs['desired_goal']))
+    )
+
+
+def test_flatten_batch_round_trip():
+    env = make_env()
+    goals = env.wrapped_env.sample_goals(5)
+    out = np.empty((5, 2))
+    flat_goals = env.flatten_batch(goals, keys=['desired_goal'], out=out)
+    assert flat_goals is out
+    unflat_goals = env.unflatten_batch(flat_goals, keys=['desired_goal'])
+    np.testing.assert_array_equal(
+        unflat_goals['desired_goal'], goals['desired_goal']
+    )
+
+
+def test_fresh_obs_by_default():
+    env = make_env()
+    obs = env.reset()
+    next_obs, _, _, _ = env.step(env.action_space.sample())
+    assert next_obs is not obs
+
+
+def test_reuse_obs_buffer():
+    env = make_env(reuse_obs_buffer=True)
+    obs = env.reset()
+    saved_obs = obs.copy()
+    next_obs, _, _, _ = env.step(np.ones(2))
+    assert next_obs is obs
+    assert not np.array_equal(next_obs, saved_obs)
+    reference_env = make_env()
+    reference_obs = reference_env.flatten(env.wrapped_env._get_obs())
+    np.testing.assert_array_equal(next_obs, reference_obs)
+    # The goal is kept across steps, so it is never reused.
+    np.testing.assert_array_equal(env.get_goal(), saved_obs[2:])
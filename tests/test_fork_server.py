@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from multiworld.core.fork_server import ForkServerEnvFactory
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+
+@pytest.fixture
+def factory():
+    factory = ForkServerEnvFactory.from_env(
+        Point2DEnv(render_onscreen=False, boundary_dist=3)
+    )
+    yield factory
+    factory.close()
+
+
+def test_workers_run_the_env(factory):
+    worker = factory.spawn(seed=0)
+    obs = worker.reset()
+    next_obs, reward, done, info = worker.step(np.array([0.5, 0.]))
+    np.testing.assert_allclose(
+        next_obs['state_observation'],
+        np.clip(obs['state_observation'] + [0.5, 0], -3, 3),
+    )
+    assert reward == -info['distance_to_target']
+    # The workers are copies of the template env.
+    assert worker.get_attr('boundary_dist') == 3
+    worker.close()
+
+
+def test_workers_are_separate_processes(factory):
+    workers = [factory.spawn() for _ in range(3)]
+    assert len({w.pid for w in workers}) == 3
+    workers[0].set_flat_env_state(np.array([1., 1., 0., 0.]))
+    workers[1].set_flat_env_state(np.array([-1., -1., 0., 0.]))
+    np.testing.assert_array_equal(
+        workers[0].get_flat_env_state(), [1, 1, 0, 0]
+    )
+    np.testing.assert_array_equal(
+        workers[1].get_flat_env_state(), [-1, -1, 0, 0]
+    )
+    # Seeded from OS entropy, so the workers reset to different states.
+    starts = [w.reset()['state_observation'] for w in workers]
+    assert not np.allclose(starts[0], starts[1])
+    for worker in workers:
+        worker.close()
+
+
+def test_seeded_workers_are_reproducible(factory):
+    workers = [factory.spawn(seed=3), factory.spawn(seed=3)]
+    starts = [w.reset()['state_observation'] for w in workers]
+    np.testing.assert_array_equal(starts[0], starts[1])
+    for worker in workers:
+        worker.close()
+
+
+def test_async_calls_and_errors(factory):
+    worker = factory.spawn()
+    worker.call_async('reset')
+    worker.call_async('get_flat_env_state')
+    worker.wait()
+    assert worker.wait().shape == (4,)
+    with pytest.raises(RuntimeError, match='AttributeError'):
+        worker.no_such_method()
+    # The worker keeps serving after an error.
+    assert worker.get_flat_env_state().shape == (4,)
+    worker.close()
+
+
+def test_several_factories():
+    factories = [
+        ForkServerEnvFactory.from_env(Point2DEnv(render_onscreen=False))
+        for _ in range(2)
+    ]
+    for factory in factories:
+        worker = factory.spawn()
+        worker.reset()
+        worker.close()
+    # Each close returns even though the other server holds its socket.
+    for factory in factories:
+        factory.close()
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from gym.spaces import Box, Dict
+
+from multiworld.core.image_env import ImageEnv
+from multiworld.core.multitask_env import MultitaskEnv
+from multiworld.core.serializable import Serializable
+
+
+class FakeCameraEnv(MultitaskEnv, Serializable):
+    """
+    Renders constant images of the requested size, like a MujocoEnv.
+    """
+    def __init__(self):
+        self.quick_init(locals())
+        MultitaskEnv.__init__(self)
+        space = Box(-1, 1, (2,), dtype=np.float32)
+        self.observation_space = Dict([
+            ('observation', space),
+            ('desired_goal', space),
+            ('achieved_goal', space),
+            ('state_observation', space),
+            ('state_desired_goal', space),
+            ('state_achieved_goal', space),
+        ])
+        self.action_space = space
+        self.rendered_sizes = []
+
+    def _get_obs(self):
+        return {
+            k: np.zeros(2, dtype=np.float32)
+            for k in self.observation_space.spaces
+        }
+
+    def reset(self):
+        return self._get_obs()
+
+    def step(self, action):
+        return self._get_obs(), 0, False, {}
+
+    def get_env_state(self):
+        return None
+
+    def set_env_state(self, state):
+        pass
+
+    def get_goal(self):
+        return {'desired_goal': np.zeros(2), 'state_desired_goal': np.zeros(2)}
+
+    def set_to_goal(self, goal):
+        pass
+
+    def sample_goals(self, batch_size):
+        return {
+            'desired_goal': np.zeros((batch_size, 2)),
+            'state_desired_goal': np.zeros((batch_size, 2)),
+        }
+
+    def compute_rewards(self, actions, obs):
+        return np.zeros(len(actions))
+
+    def get_image(self, width=84, height=84, camera_name=None):
+        self.rendered_sizes.append((width, height))
+        return np.full((height, width, 3), 7, dtype=np.uint8)
+
+    def get_images(self, width=84, height=84, camera_name=None, depth=False,
+                   segmentation=False):
+        images = {'rgb': self.get_image(width, height)}
+        if depth:
+            images['depth'] = np.full((height, width), 0.5, dtype=np.float32)
+        if segmentation:
+            images['segmentation'] = np.full((height, width), 3, np.uint8)
+        return images
+
+
+def assert_obs_match_spaces(env, obs):
+    for key, space in env.observation_space.spaces.items():
+        assert obs[key].shape == space.shape, key
+        assert obs[key].dtype == space.dtype, key
+
+
+@pytest.mark.parametrize('depth', [False, True])
+def test_rgb_size_does_not_depend_on_depth(depth):
+    wrapped_env = FakeCameraEnv()
+    env = ImageEnv(wrapped_env, imsize=32, depth=depth)
+    obs = env.reset()
+    assert obs['image_observation'].shape == (env.image_length,)
+    assert env.image_length == 3 * 32 * 32
+    assert set(wrapped_env.rendered_sizes) == {(32, 32)}
+
+
+def test_depth_and_segmentation_observations():
+    env = ImageEnv(FakeCameraEnv(), imsize=16, depth=True, segmentation=True)
+    obs = env.reset()
+    assert_obs_match_spaces(env, obs)
+    assert obs['depth_observation'].dtype == np.float16
+    np.testing.assert_array_equal(obs['depth_observation'], 0.5)
+    np.testing.assert_array_equal(obs['segmentation_observation'], 3)
+    obs, _, _, _ = env.step(np.zeros(2))
+    assert_obs_match_spaces(env, obs)
+
+
+def test_uint16_depth():
+    env = ImageEnv(FakeCameraEnv(), imsize=16, depth=True,
+                   depth_dtype=np.uint16)
+    obs = env.reset()
+    assert_obs_match_spaces(env, obs)
+    np.testing.assert_array_equal(obs['depth_observation'], 32767)
+
+
+def test_no_extra_keys_by_default():
+    env = ImageEnv(FakeCameraEnv(), imsize=16)
+    obs = env.reset()
+    assert 'depth_observation' not in obs
+    assert 'segmentation_observation' not in obs
+    assert 'depth_observation' not in env.observation_space.spaces
+    assert_obs_match_spaces(env, obs)
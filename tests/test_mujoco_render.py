@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('mujoco_py')
+
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+
+
+def test_rgb_array_size():
+    env = SawyerReachXYEnv()
+    env.reset()
+    image = env.render('rgb_array', width=64, height=48)
+    assert image.shape == (48, 64, 3)
+    assert image.dtype == np.uint8
+
+
+def test_rgb_array_out():
+    env = SawyerReachXYEnv()
+    env.reset()
+    out = np.zeros((48, 64, 3), dtype=np.uint8)
+    image = env.render('rgb_array', width=64, height=48, out=out)
+    assert image is out
+    assert out.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(
+        out, env.render('rgb_array', width=64, height=48)
+    )
@@ -0,0 +1,28 @@
+import importlib
+import os
+
+import pytest
+
+import multiworld.envs.mujoco
+
+
+def reload_with_renderer(monkeypatch, renderer):
+    monkeypatch.setenv('MULTIWORLD_MUJOCO_RENDERER', renderer)
+    importlib.reload(multiworld.envs.mujoco)
+
+
+def test_osmesa_forces_cpu(monkeypatch):
+    monkeypatch.delenv('MUJOCO_PY_FORCE_CPU', raising=False)
+    reload_with_renderer(monkeypatch, 'osmesa')
+    assert os.environ['MUJOCO_PY_FORCE_CPU'] == '1'
+
+
+def test_egl_clears_cpu_override(monkeypatch):
+    monkeypatch.setenv('MUJOCO_PY_FORCE_CPU', '1')
+    reload_with_renderer(monkeypatch, 'egl')
+    assert 'MUJOCO_PY_FORCE_CPU' not in os.environ
+
+
+def test_invalid_renderer(monkeypatch):
+    with pytest.raises(ValueError):
+        reload_with_renderer(monkeypatch, 'vulkan')
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from multiworld.envs.pygame.point2d import Point2DEnv, Point2DWallEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+NUM_SEQUENCES = 8
+HORIZON = 10
+
+
+def make_envs():
+    return [
+        Point2DEnv(render_onscreen=False),
+        Point2DWallEnv(wall_shape='u', render_onscreen=False),
+        Point2DWallEnv(wall_shape='-', render_onscreen=False),
+    ]
+
+
+def step_rollout(env, state, goal, actions):
+    env.reset()
+    env.set_flat_env_state(np.concatenate((state, goal)))
+    positions = [state]
+    total_reward = 0
+    for action in actions:
+        obs, reward, _, _ = env.step(action)
+        positions.append(obs['state_observation'])
+        total_reward += reward
+    return np.array(positions), total_reward
+
+
+@pytest.mark.parametrize('env', make_envs())
+def test_true_states_batch_matches_step(env):
+    states = np.random.uniform(-4, 4, (NUM_SEQUENCES, 2))
+    # Actions larger than 1 are clipped, like in `step`.
+    actions = np.random.uniform(-1.5, 1.5, (NUM_SEQUENCES, HORIZON, 2))
+    goals = np.random.uniform(-4, 4, (NUM_SEQUENCES, 2))
+    positions, rewards = env.true_states_batch(states, actions, goals)
+    assert positions.shape == (NUM_SEQUENCES, HORIZON + 1, 2)
+    for i in range(NUM_SEQUENCES):
+        step_positions, step_reward = step_rollout(
+            env, states[i], goals[i], actions[i]
+        )
+        np.testing.assert_allclose(positions[i], step_positions)
+        np.testing.assert_allclose(rewards[i], step_reward)
+    np.testing.assert_array_equal(
+        env.true_states_batch(states, actions), positions
+    )
+
+
+def test_true_states_and_true_model():
+    env = Point2DWallEnv(wall_shape='u', render_onscreen=False)
+    state = np.array([0., -2.])
+    actions = np.tile([0., 1.], (HORIZON, 1))
+    positions = env.true_states(state, actions)
+    np.testing.assert_array_equal(
+        positions, env.true_states_batch(state[None], actions[None])[0]
+    )
+    np.testing.assert_array_equal(
+        env.true_model(state, actions[0]), positions[1]
+    )
+    # The ball cannot move through the wall at y = 1.
+    assert positions[-1, 1] == 1 - env.ball_radius
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+from multiworld.core.image_env import ImageEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+@pytest.fixture
+def env():
+    # Point2D renders a single-channel image.
+    env = ImageEnv(Point2DEnv(render_onscreen=False), grayscale=True)
+    yield env
+    env.stop_render_workers()
+
+
+def collect_states_and_images(env, num_steps=6):
+    obs = env.reset()
+    states = [env.get_env_state()]
+    images = [obs['image_observation']]
+    for _ in range(num_steps - 1):
+        obs, _, _, _ = env.step(env.action_space.sample())
+        states.append(env.get_env_state())
+        images.append(obs['image_observation'])
+    return states, np.array(images)
+
+
+def test_render_states_matches_observations(env):
+    states, images = collect_states_and_images(env)
+    flat_state = env.get_flat_env_state()
+    out = np.zeros_like(images)
+    rendered = env.render_states(states, out=out)
+    assert rendered is out
+    np.testing.assert_array_equal(rendered, images)
+    # The env is back in its own state.
+    np.testing.assert_array_equal(env.get_flat_env_state(), flat_state)
+
+
+def test_render_workers(env):
+    states, images = collect_states_and_images(env, num_steps=7)
+    env.start_render_workers(3)
+    np.testing.assert_array_equal(env.render_states(states), images)
+    env.stop_render_workers()
+    np.testing.assert_array_equal(env.render_states(states), images)
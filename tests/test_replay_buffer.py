@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+
+from multiworld.core.replay_buffer import ObsDictRelabelingBuffer
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+OBS_KEYS = ['observation', 'desired_goal', 'achieved_goal',
+            'state_observation', 'state_desired_goal', 'state_achieved_goal']
+PATH_LENGTH = 5
+
+
+def make_path(path_id):
+    """
+    The achieved goal of step t of path p is (p, t + 1), so every relabeled
+    goal tells where it came from.
+    """
+    steps = np.arange(PATH_LENGTH)
+    achieved_goals = np.stack((np.full(PATH_LENGTH, path_id), steps), 1)
+    next_achieved_goals = achieved_goals + [0, 1]
+    desired_goals = np.full((PATH_LENGTH, 2), -1.)
+
+    def make_obs(achieved):
+        return {
+            k: desired_goals if k.endswith('desired_goal') else achieved
+            for k in OBS_KEYS
+        }
+    return dict(
+        observations=make_obs(achieved_goals),
+        next_observations=make_obs(next_achieved_goals),
+        actions=np.zeros((PATH_LENGTH, 2)),
+    )
+
+
+def make_buffer(max_size=100, num_paths=4, env=None, **kwargs):
+    if env is None:
+        env = Point2DEnv(render_onscreen=False)
+    kwargs.setdefault('fraction_goals_future', 0.)
+    kwargs.setdefault('fraction_goals_random', 0.)
+    buffer = ObsDictRelabelingBuffer(max_size, env, **kwargs)
+    for path_id in range(num_paths):
+        buffer.add_path(make_path(path_id))
+    return env, buffer
+
+
+def get_achieved_goals(batch):
+    return batch['observations']['state_achieved_goal']
+
+
+def get_desired_goals(batch):
+    return batch['observations']['state_desired_goal']
+
+
+def test_future_goals():
+    # 23 transitions in a buffer of 20, so the first path is overwritten.
+    _, buffer = make_buffer(
+        max_size=20, num_paths=5, fraction_goals_future=1.
+    )
+    batch = buffer.random_batch(200)
+    achieved_goals = get_achieved_goals(batch)
+    desired_goals = get_desired_goals(batch)
+    np.testing.assert_array_equal(desired_goals[:, 0], achieved_goals[:, 0])
+    assert np.all(desired_goals[:, 1] > achieved_goals[:, 1])
+    assert np.all(desired_goals[:, 1] <= PATH_LENGTH)
+    np.testing.assert_array_equal(
+        batch['next_observations']['state_desired_goal'], desired_goals
+    )
+
+
+def test_final_goals():
+    _, buffer = make_buffer(fraction_goals_final=1.)
+    batch = buffer.random_batch(50)
+    desired_goals = get_desired_goals(batch)
+    np.testing.assert_array_equal(
+        desired_goals[:, 0], get_achieved_goals(batch)[:, 0]
+    )
+    np.testing.assert_array_equal(desired_goals[:, 1], PATH_LENGTH)
+
+
+def test_random_and_rollout_goals():
+    _, buffer = make_buffer(fraction_goals_random=0.5)
+    batch = buffer.random_batch(50)
+    desired_goals = get_desired_goals(batch)
+    assert np.all(desired_goals[:25, 1] >= 1)
+    np.testing.assert_array_equal(desired_goals[25:], -1)
+
+
+def test_env_goals():
+    env = Point2DEnv(render_onscreen=False, fixed_goal=np.array([1., 2.]))
+    _, buffer = make_buffer(env=env, fraction_goals_env=1.)
+    batch = buffer.random_batch(10)
+    np.testing.assert_array_equal(get_desired_goals(batch), [[1, 2]] * 10)
+
+
+def test_rewards_use_relabeled_goals():
+    _, buffer = make_buffer(fraction_goals_future=0.5)
+    batch = buffer.random_batch(50)
+    next_obs = batch['next_observations']
+    np.testing.assert_allclose(
+        batch['rewards'],
+        -np.linalg.norm(
+            next_obs['state_achieved_goal'] - next_obs['state_desired_goal'],
+            axis=1,
+        ),
+    )
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from multiworld.core.reset_prefetcher import ResetPrefetcher
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+NUM_RESETS = 200
+# Critical value of the two-sample KS statistic for 200 samples each at the
+# 0.1% level.
+MAX_KS_STATISTIC = 0.195
+
+
+def make_prefetcher(seed):
+    env = Point2DEnv(render_onscreen=False)
+    return ResetPrefetcher(type(env), env.__getstate__(), seed=seed)
+
+
+def test_states_are_reproducible():
+    prefetchers = [make_prefetcher(0), make_prefetcher(0), make_prefetcher(1)]
+    states = [[p.get() for _ in range(3)] for p in prefetchers]
+    for p in prefetchers:
+        p.close()
+    np.testing.assert_array_equal(states[0], states[1])
+    assert not np.allclose(states[0], states[2])
+    assert not np.allclose(states[0][0], states[0][1])
+
+
+def test_states_restore_into_env():
+    prefetcher = make_prefetcher(0)
+    state = prefetcher.get()
+    prefetcher.close()
+    env = Point2DEnv(render_onscreen=False)
+    env.set_flat_env_state(state)
+    np.testing.assert_array_equal(env.get_flat_env_state(), state)
+
+
+def ks_statistic(x, y):
+    values = np.concatenate((x, y))
+    cdf_x = np.searchsorted(np.sort(x), values, side='right') / len(x)
+    cdf_y = np.searchsorted(np.sort(y), values, side='right') / len(y)
+    return np.max(np.abs(cdf_x - cdf_y))
+
+
+def collect_resets(env):
+    observations = []
+    for _ in range(NUM_RESETS):
+        obs = env.reset()
+        observations.append(np.hstack((
+            obs['state_observation'], obs['state_desired_goal']
+        )))
+        env.step(env.action_space.sample())
+    env.close()
+    return np.array(observations)
+
+
+def sawyer_env_classes():
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+        SawyerPickAndPlaceEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+        SawyerPushAndReachXYEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import \
+        SawyerReachXYEnv
+    return [SawyerReachXYEnv, SawyerPushAndReachXYEnv, SawyerPickAndPlaceEnv]
+
+
+def test_sawyer_reset_distribution():
+    pytest.importorskip('mujoco_py')
+    for env_class in sawyer_env_classes():
+        regular = collect_resets(env_class())
+        prefetched = collect_resets(env_class(prefetch_resets=True))
+        for i in range(regular.shape[1]):
+            assert (
+                ks_statistic(regular[:, i], prefetched[:, i])
+                < MAX_KS_STATISTIC
+            ), (env_class.__name__, i)
+
+
+def test_sawyer_seed_controls_prefetched_resets():
+    pytest.importorskip('mujoco_py')
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import \
+        SawyerReachXYEnv
+    goals = []
+    for _ in range(2):
+        env = SawyerReachXYEnv(prefetch_resets=True)
+        env.seed(0)
+        goals.append([env.reset()['state_desired_goal'] for _ in range(3)])
+        env.close()
+    np.testing.assert_array_equal(goals[0], goals[1])
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('mujoco_py')
+
+from multiworld.envs.mujoco.sawyer_xyz.base import get_flat_sim_state
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_batch import \
+    SawyerPickAndPlaceBatchEnv, SawyerPushAndReachBatchEnv, \
+    SawyerReachBatchEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+    SawyerPickAndPlaceEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+    SawyerPushAndReachXYEnv
+from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import SawyerReachXYEnv
+
+NUM_ENVS = 3
+NUM_STEPS = 5
+ENV_CLASSES = [
+    (SawyerReachXYEnv, SawyerReachBatchEnv),
+    (SawyerPushAndReachXYEnv, SawyerPushAndReachBatchEnv),
+    (SawyerPickAndPlaceEnv, SawyerPickAndPlaceBatchEnv),
+]
+
+
+def make_serial_envs(env_class, batch_env):
+    """
+    :return: One regular env per sim of `batch_env`, in the same state.
+    """
+    envs = []
+    for sim, goal in zip(batch_env.sims, batch_env._goals):
+        env = env_class()
+        env.reset()
+        env.set_flat_env_state(
+            np.concatenate((get_flat_sim_state(sim), goal))
+        )
+        envs.append(env)
+    return envs
+
+
+def assert_obs_row_matches(batch_obs, i, obs):
+    for key, value in obs.items():
+        np.testing.assert_allclose(
+            batch_obs[key][i], value, atol=1e-6, err_msg=key
+        )
+
+
+@pytest.mark.parametrize('env_class,batch_env_class', ENV_CLASSES)
+def test_batch_env_matches_serial_envs(env_class, batch_env_class):
+    batch_env = batch_env_class(env_class(), NUM_ENVS)
+    batch_obs = batch_env.reset()
+    envs = make_serial_envs(env_class, batch_env)
+    for i, env in enumerate(envs):
+        assert_obs_row_matches(batch_obs, i, env._get_obs())
+
+    action_dim = batch_env.action_space.low.size
+    for _ in range(NUM_STEPS):
+        actions = np.random.uniform(-1, 1, (NUM_ENVS, action_dim))
+        batch_obs, rewards, dones, infos = batch_env.step(actions)
+        assert not dones.any()
+        for i, env in enumerate(envs):
+            obs, reward, _, info = env.step(actions[i])
+            assert_obs_row_matches(batch_obs, i, obs)
+            np.testing.assert_allclose(rewards[i], reward, atol=1e-6)
+            for key, values in infos.items():
+                np.testing.assert_allclose(
+                    values[i], info[key], atol=1e-6, err_msg=key
+                )
+
+
+def test_partial_reset():
+    batch_env = SawyerReachBatchEnv(SawyerReachXYEnv(), NUM_ENVS)
+    batch_env.reset()
+    batch_env.step(np.ones((NUM_ENVS, 2)))
+    moved_obs = batch_env._get_obs()['observation'].copy()
+    obs = batch_env.reset(indices=[1])
+    np.testing.assert_array_equal(obs['observation'][0], moved_obs[0])
+    np.testing.assert_array_equal(obs['observation'][2], moved_obs[2])
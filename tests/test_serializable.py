@@ -0,0 +1,36 @@
+import pickle
+
+import numpy as np
+
+from multiworld.core.serializable import Serializable
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+
+def test_pickle_replays_constructor_args():
+    env = Point2DEnv(render_onscreen=False, boundary_dist=2)
+    copy = pickle.loads(pickle.dumps(env))
+    assert copy.boundary_dist == 2
+    assert '__snapshot' not in env.__getstate__()
+    assert '__flat_snapshot' not in env.__getstate__()
+
+
+def test_snapshot_pickling_restores_flat_state():
+    env = Point2DEnv(render_onscreen=False)
+    env.reset()
+    env.step(env.action_space.sample())
+    env.set_snapshot_pickling()
+    state = env.__getstate__()
+    assert '__snapshot' not in state
+    copy = pickle.loads(pickle.dumps(env))
+    np.testing.assert_array_equal(
+        copy.get_flat_env_state(), env.get_flat_env_state()
+    )
+    # The copy keeps snapshot pickling on.
+    assert '__flat_snapshot' in copy.__getstate__()
+
+
+def test_clone_overrides_kwargs():
+    env = Point2DEnv(render_onscreen=False, boundary_dist=2)
+    clone = Serializable.clone(env, boundary_dist=3)
+    assert clone.boundary_dist == 3
+    assert env.boundary_dist == 2
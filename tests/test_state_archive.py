@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from multiworld.core.state_archive import StateArchive
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def test_add_grows():
+    archive = StateArchive(3, initial_capacity=2)
+    for i in range(5):
+        assert archive.add(np.full(3, i)) == i
+    assert archive.size == 5
+    np.testing.assert_array_equal(archive.states[:, 0], np.arange(5))
+    np.testing.assert_array_equal(archive.visit_counts, 1)
+
+
+def test_dedup_by_cell():
+    archive = StateArchive(2, cell_size=1.)
+    assert archive.add(np.zeros(2), achieved_goal=[0.2, 0.2]) == 0
+    assert archive.add(np.ones(2), achieved_goal=[0.8, 0.1]) == 0
+    assert archive.add(np.ones(2), achieved_goal=[1.5, 0.1]) == 1
+    assert archive.size == 2
+    np.testing.assert_array_equal(archive.visit_counts, [2, 1])
+    # The first state in a cell is kept.
+    np.testing.assert_array_equal(archive.states[0], np.zeros(2))
+
+
+def test_sample_follows_weights():
+    archive = StateArchive(1)
+    for i in range(3):
+        archive.add(np.full(1, i))
+    archive.weights[:] = [0, 1, 0]
+    indices, states = archive.sample(100)
+    np.testing.assert_array_equal(indices, 1)
+    np.testing.assert_array_equal(states, 1)
+
+
+def test_sample_empty_or_zero_weight():
+    archive = StateArchive(1)
+    with pytest.raises(ValueError):
+        archive.sample(1)
+    archive.add(np.zeros(1), weight=0)
+    with pytest.raises(ValueError):
+        archive.sample(1)
+
+
+def test_point2d_restore():
+    env = Point2DEnv(render_onscreen=False)
+    obs = env.reset()
+    archive = StateArchive(env.get_flat_env_state().size, cell_size=0.5)
+    archive.add_from_env(env, obs)
+    saved_obs = obs
+    env.reset()
+    assert archive.restore(env) == 0
+    obs = env._get_obs()
+    for key in ['state_observation', 'state_desired_goal']:
+        np.testing.assert_array_equal(obs[key], saved_obs[key])
+
+
+def sawyer_env_classes():
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_pick_and_place import \
+        SawyerPickAndPlaceEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_push_and_reach_env import \
+        SawyerPushAndReachXYEnv
+    from multiworld.envs.mujoco.sawyer_xyz.sawyer_reach import \
+        SawyerReachXYEnv
+    return [SawyerReachXYEnv, SawyerPushAndReachXYEnv, SawyerPickAndPlaceEnv]
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_sawyer_archive_restore(dtype):
+    pytest.importorskip('mujoco_py')
+    for env_class in sawyer_env_classes():
+        env = env_class(dtype=dtype)
+        obs = env.reset()
+        archive = StateArchive(env.get_flat_env_state().size)
+        archive.add_from_env(env, obs)
+        env.reset()
+        archive.restore(env, 0)
+        np.testing.assert_allclose(
+            env.get_flat_env_state(), archive.states[0]
+        )
+        obs, _, _, _ = env.step(env.action_space.sample())
+        for key, value in obs.items():
+            assert value.dtype == dtype, key
+        assert env.observation_space.spaces['observation'].dtype == dtype
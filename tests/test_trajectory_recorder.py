@@ -0,0 +1,108 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from multiworld.core.trajectory_recorder import TrajectoryReader, \
+    TrajectoryRecorderEnv, TrajectoryWriter
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+SCHEMA = OrderedDict([
+    ('observations', ((3,), np.float32)),
+    ('images', ((2, 2), np.uint8)),
+    ('rewards', ((), np.float64)),
+])
+
+
+def make_rows(num_rows):
+    return [
+        {
+            'observations': np.full(3, i, dtype=np.float32),
+            'images': np.full((2, 2), i % 256, dtype=np.uint8),
+            'rewards': -i,
+        }
+        for i in range(num_rows)
+    ]
+
+
+def assert_batch_matches_rows(batch, rows, indices):
+    for name, (shape, dtype) in SCHEMA.items():
+        assert batch[name].dtype == dtype
+        assert batch[name].shape == (len(indices),) + shape
+        np.testing.assert_array_equal(
+            batch[name], [rows[i][name] for i in indices]
+        )
+
+
+def test_round_trip(tmpdir):
+    directory = str(tmpdir)
+    writer = TrajectoryWriter(directory, SCHEMA, chunk_size=4)
+    rows = make_rows(10)
+    for row in rows:
+        writer.add(row)
+    writer.close()
+
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 10
+    assert reader.schema == SCHEMA
+    indices = np.array([9, 0, 5, 4, 3, 9])
+    assert_batch_matches_rows(reader.get_batch(indices), rows, indices)
+    batch = reader.get_batch(indices, column_names=['rewards'])
+    assert list(batch.keys()) == ['rewards']
+    batch = reader.random_batch(7)
+    assert batch['observations'].shape == (7, 3)
+
+
+def test_flush_partial_chunk(tmpdir):
+    directory = str(tmpdir)
+    writer = TrajectoryWriter(directory, SCHEMA, chunk_size=4)
+    rows = make_rows(6)
+    for row in rows[:5]:
+        writer.add(row)
+    writer.flush()
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 5
+    assert_batch_matches_rows(reader.get_batch(np.arange(5)), rows, range(5))
+
+    writer.add(rows[5])
+    writer.close()
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 6
+    assert_batch_matches_rows(reader.get_batch(np.arange(6)), rows, range(6))
+
+
+def test_recorder_env(tmpdir):
+    directory = str(tmpdir)
+    env = TrajectoryRecorderEnv(
+        Point2DEnv(render_onscreen=False),
+        directory,
+        obs_keys=['observation'],
+        chunk_size=3,
+    )
+    obs = env.reset()
+    transitions = []
+    for _ in range(5):
+        action = env.action_space.sample()
+        next_obs, reward, done, info = env.step(action)
+        transitions.append((obs, action, next_obs, reward, info))
+        obs = next_obs
+    env.close()
+
+    reader = TrajectoryReader(directory)
+    assert len(reader) == 5
+    batch = reader.get_batch(np.arange(5))
+    for i, (obs, action, next_obs, reward, info) in enumerate(transitions):
+        np.testing.assert_array_equal(
+            batch['observations/observation'][i], obs['observation']
+        )
+        np.testing.assert_array_equal(
+            batch['next_observations/observation'][i],
+            next_obs['observation'],
+        )
+        np.testing.assert_array_equal(batch['actions'][i], action)
+        np.testing.assert_allclose(batch['rewards'][i], reward, rtol=1e-6)
+        np.testing.assert_array_equal(
+            batch['env_infos/target_position'][i], info['target_position']
+        )
@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pytest
+from gym.spaces import Box, Dict
+
+from multiworld.core.vec_env import AutoResetVecEnv
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+class CountingEnv(object):
+    """
+    Observes its step count and is done after `done_at` steps.
+    """
+    observation_space = Dict([('observation', Box(0, 100, (1,)))])
+    action_space = Box(-1, 1, (1,))
+
+    def __init__(self, done_at):
+        self.done_at = done_at
+        self.count = 0
+        self.num_resets = 0
+
+    def reset(self):
+        self.count = 0
+        self.num_resets += 1
+        return self._get_obs()
+
+    def step(self, action):
+        self.count += 1
+        return self._get_obs(), 1., self.count == self.done_at, {}
+
+    def _get_obs(self):
+        return {'observation': np.array([self.count], dtype=np.float32)}
+
+
+@pytest.mark.parametrize('executor', [None, False])
+def test_done_and_timeout(executor):
+    envs = [CountingEnv(done_at=2), CountingEnv(done_at=10)]
+    vec_env = AutoResetVecEnv(envs, max_episode_steps=3, executor=executor)
+    obs = vec_env.reset()
+    np.testing.assert_array_equal(obs['observation'][:, 0], [0, 0])
+    actions = np.zeros((2, 1))
+
+    obs, rewards, dones, infos = vec_env.step(actions)
+    np.testing.assert_array_equal(obs['observation'][:, 0], [1, 1])
+    np.testing.assert_array_equal(dones, [False, False])
+    np.testing.assert_array_equal(rewards, [1, 1])
+    assert len(infos) == 2
+
+    # The first env is done; its new episode starts right away.
+    obs, _, dones, _ = vec_env.step(actions)
+    np.testing.assert_array_equal(dones, [True, False])
+    np.testing.assert_array_equal(vec_env.timeouts, [False, False])
+    np.testing.assert_array_equal(obs['observation'][:, 0], [0, 2])
+    assert vec_env.terminal_obs['observation'][0, 0] == 2
+    np.testing.assert_array_equal(vec_env.episode_steps, [0, 2])
+
+    # The second env hits the time limit.
+    obs, _, dones, _ = vec_env.step(actions)
+    np.testing.assert_array_equal(dones, [False, True])
+    np.testing.assert_array_equal(vec_env.timeouts, [False, True])
+    np.testing.assert_array_equal(obs['observation'][:, 0], [1, 0])
+    assert vec_env.terminal_obs['observation'][1, 0] == 3
+    assert [env.num_resets for env in envs] == [2, 2]
+
+
+def test_point2d_terminal_obs():
+    envs = [Point2DEnv(render_onscreen=False) for _ in range(3)]
+    vec_env = AutoResetVecEnv(envs, max_episode_steps=4)
+    vec_env.reset()
+    reference_env = Point2DEnv(render_onscreen=False)
+    reference_env.reset()
+    reference_env.set_flat_env_state(envs[1].get_flat_env_state())
+    actions = np.random.uniform(-1, 1, (4, 3, 2))
+    for t in range(4):
+        obs, _, dones, _ = vec_env.step(actions[t])
+        reference_obs, _, _, _ = reference_env.step(actions[t, 1])
+    assert dones.all()
+    assert vec_env.timeouts.all()
+    np.testing.assert_array_equal(
+        vec_env.terminal_obs['state_observation'][1],
+        reference_obs['state_observation'],
+    )
+    np.testing.assert_array_equal(
+        obs['state_observation'][1], envs[1]._get_obs()['state_observation']
+    )
+
+
+def test_max_episode_steps_default():
+    envs = [Point2DEnv(render_onscreen=False)]
+    assert AutoResetVecEnv(envs).max_episode_steps == 50
+    with pytest.raises(ValueError):
+        AutoResetVecEnv([CountingEnv(done_at=2)])
@@ -0,0 +1,100 @@
+import os
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+class FakeWriter(object):
+    def __init__(self, videos, path, unblocked):
+        self.frames = []
+        self.closed = False
+        self.unblocked = unblocked
+        videos[path] = self
+
+    def append_data(self, frame):
+        self.unblocked.wait()
+        self.frames.append(frame.copy())
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_imageio(monkeypatch):
+    """
+    Replaces imageio with a module whose writers keep the frames in memory.
+    Encoding blocks until `unblocked` is set.
+    """
+    imageio = types.ModuleType('imageio')
+    imageio.videos = {}
+    imageio.unblocked = threading.Event()
+    imageio.get_writer = lambda path, fps: FakeWriter(
+        imageio.videos, path, imageio.unblocked,
+    )
+    monkeypatch.setitem(sys.modules, 'imageio', imageio)
+    return imageio
+
+
+def make_env(directory, **kwargs):
+    from multiworld.core.video_recorder import VideoRecorderEnv
+    return VideoRecorderEnv(
+        Point2DEnv(render_onscreen=False), str(directory), **kwargs
+    )
+
+
+def test_records_every_episode(tmpdir, fake_imageio):
+    fake_imageio.unblocked.set()
+    env = make_env(tmpdir, frame_stride=2, width=32, height=16)
+    for _ in range(2):
+        env.reset()
+        for _ in range(4):
+            env.step(env.action_space.sample())
+    env.close()
+    videos = [
+        fake_imageio.videos[os.path.join(str(tmpdir), 'episode_%05d.mp4' % i)]
+        for i in range(2)
+    ]
+    for video in videos:
+        assert video.closed
+        # The frame from reset plus every other step.
+        assert len(video.frames) == 3
+        assert video.frames[0].shape == (16, 32, 3)
+    assert env.num_recorded_frames == 6
+    assert env.num_dropped_frames == 0
+
+
+def test_drops_frames_when_encoder_falls_behind(tmpdir, fake_imageio):
+    env = make_env(tmpdir, num_frame_buffers=2)
+    env.reset()
+    for _ in range(5):
+        env.step(env.action_space.sample())
+    # Both buffers wait for the blocked encoder, so later frames are dropped.
+    assert env.num_recorded_frames == 2
+    assert env.num_dropped_frames == 4
+    fake_imageio.unblocked.set()
+    env.close()
+    video, = fake_imageio.videos.values()
+    assert len(video.frames) == 2
+    # The buffers are reused once encoded.
+    env.reset()
+    assert env.num_recorded_frames == 3
+
+
+def test_step_before_reset(tmpdir, fake_imageio):
+    fake_imageio.unblocked.set()
+    env = make_env(tmpdir)
+    env.wrapped_env.reset()
+    env.step(env.action_space.sample())
+    env.reset()
+    env.step(env.action_space.sample())
+    env.close()
+    # The first frame has no video, but does not stop the encoder.
+    video, = fake_imageio.videos.values()
+    assert len(video.frames) == 2
@@ -0,0 +1,72 @@
+import os
+import pickle
+
+from multiworld.core.flat_goal_env import FlatGoalEnv
+from multiworld.core.wrapper_env import ProxyEnv, get_attr_owner, \
+    get_wrapper_stack
+from multiworld.envs.pygame.point2d import Point2DEnv
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+def make_env():
+    return Point2DEnv(render_onscreen=False)
+
+
+def test_forwarded_methods_are_cached():
+    base_env = make_env()
+    env = ProxyEnv(ProxyEnv(base_env))
+    method = env.compute_rewards
+    assert method.__self__ is base_env
+    assert env.compute_rewards is method
+    assert env.__dict__['compute_rewards'] is method
+
+
+def test_cache_cleared_when_wrapped_env_changes():
+    outer = ProxyEnv(ProxyEnv(make_env()))
+    outer.get_goal
+    middle = outer.wrapped_env
+    new_base_env = make_env()
+    # Reassigning further down the chain clears the outer caches too.
+    middle._wrapped_env = new_base_env
+    assert outer.get_goal.__self__ is new_base_env
+
+    other_env = make_env()
+    outer._wrapped_env = other_env
+    assert outer.get_goal.__self__ is other_env
+
+
+def test_cache_cleared_on_request():
+    base_env = make_env()
+    env = ProxyEnv(base_env)
+    env.compute_rewards
+    base_env.compute_rewards = lambda actions, obs: 'patched'
+    env.clear_attribute_cache()
+    assert env.compute_rewards(None, None) == 'patched'
+
+
+def test_setting_attribute_overrides_cache():
+    env = ProxyEnv(make_env())
+    env.get_goal
+    env.get_goal = lambda: 'own'
+    assert env.get_goal() == 'own'
+    assert 'get_goal' not in env.__dict__.get('_cached_attrnames', ())
+
+
+def test_pickled_wrapper_forwards_to_its_own_copy():
+    env = ProxyEnv(make_env())
+    env.get_goal
+    new_env = pickle.loads(pickle.dumps(env))
+    assert new_env.get_goal.__self__ is new_env.wrapped_env
+    assert new_env.get_goal.__self__ is not env.wrapped_env
+
+
+def test_get_attr_owner():
+    base_env = make_env()
+    flat_env = FlatGoalEnv(base_env)
+    env = ProxyEnv(flat_env)
+    assert get_wrapper_stack(env) == [env, flat_env, base_env]
+    # Cached forwarding does not make a wrapper the owner.
+    env.compute_rewards
+    assert get_attr_owner(env, 'compute_rewards') is base_env
+    assert get_attr_owner(env, 'get_goal') is flat_env